@@ -0,0 +1,155 @@
+# app/alias_cache.py
+"""
+별칭 → 티커 영속 캐시 (SQLite)
+
+• to_ticker 가 정적 사전 밖에서 **확신 있게** 푼 결과(HCX 판별)를 기록.
+  초성/접두어 약어는 HCX 후보로만 쓰고, fuzzy 자동 확정(FUZZY_AUTO_ACCEPT)은 검증되지 않은 추정이라
+  둘 다 기록하지 않는다 (예전에 기록된 source='chosung'/'prefix'/'fuzzy' 행은 DB 를 열 때 삭제).
+  같은 별칭이 다시 오면 SBERT 인코딩 · HCX 호출 없이 바로 반환한다.
+• 행마다 적중 횟수(hits)와 만료 시각(expires)을 둔다.
+  적중 시 만료가 ALIAS_TTL_DAYS 만큼 연장되고, 만료된 행은 무시 · 정리(purge, 워밍업 시)된다.
+  적중 기록은 메모리에 모아 ALIAS_HIT_FLUSH_S 마다 한 트랜잭션으로 쓴다 (조회마다 쓰기 X).
+• 시작 시 hits ≥ ALIAS_PROMOTE_HITS 인 별칭은 ticker_lookup._STATIC_MAP 으로 승격.
+  키는 정규화된 별칭이지만 승격에는 마지막으로 들어온 **원문(text)** 을 쓴다
+  (_STATIC_MAP 은 원문 그대로 조회하므로).
+• 여러 워커 프로세스가 같은 DB 를 쓰므로 WAL 모드 사용.
+"""
+from __future__ import annotations
+
+import atexit
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+from config import ALIAS_DB, ALIAS_TTL_DAYS, ALIAS_PROMOTE_HITS, ALIAS_HIT_FLUSH_S
+
+_TTL = ALIAS_TTL_DAYS * 86_400
+_lock = threading.Lock()
+_pending_hits: Dict[str, int] = {}     # 정규화 별칭 → 아직 DB 에 안 쓴 적중 수
+_last_flush = time.time()
+
+
+class CachedAlias(NamedTuple):
+    ticker: str
+    name:   str
+    source: str        # 'hcx'
+
+
+def normalize(alias: str) -> str:
+    """공백 제거 + 소문자 ('SK 하이닉스' == 'sk하이닉스')"""
+    return re.sub(r"\s+", "", alias).lower()
+
+
+@lru_cache(maxsize=1)
+def _conn() -> sqlite3.Connection:
+    ALIAS_DB.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(ALIAS_DB, check_same_thread=False, timeout=5)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(
+        """CREATE TABLE IF NOT EXISTS alias (
+               alias      TEXT PRIMARY KEY,
+               ticker     TEXT NOT NULL,
+               name       TEXT NOT NULL,
+               source     TEXT NOT NULL,
+               confidence REAL,
+               hits       INTEGER NOT NULL DEFAULT 0,
+               created    REAL NOT NULL,
+               last_hit   REAL,
+               expires    REAL NOT NULL,
+               text       TEXT
+           )"""
+    )
+    if "text" not in {r[1] for r in con.execute("PRAGMA table_info(alias)")}:
+        con.execute("ALTER TABLE alias ADD COLUMN text TEXT")      # 이전 스키마
+    with con:
+        con.execute("DELETE FROM alias WHERE source != 'hcx'")    # 검증 없이 기록된 약어 · fuzzy
+    return con
+
+
+def _flush(now: float) -> None:
+    """모아 둔 적중을 한 번에 기록 (_lock 보유 상태에서 호출)"""
+    global _last_flush
+    _last_flush = now
+    if not _pending_hits:
+        return
+    rows = [(n, now, now + _TTL, key) for key, n in _pending_hits.items()]
+    _pending_hits.clear()
+    with _conn() as con:
+        con.executemany(
+            "UPDATE alias SET hits = hits + ?, last_hit = ?, expires = ? WHERE alias = ?", rows
+        )
+
+
+# ──────────────────────────────────────────────────────────
+#  Public API
+# ──────────────────────────────────────────────────────────
+def get(alias: str) -> Optional[CachedAlias]:
+    """유효한 캐시 항목이면 반환 (hits / 만료 갱신은 모아서 ALIAS_HIT_FLUSH_S 마다)"""
+    key, now = normalize(alias), time.time()
+    try:
+        with _lock:
+            row = _conn().execute(
+                "SELECT ticker, name, source FROM alias WHERE alias = ? AND expires > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            _pending_hits[key] = _pending_hits.get(key, 0) + 1
+            if now - _last_flush >= ALIAS_HIT_FLUSH_S:
+                _flush(now)
+    except sqlite3.Error:
+        return None
+    return CachedAlias(*row)
+
+
+def put(alias: str, ticker: str, name: str, source: str, confidence: float | None = None) -> None:
+    """해석 결과 기록 (기존 hits 는 유지)"""
+    key, now = normalize(alias), time.time()
+    try:
+        with _lock, _conn() as con:
+            con.execute(
+                """INSERT INTO alias (alias, ticker, name, source, confidence, hits, created, expires, text)
+                   VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)
+                   ON CONFLICT(alias) DO UPDATE SET
+                       ticker = excluded.ticker, name = excluded.name, source = excluded.source,
+                       confidence = excluded.confidence, expires = excluded.expires, text = excluded.text""",
+                (key, ticker, name, source, confidence, now, now + _TTL, alias.strip()),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def popular(min_hits: int = ALIAS_PROMOTE_HITS) -> Dict[str, str]:
+    """승격 대상 {별칭 원문: 티커} (만료 안 된 항목 중 hits ≥ min_hits)"""
+    if not ALIAS_DB.exists():
+        return {}
+    try:
+        with _lock:
+            rows = _conn().execute(
+                "SELECT COALESCE(text, alias), ticker FROM alias"
+                " WHERE hits >= ? AND expires > ?",
+                (min_hits, time.time()),
+            ).fetchall()
+    except sqlite3.Error:
+        return {}
+    return dict(rows)
+
+
+def flush() -> None:
+    """모아 둔 적중 기록을 지금 쓴다 (프로세스 종료 시 자동 호출)"""
+    try:
+        with _lock:
+            _flush(time.time())
+    except sqlite3.Error:
+        pass
+
+atexit.register(flush)
+
+
+def purge() -> int:
+    """만료된 항목 삭제, 삭제 건수 반환 (app/warmup 에서 호출)"""
+    with _lock, _conn() as con:
+        return con.execute("DELETE FROM alias WHERE expires <= ?", (time.time(),)).rowcount
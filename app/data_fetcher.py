@@ -22,10 +22,8 @@ from functools import lru_cache
 from typing import List, Tuple, Dict
 
 import pandas as pd
-import yfinance as yf
-from yfinance import Ticker
-from yfinance.base import YFRateLimitError
-from app.ticker_lookup import to_ticker
+from app.yf_lazy import yf, errors as yf_errors    # yfinance 는 원격 호출 시에만 import
+from app import singleflight
 import json
 from pathlib import Path
 
@@ -66,25 +64,29 @@ def _slice_single(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
     return df  # 1-level 컬럼
 
 # ──────────────────────────────────────────────────────────
-#  3. 다운로드 래퍼 (LRU)
+#  3. 다운로드 래퍼 (LRU + 동시 miss 합치기)
 # ──────────────────────────────────────────────────────────
 @lru_cache(maxsize=2_048)
+@singleflight.coalesce
 def _download(
-    tickers: Tuple[str, ...], start: str, end: str, interval: str = "1d"
+    tickers: Tuple[str, ...], start: str, end: str, interval: str = "1d",
+    fields: Tuple[str, ...] | None = None,
 ) -> pd.DataFrame:
     """캐시 우선 다운로드.
 
     • 프리패치 구간 → *캐시만* 사용 (miss → drop).  
       반환 DF 는 yfinance 형태와 동일하게 2-level 컬럼(MultiIndex)로 통일.
     • 그밖의 기간 → yfinance 호출 후 캐시에 저장.
+    • fields 지정 시 해당 필드(Open/High/Low/Close/Adj Close/Volume)만 반환.
     """
     tickers = tuple(tickers)
+    columns = list(fields) if fields else None
 
     # ── 프리패치 구간 ─────────────────────────────────────────
     if _within_prefetch_window(start, end):
         frames: list[pd.DataFrame] = []
         for t in tickers:
-            cdf = _load_cache(t, start, end)
+            cdf = _load_cache(t, start, end, columns=columns)
             if cdf is None or cdf.empty:
                 continue  # 캐시 미존재 ⇒ 건너뜀
             cdf = cdf.copy()
@@ -96,7 +98,7 @@ def _download(
         return pd.DataFrame()  # 모두 미존재 → 빈 DF
 
     # ── 일반 구간(yfinance) ───────────────────────────────────
-    df = yf.download(
+    df = yf().download(
         list(tickers),
         start=start,
         end=_next_day(end),
@@ -115,6 +117,8 @@ def _download(
                 _save_cache(t, sub)
         except KeyError:
             pass  # yfinance에 데이터 없을 때
+    if columns and isinstance(df.columns, pd.MultiIndex):
+        df = df.loc[:, df.columns.get_level_values(1).isin(columns)]
     return df
 
 # ──────────────────────────────────────────────────────────
@@ -153,20 +157,20 @@ def get_price_on_date(ticker: str, date: str, field: str = "Close") -> float:
             if price is not None:
                 return price
             break
-        except YFRateLimitError:
+        except yf_errors().RateLimit:
             time.sleep(1 + i)
 
     # (2) history()는 프리패치 구간에선 호출하지 않음
     if not _within_prefetch_window(start, end):
         for i in range(3):
             try:
-                hist = yf.Ticker(ticker).history(
+                hist = yf().Ticker(ticker).history(
                     start=start, end=_next_day(end), interval="1d", auto_adjust=False
                 )
                 if not hist.empty and field in hist.columns:
                     return float(hist[field].iloc[0])
                 break
-            except YFRateLimitError:
+            except yf_errors().RateLimit:
                 time.sleep(2 + i * 2)
 
     raise ValueError(f"{date} {ticker} {field} 데이터 없음")
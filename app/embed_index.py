@@ -0,0 +1,164 @@
+# app/embed_index.py
+"""
+종목명 임베딩 · Faiss 인덱스 영속화
+
+저장 파일 (EMBED_DIR)
+────────
+  meta.json    : {"hash", "model", "dim", "kind", "names"}
+  vectors.npy  : 정규화된 이름 임베딩 (float32, N × dim)
+  index.faiss  : 직렬화된 Faiss 인덱스 (종류 = EMBED_INDEX_TYPE)
+
+동작 정책
+────────
+1. **해시** – 유니버스 CSV(KOSPI/KOSDAQ/alias) 내용 + 모델명으로 sha256.
+2. **로드** – 해시가 같으면 vectors.npy 는 mmap, index.faiss 는 mmap 플래그로 읽는다
+   → 시작 시 SBERT 인코딩이 필요 없다.
+3. **재빌드** – 해시가 다르거나 파일이 없을 때만 인코딩 후 저장 (임시 파일 → 교체).
+   배포 전에는 `python -m scripts.build_embed_index` 로 미리 만들어 둔다.
+4. **인덱스 종류** – EMBED_INDEX_TYPE 만 바뀌었으면 재인코딩 없이 vectors.npy 로 인덱스만 다시 만든다.
+
+인덱스 종류 (모두 내적 = 코사인 유사도)
+────────
+  flat    : 전수 탐색 (정확, 기준값)
+  hnsw    : HNSW 그래프 (float32)
+  hnsw_sq : HNSW + 8bit 스칼라 양자화 (메모리 ≈ 1/4)
+  ivf_sq  : IVF + 8bit 스칼라 양자화
+  ivfpq   : IVF + Product Quantization (메모리 최소, 근사도 가장 큼)
+  → 정확도/속도 비교는 `python -m scripts.bench_embed_index`
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from config import (
+    EMBED_DIR, EMBED_MODEL, KOSPI_CSV, KOSDAQ_CSV, ALIAS_CSV,
+    EMBED_INDEX_TYPE, EMBED_HNSW_M, EMBED_EF_SEARCH, EMBED_NPROBE,
+)
+
+_META = "meta.json"
+_VECS = "vectors.npy"
+_INDEX = "index.faiss"
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 해시
+# ──────────────────────────────────────────────────────────
+def content_hash() -> str:
+    """유니버스 CSV 내용 + 모델명 → sha256 hex"""
+    h = hashlib.sha256(EMBED_MODEL.encode())
+    for fp in (KOSPI_CSV, KOSDAQ_CSV, ALIAS_CSV):
+        h.update(fp.name.encode())
+        if fp.exists():
+            h.update(fp.read_bytes())
+    return h.hexdigest()
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 인덱스 생성
+# ──────────────────────────────────────────────────────────
+def _factory(kind: str, n: int, dim: int) -> str:
+    """EMBED_INDEX_TYPE → faiss.index_factory 문자열"""
+    nlist = max(1, min(int(4 * np.sqrt(n)), n // 39))      # 학습 표본 ≥ 39 × nlist
+    pq_m = next(m for m in (48, 32, 24, 16, 8, 4, 2, 1) if dim % m == 0)
+    return {
+        "flat":    "Flat",
+        "hnsw":    f"HNSW{EMBED_HNSW_M}",
+        "hnsw_sq": f"HNSW{EMBED_HNSW_M}_SQ8",
+        "ivf_sq":  f"IVF{nlist},SQ8",
+        "ivfpq":   f"IVF{nlist},PQ{pq_m}",
+    }[kind]
+
+def tune(index) -> None:
+    """검색 파라미터 (HNSW efSearch · IVF nprobe) 적용"""
+    import faiss
+
+    ps = faiss.ParameterSpace()
+    for param in (f"efSearch={EMBED_EF_SEARCH}", f"nprobe={EMBED_NPROBE}"):
+        try:
+            ps.set_index_parameters(index, param)
+        except RuntimeError:
+            pass                      # 해당 인덱스에 없는 파라미터
+
+def make_index(vecs: np.ndarray, kind: str = EMBED_INDEX_TYPE):
+    """정규화된 벡터 → 학습 · 추가까지 끝난 Faiss 인덱스"""
+    import faiss
+
+    if kind not in ("flat", "hnsw", "hnsw_sq", "ivf_sq", "ivfpq"):
+        raise ValueError(f"지원하지 않는 EMBED_INDEX_TYPE: {kind}")
+    vecs = np.ascontiguousarray(vecs, dtype="float32")
+    index = faiss.index_factory(vecs.shape[1], _factory(kind, len(vecs), vecs.shape[1]),
+                                faiss.METRIC_INNER_PRODUCT)   # cosine sim == dot prod (L2-norm=1)
+    if not index.is_trained:
+        index.train(vecs)
+    index.add(vecs)
+    tune(index)
+    return index
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 저장 / 로드
+# ──────────────────────────────────────────────────────────
+def _replace(tmp: Path, dst: Path) -> None:
+    os.replace(tmp, dst)          # 같은 파일시스템 → 원자적 교체
+
+def _save_index(index, meta: dict, out_dir: Path) -> None:
+    import faiss
+
+    faiss.write_index(index, str(out_dir / f"{_INDEX}.tmp"))
+    (out_dir / f"{_META}.tmp").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    _replace(out_dir / f"{_INDEX}.tmp", out_dir / _INDEX)
+    _replace(out_dir / f"{_META}.tmp", out_dir / _META)   # meta 는 마지막 → 반쯤 쓴 상태를 읽지 않음
+
+def build(names: List[str], model, *, out_dir: Path = EMBED_DIR):
+    """이름 인코딩 → Faiss 인덱스 생성 후 저장, (index, names) 반환"""
+    vecs = model.encode(names, normalize_embeddings=True, batch_size=128)
+    vecs = np.ascontiguousarray(vecs, dtype="float32")
+    index = make_index(vecs)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / f"{_VECS}.tmp", "wb") as f:
+        np.save(f, vecs)
+    _replace(out_dir / f"{_VECS}.tmp", out_dir / _VECS)
+    meta = {"hash": content_hash(), "model": EMBED_MODEL, "dim": int(vecs.shape[1]),
+            "kind": EMBED_INDEX_TYPE, "names": names}
+    _save_index(index, meta, out_dir)
+    return index, names
+
+def _read_meta(out_dir: Path) -> dict | None:
+    try:
+        return json.loads((out_dir / _META).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def load_vectors(out_dir: Path = EMBED_DIR) -> np.ndarray:
+    """저장된 임베딩 (mmap, 읽기 전용)"""
+    return np.load(out_dir / _VECS, mmap_mode="r")
+
+def load(out_dir: Path = EMBED_DIR):
+    """해시가 맞으면 (index, names), 아니면 None"""
+    import faiss
+
+    meta = _read_meta(out_dir)
+    if meta is None or meta.get("hash") != content_hash() or not (out_dir / _VECS).exists():
+        return None
+
+    if meta.get("kind", "flat") != EMBED_INDEX_TYPE or not (out_dir / _INDEX).exists():
+        # 인덱스 종류만 바뀜 → 저장된 벡터로 인덱스만 재구성 (재인코딩 없음)
+        index = make_index(np.asarray(load_vectors(out_dir)))
+        _save_index(index, {**meta, "kind": EMBED_INDEX_TYPE}, out_dir)
+        return index, meta["names"]
+
+    try:
+        index = faiss.read_index(str(out_dir / _INDEX), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except (RuntimeError, AttributeError):
+        index = faiss.read_index(str(out_dir / _INDEX))       # mmap 미지원 인덱스/버전
+    if index.ntotal != len(meta["names"]):
+        return None
+    tune(index)
+    return index, meta["names"]
@@ -0,0 +1,69 @@
+# app/event_index.py
+"""
+티커별 이벤트 인덱스
+
+• 이벤트 발생일을 티커마다 **정렬된 datetime64[D] 배열**로 보관
+• 구간 질의(횟수·날짜·발생 종목)는 np.searchsorted 두 번으로 끝난다
+  → 같은 데이터를 질문마다 다시 스캔하지 않는다.
+• 생성: 패턴/크로스 마스크(index=date, columns=ticker, bool) → EventIndex.from_mask()
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+_EMPTY = np.array([], dtype="datetime64[D]")
+
+
+def _day(date) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(date).date(), "D")
+
+
+class EventIndex:
+    """{ticker: 정렬된 발생일 배열}"""
+
+    __slots__ = ("_dates",)
+
+    def __init__(self, dates: Dict[str, np.ndarray] | None = None):
+        self._dates: Dict[str, np.ndarray] = dates or {}
+
+    @classmethod
+    def from_mask(cls, mask: pd.DataFrame) -> "EventIndex":
+        """bool 마스크 → 인덱스 (발생이 없는 티커는 빈 배열)"""
+        days = mask.index.values.astype("datetime64[D]")
+        cols, rows = mask.to_numpy().T.nonzero()          # 티커 → 날짜 순 정렬
+        bounds = np.searchsorted(cols, np.arange(len(mask.columns) + 1))
+        return cls({
+            t: days[rows[bounds[i]:bounds[i + 1]]]
+            for i, t in enumerate(mask.columns)
+        })
+
+    # ── 조회 ────────────────────────────────────────────
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._dates
+
+    def tickers(self) -> List[str]:
+        return list(self._dates)
+
+    def _span(self, ticker: str, date_from: str, date_to: str) -> Tuple[np.ndarray, int, int]:
+        arr = self._dates.get(ticker, _EMPTY)
+        lo = int(np.searchsorted(arr, _day(date_from), side="left"))
+        hi = int(np.searchsorted(arr, _day(date_to), side="right"))
+        return arr, lo, hi
+
+    def count(self, ticker: str, date_from: str, date_to: str) -> int:
+        _, lo, hi = self._span(ticker, date_from, date_to)
+        return hi - lo
+
+    def dates(self, ticker: str, date_from: str, date_to: str) -> List[str]:
+        arr, lo, hi = self._span(ticker, date_from, date_to)
+        return [str(d) for d in arr[lo:hi]]
+
+    def tickers_between(
+        self, date_from: str, date_to: str, tickers: Iterable[str] | None = None
+    ) -> List[str]:
+        """구간 내 이벤트가 1회 이상 있는 티커 (입력 순서 유지)"""
+        pool = self._dates if tickers is None else tickers
+        return [t for t in pool if self.count(t, date_from, date_to) > 0]
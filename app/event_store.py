@@ -0,0 +1,220 @@
+# app/event_store.py
+"""
+티커별 이벤트 스토어 (로컬 parquet)
+
+저장 이벤트
+────────
+  golden_cross / dead_cross   : MA5 · MA20 (Adj Close)
+  three_white / three_black   : 적삼병 / 흑삼병 (완성일 기준, value = 첫 봉부터 경과 일수)
+  high_52w / low_52w          : 직전 EVENT_PEAK_DAYS 거래일(당일 포함) 최고/최저 종가 (value = 종가)
+  gap_up / gap_down           : |갭| ≥ EVENT_GAP_PCT (value = 갭 %)
+  volume_spike                : EVENT_SPIKE_WINDOW 일 평균 대비 EVENT_SPIKE_PCT % 이상 (value = 증가율 %)
+  판정은 search_utils 의 기존 단일일 조건(detect_52w_* · search_by_gap_pct · detect_volume_spike)과 같다.
+
+동작 정책
+────────
+1. **ingest 시 갱신** – yf_cache.save_or_append() 가 가격 parquet 을 쓴 직후 refresh() 호출.
+   변경된 티커만 다시 계산하므로 전체 재빌드가 필요 없다.
+   쓰기마다 고유한 임시 파일에 쓴 뒤 os.replace → 조회 중인 스레드가 반쯤 쓴 파일을 읽지 않는다.
+2. **조회 시 자가 복구** – 이벤트 파일이 없거나 가격 파일보다 오래됐으면 그 티커만 재계산.
+   여러 스레드 · 스크리닝 워커 프로세스가 같은 티커를 동시에 재계산해도 결과는 같으므로
+   마지막 교체가 이긴다 (교체 경합에서 져도 성공으로 본다).
+3. **조회** – 이벤트별로 정렬된 날짜 배열을 np.searchsorted 로 두 번 잘라 횟수/날짜를 구한다.
+   tickers_with / occurrences 는 tickers 를 생략하면 유니버스 전체를 대상으로 한다.
+
+캐시 적용 구간(프리패치 윈도우) 판단은 호출하는 쪽(search_utils)에서 한다.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app import universe
+from app.patterns import PATTERNS, Candles, cross_masks
+from config import (
+    CACHE_DIR, EVENT_DIR,
+    EVENT_PEAK_DAYS, EVENT_GAP_PCT, EVENT_SPIKE_WINDOW, EVENT_SPIKE_PCT,
+)
+
+EVENTS = (
+    "golden_cross", "dead_cross",
+    "three_white", "three_black",
+    "high_52w", "low_52w",
+    "gap_up", "gap_down",
+    "volume_spike",
+)
+_SPAN_EVENTS = {"three_white", "three_black"}   # 여러 봉에 걸친 이벤트
+
+_EMPTY_D = np.array([], dtype="datetime64[D]")
+_EMPTY_V = np.array([], dtype="float64")
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 이벤트 계산 (단일 티커, 1-level 컬럼 OHLCV)
+# ──────────────────────────────────────────────────────────
+def compute_events(df: pd.DataFrame) -> pd.DataFrame:
+    """가격 DF → 이벤트 DF (columns: event, date, value / event·date 정렬)"""
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    frames: list[pd.DataFrame] = []
+
+    def add(name: str, mask: pd.Series, value: pd.Series | None = None) -> None:
+        mask = mask.fillna(False).astype(bool)
+        idx = mask.index[mask.to_numpy()]
+        val = np.zeros(len(idx)) if value is None else value[mask].to_numpy(dtype="float64")
+        frames.append(pd.DataFrame({"event": name, "date": idx, "value": val}))
+
+    # ① 골든/데드크로스
+    close = df["Adj Close"].dropna()
+    golden, dead = cross_masks(close, 5, 20)
+    add("golden_cross", golden)
+    add("dead_cross", dead)
+
+    # ② 적삼병/흑삼병 (시가·Adj Close 기준, 기존 판정과 동일)
+    ohlc = df.dropna(subset=["Open", "Adj Close"])
+    c = Candles(ohlc["Open"], ohlc["High"], ohlc["Low"], ohlc["Adj Close"])
+    span = pd.Series(ohlc.index, index=ohlc.index).diff(2).dt.days
+    add("three_white", PATTERNS["white"](c), span)
+    add("three_black", PATTERNS["black"](c), span)
+
+    # ③ 신고가/신저가 (거래량 0 인 날 제외, 이력이 짧으면 있는 만큼 – detect_52w_* 와 동일)
+    px = df["Close"].dropna()
+    traded = df["Volume"].reindex(px.index) != 0
+    add("high_52w", (px >= px.rolling(EVENT_PEAK_DAYS, min_periods=1).max()) & traded, px)
+    add("low_52w",  (px <= px.rolling(EVENT_PEAK_DAYS, min_periods=1).min()) & traded, px)
+
+    # ④ 갭 상승/하락 (시가 vs 직전 거래일 종가)
+    prev_c = df["Close"].shift(1)
+    gap = (df["Open"] - prev_c) / prev_c * 100
+    ok = (df["Open"] != 0) & (prev_c != 0) & (df["Volume"].fillna(0) != 0)
+    add("gap_up",   ok & (gap >= EVENT_GAP_PCT), gap)
+    add("gap_down", ok & (gap <= -EVENT_GAP_PCT), gap)
+
+    # ⑤ 거래량 급증 (당일 포함 window 평균 대비)
+    vol = df["Volume"].dropna()
+    avg = vol.rolling(EVENT_SPIKE_WINDOW).mean()
+    ratio = vol / avg * 100 - 100
+    add("volume_spike", (vol != 0) & (avg != 0) & (ratio >= EVENT_SPIKE_PCT), ratio)
+
+    out = pd.concat(frames, ignore_index=True)
+    return out.sort_values(["event", "date"], kind="stable").reset_index(drop=True)
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 저장 / 로드
+# ──────────────────────────────────────────────────────────
+def _path(ticker: str) -> Path:
+    return EVENT_DIR / f"{ticker}.parquet"
+
+def _price_path(ticker: str) -> Path:
+    return CACHE_DIR / f"{ticker}.parquet"
+
+def refresh(ticker: str, df: pd.DataFrame | None = None) -> None:
+    """티커 하나의 이벤트를 다시 계산해 저장 (df 미지정 시 가격 캐시에서 읽음)"""
+    if df is None:
+        fp = _price_path(ticker)
+        if not fp.exists():
+            return
+        df = pd.read_parquet(fp)
+    events = compute_events(df)
+    EVENT_DIR.mkdir(parents=True, exist_ok=True)
+    # 동시에 같은 티커를 쓰는 스레드/프로세스끼리 임시 파일이 겹치지 않도록 고유 이름
+    with tempfile.NamedTemporaryFile(dir=EVENT_DIR, prefix=f".{ticker}.", suffix=".tmp", delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        events.to_parquet(tmp, index=False)
+        os.replace(tmp, _path(ticker))         # 같은 파일시스템 → 원자적 교체
+    except FileNotFoundError:
+        pass                                   # 교체 경합에서 짐 – 다른 쪽이 같은 내용을 이미 게시
+    finally:
+        tmp.unlink(missing_ok=True)
+
+TickerEvents = Dict[str, Tuple[np.ndarray, np.ndarray]]   # event → (dates, values)
+
+@lru_cache(maxsize=4_096)
+def _read(ticker: str, mtime_ns: int) -> TickerEvents:
+    ev = pd.read_parquet(_path(ticker))
+    out: TickerEvents = {}
+    for name, g in ev.groupby("event", sort=False):
+        out[name] = (
+            g["date"].to_numpy().astype("datetime64[D]"),
+            g["value"].to_numpy(dtype="float64"),
+        )
+    return out
+
+def _events(ticker: str) -> TickerEvents:
+    """이벤트 로드 (없거나 가격 캐시보다 오래됐으면 재계산)"""
+    fp, price_fp = _path(ticker), _price_path(ticker)
+    if not price_fp.exists():
+        return {}
+    if not fp.exists() or fp.stat().st_mtime_ns < price_fp.stat().st_mtime_ns:
+        refresh(ticker)
+    try:
+        mtime = fp.stat().st_mtime_ns              # 다른 쓰기가 교체 중일 수 있음
+    except FileNotFoundError:
+        return {}
+    return _read(ticker, mtime)
+
+
+# ──────────────────────────────────────────────────────────
+#  3. Public API
+# ──────────────────────────────────────────────────────────
+def _day(date: str) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(date).date(), "D")
+
+def _slice(ticker: str, event: str, date_from: str, date_to: str) -> Tuple[np.ndarray, np.ndarray]:
+    dates, values = _events(ticker).get(event, (_EMPTY_D, _EMPTY_V))
+    lo = int(np.searchsorted(dates, _day(date_from), side="left"))
+    hi = int(np.searchsorted(dates, _day(date_to), side="right"))
+    d, v = dates[lo:hi], values[lo:hi]
+    if event in _SPAN_EVENTS:                      # 첫 봉도 구간 안에 있어야 함
+        keep = (d - v.astype("timedelta64[D]")) >= _day(date_from)
+        d, v = d[keep], v[keep]
+    return d, v
+
+def _filtered(
+    ticker: str, event: str, date_from: str, date_to: str,
+    min_value: float | None = None, max_value: float | None = None,
+) -> np.ndarray:
+    if event not in EVENTS:
+        raise ValueError(f"지원하지 않는 이벤트: {event}")
+    d, v = _slice(ticker, event, date_from, date_to)
+    if min_value is not None:
+        d, v = d[v >= min_value], v[v >= min_value]
+    if max_value is not None:
+        d, v = d[v <= max_value], v[v <= max_value]
+    return d
+
+def query(ticker: str, event: str, date_from: str, date_to: str, **kw) -> List[str]:
+    """구간 내 이벤트 발생일 ['YYYY-MM-DD', ...]  (kw: min_value / max_value)"""
+    return [str(x) for x in _filtered(ticker, event, date_from, date_to, **kw)]
+
+def count(ticker: str, event: str, date_from: str, date_to: str, **kw) -> int:
+    """구간 내 이벤트 발생 횟수"""
+    return len(_filtered(ticker, event, date_from, date_to, **kw))
+
+def _targets(tickers: Iterable[str] | None) -> Iterable[str]:
+    """tickers 미지정 → 호출 시점의 KOSPI + KOSDAQ 전체"""
+    return universe.all_tickers() if tickers is None else tickers
+
+def tickers_with(
+    event: str, date_from: str, date_to: str, tickers: Iterable[str] | None = None, **kw
+) -> List[str]:
+    """구간 내 이벤트가 1회 이상 있는 티커 (입력 순서 유지, tickers=None → 유니버스 전체)"""
+    return [t for t in _targets(tickers) if len(_filtered(t, event, date_from, date_to, **kw))]
+
+def occurrences(
+    event: str, date_from: str, date_to: str, tickers: Iterable[str] | None = None, **kw
+) -> Dict[str, List[str]]:
+    """{티커: 발생일 목록} – 이벤트가 있는 티커만 (tickers=None → 유니버스 전체)"""
+    out: Dict[str, List[str]] = {}
+    for t in _targets(tickers):
+        d = _filtered(t, event, date_from, date_to, **kw)
+        if len(d):
+            out[t] = [str(x) for x in d]
+    return out
@@ -0,0 +1,193 @@
+# app/executor.py
+"""
+요청 실행 스테이지 (동시성 상한 + 대기열 통계)
+
+스테이지
+────────
+  llm      : HCX 비동기 호출 – 이벤트 루프 위에서 동시에 기다릴 요청 수만 제한 (EXEC_LLM_CONCURRENCY)
+  data     : 파싱 이후 단계 – parquet 읽기 · pandas 계산 · 핸들러 (스레드 풀, EXEC_DATA_WORKERS)
+  prefetch : 질문 속 종목의 가격 캐시 선행 읽기 (스레드 2개, 가득 차면 건너뜀)
+  llm_sync : 동기 경로(route)에서 서로 독립인 HCX 호출을 겹칠 때 (후속 답변 슬롯 보충 ∥ 파싱)
+  (종목검색 샤드 병렬은 data 스테이지 안에서 app/parallel_screen 프로세스 풀을 쓴다)
+
+• 워커 하나가 여러 요청의 LLM 대기를 겹치면서도, 데이터 작업은 정해진 스레드 수 안에서만 돈다.
+• 스테이지 대기열이 EXEC_MAX_QUEUE 를 넘으면 Overloaded → main.py 가 503 으로 응답.
+• stats() : 스테이지별 실행 중 · 대기 · 최대 대기 · 처리/실패/거절 건수 · 평균 대기/실행 시간 (GET /stats)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, TypeVar
+
+from config import EXEC_LLM_CONCURRENCY, EXEC_DATA_WORKERS, EXEC_MAX_QUEUE
+
+T = TypeVar("T")
+
+
+class Overloaded(RuntimeError):
+    """스테이지 대기열이 가득 참"""
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"stage '{stage}' queue is full")
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 스테이지 공통 (카운터)
+# ──────────────────────────────────────────────────────────
+class _Stage:
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name, self.limit, self.max_queue = name, limit, max_queue
+        self._lock = threading.Lock()
+        self.running = self.queued = self.max_queued = 0
+        self.done = self.failed = self.rejected = 0
+        self._wait_s = self._run_s = 0.0
+
+    def _enqueue(self) -> float:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded(self.name)
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        return time.perf_counter()
+
+    def _cancel(self) -> None:
+        with self._lock:
+            self.queued -= 1
+
+    def _start(self, t_enq: float) -> float:
+        now = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._wait_s += now - t_enq
+        return now
+
+    def _finish(self, t_start: float, ok: bool) -> None:
+        with self._lock:
+            self.running -= 1
+            self._run_s += time.perf_counter() - t_start
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            n = self.done + self.failed
+            return {
+                "limit":       self.limit,
+                "running":     self.running,
+                "queued":      self.queued,
+                "max_queued":  self.max_queued,
+                "done":        self.done,
+                "failed":      self.failed,
+                "rejected":    self.rejected,
+                "avg_wait_ms": round(self._wait_s / n * 1e3, 2) if n else 0.0,
+                "avg_run_ms":  round(self._run_s / n * 1e3, 2) if n else 0.0,
+            }
+
+    def _timed(self, fn: Callable[..., T], t_enq: float, *args) -> T:
+        t0, ok = self._start(t_enq), False
+        try:
+            out = fn(*args)
+            ok = True
+            return out
+        finally:
+            self._finish(t0, ok)
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 스레드 풀 스테이지 (블로킹 · CPU 작업)
+# ──────────────────────────────────────────────────────────
+class ThreadStage(_Stage):
+    def __init__(self, name: str, workers: int, max_queue: int):
+        super().__init__(name, workers, max_queue)
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix=self.name)
+        return self._pool
+
+    def submit(self, fn: Callable[..., T], *args) -> Future:
+        """동기 코드에서 제출 (결과를 기다리지 않아도 됨)"""
+        t_enq = self._enqueue()
+        try:
+            return self._executor().submit(self._timed, fn, t_enq, *args)
+        except RuntimeError:                 # shutdown 이후
+            self._cancel()
+            raise
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """이벤트 루프를 막지 않고 스레드에서 실행 후 결과 반환"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 비동기 스테이지 (I/O 대기 – 동시 수만 제한)
+# ──────────────────────────────────────────────────────────
+class AsyncStage(_Stage):
+    def __init__(self, name: str, concurrency: int, max_queue: int):
+        super().__init__(name, concurrency, max_queue)
+        # Semaphore 는 처음 쓴 이벤트 루프에 묶이므로 루프별로 하나씩
+        self._sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _sem(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._sems.get(loop)
+        if sem is None:
+            sem = self._sems[loop] = asyncio.Semaphore(self.limit)
+        return sem
+
+    @asynccontextmanager
+    async def slot(self):
+        """async with stage.slot(): ... – 동시 실행 수 제한 + 통계"""
+        t_enq = self._enqueue()
+        try:
+            await self._sem().acquire()
+        except BaseException:
+            self._cancel()
+            raise
+        t0, ok = self._start(t_enq), False
+        try:
+            yield
+            ok = True
+        finally:
+            self._sem().release()
+            self._finish(t0, ok)
+
+
+# ──────────────────────────────────────────────────────────
+#  4. Public API
+# ──────────────────────────────────────────────────────────
+LLM      = AsyncStage("llm", EXEC_LLM_CONCURRENCY, EXEC_MAX_QUEUE)
+DATA     = ThreadStage("data", EXEC_DATA_WORKERS, EXEC_MAX_QUEUE)
+PREFETCH = ThreadStage("prefetch", 2, EXEC_MAX_QUEUE)
+LLM_SYNC = ThreadStage("llm_sync", 4, EXEC_MAX_QUEUE)
+
+STAGES: Dict[str, _Stage] = {s.name: s for s in (LLM, DATA, PREFETCH, LLM_SYNC)}
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """스테이지별 대기열 · 처리 통계"""
+    return {name: stage.snapshot() for name, stage in STAGES.items()}
+
+
+def shutdown() -> None:
+    for stage in STAGES.values():
+        if isinstance(stage, ThreadStage):
+            stage.shutdown()
@@ -0,0 +1,225 @@
+# app/fast_parser.py
+"""
+규칙 기반 고속 파서 (HCX 앞단)
+
+자주 들어오는 정형 질문은 HCX(1~3초) 없이 정규식으로 바로 params 를 만든다.
+출력은 HCX 원본 JSON 과 같은 모양 (9개 키, 없는 값은 null) → 이후 보정 단계는 그대로.
+
+지원 템플릿
+────────
+  단순조회 : "[KOSPI에서 ]<종목명>의 <날짜> <종가|시가|고가|저가|거래량|등락률>은?"
+             "<날짜> <종목명>의 <지표>는?"
+             "<날짜> KOSPI 지수는?"
+  시장순위 : "<날짜>에서 KOSDAQ에서 <거래량 많은|가장 비싼|상승률 높은|하락률 높은> 종목 N개는?"
+             "<날짜> KOSPI 시장에서 <거래량이 가장 많은|가장 비싼> 종목은?"   (rank_n = 1)
+             "<날짜> <급등률|급락률|거래량> 상위 N개 종목 알려줘"
+  종목검색 : "<날짜>에 [KOSDAQ 시장에서 ]<조건>[이면서 <조건>…]인 종목을 모두 보여줘"
+             조건 = 등락률 ±X% 이상/이하 · 거래량 전날대비 X% 이상 증가 · 거래량 N주 이상/이하
+                    · 종가 A원 이상 B원 이하 (만/천/억 단위 허용)
+  비교질문 : "<날짜>에 <종목A>과 <종목B> 중 <지표>가 더 높은 종목은?"
+             "<날짜>에 KOSPI와 KOSDAQ 중 더 높은 지수는?"
+             "<날짜>에 <종목명>의 등락률이 [KOSPI ]시장 평균보다 높은가?"
+
+• 질문 **전체**가 템플릿에 맞고 종목명이 유니버스 사전에 있을 때만 결과를 낸다.
+  조금이라도 애매하면 None → HCX 로 넘어간다 (확신도 낮음 = 처리하지 않음).
+"""
+from __future__ import annotations
+
+import datetime as dt
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+from app import universe
+
+# ──────────────────────────────────────────────────────────
+#  1. 공통 조각
+# ──────────────────────────────────────────────────────────
+_DATE = r"(?P<date>\d{4}-\d{1,2}-\d{1,2}|\d{4}\.\d{1,2}\.\d{1,2}|\d{4}년 ?\d{1,2}월 ?\d{1,2}일)"
+_MKT = r"(?P<market>KOSPI|KOSDAQ|코스피|코스닥)"
+_MKT_IN = rf"(?:{_MKT}(?: ?시장)?에서 )?"
+_AMOUNT = r"\d+(?:\.\d+)?(?:억|만|천|백)?(?:\d+(?:\.\d+)?(?:만|천|백)?)*"
+_ASK = r"(?:은|는|이|가)?(?: ?(?:뭐야|얼마야|알려줘|알려 줘))?"
+
+_MARKET_KO = {"KOSPI": "KOSPI", "KOSDAQ": "KOSDAQ", "코스피": "KOSPI", "코스닥": "KOSDAQ"}
+_PRICE_METRIC = {"종가": "종가", "시가": "시가", "고가": "고가", "저가": "저가",
+                 "거래량": "거래량", "등락률": "pct_change"}
+_RANK_METRIC = {"거래량": "거래량", "비싼": "가격", "상승률": "상승률", "급등률": "상승률",
+                "하락률": "하락률", "급락률": "하락률"}
+_UNIT = {"억": 10**8, "만": 10**4, "천": 10**3, "백": 10**2}
+
+
+def _normalize(question: str) -> str:
+    q = unicodedata.normalize("NFKC", question).strip()
+    q = re.sub(r"[\s?？!.]+$", "", q)
+    q = re.sub(r"\s+", " ", q)
+    return re.sub(r"(?i)\b(kospi|kosdaq)\b", lambda m: m[1].upper(), q)
+
+def _iso(text: str) -> Optional[str]:
+    y, m, d = (int(x) for x in re.findall(r"\d+", text))
+    try:
+        return dt.date(y, m, d).isoformat()
+    except ValueError:
+        return None
+
+def _num(text: str) -> int | float:
+    v = float(text)
+    return int(v) if v.is_integer() else v
+
+def _amount(text: str) -> int | float:
+    """'1만5천' → 15000, '1000만' → 10000000, '3000' → 3000"""
+    total = 0.0
+    for num, unit in re.findall(r"(\d+(?:\.\d+)?)(억|만|천|백)?", text):
+        total += float(num) * _UNIT.get(unit, 1)
+    return _num(str(total))
+
+def _name(text: str) -> Optional[str]:
+    """유니버스 사전에 있는 종목명만 인정"""
+    text = text.strip()
+    return text if text in universe.current().name_map else None
+
+def _params(task: str, date: str | None, **kw) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "task": task, "date": date, "date_from": None, "date_to": None, "market": None,
+        "tickers": [], "metrics": [], "rank_n": None, "conditions": {},
+    }
+    out.update(kw)
+    return out
+
+def _market(m: re.Match) -> Optional[str]:
+    return _MARKET_KO.get(m["market"]) if m["market"] else None
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 단순조회 / 시장순위
+# ──────────────────────────────────────────────────────────
+_PRICE_RES = [
+    re.compile(rf"^(?:{_MKT}에서 )?(?P<name>.+)의 {_DATE}(?:에)? (?P<metric>종가|시가|고가|저가|거래량|등락률){_ASK}$"),
+    re.compile(rf"^{_DATE}(?:에)? (?:{_MKT}에서 )?(?P<name>.+)의 (?P<metric>종가|시가|고가|저가|거래량|등락률){_ASK}$"),
+]
+_INDEX_RE = re.compile(rf"^{_DATE}(?:에)? {_MKT} 지수{_ASK}$")
+_RANK_N_RE = re.compile(
+    rf"^{_DATE}(?:에서|에)? {_MKT_IN}"
+    r"(?:(?P<m1>거래량|상승률|하락률)(?:이)? 높은|(?P<m2>거래량)(?:이)? 많은|가장 (?P<m3>비싼)|"
+    r"(?P<m4>거래량|상승률|하락률|급등률|급락률) 상위) 종목 (?P<n>\d+)개"
+    rf"{_ASK}$"
+)
+_RANK_TOP_N_RE = re.compile(
+    rf"^{_DATE}(?:에서|에)? {_MKT_IN}"
+    r"(?P<m4>거래량|상승률|하락률|급등률|급락률) 상위 (?P<n>\d+)개 종목"
+    rf"{_ASK}$"
+)
+_RANK_1_RE = re.compile(
+    rf"^{_DATE}(?:에서|에)? {_MKT_IN}"
+    r"(?:(?P<m2>거래량)이 가장 많은|가장 (?P<m3>비싼)|(?P<m1>상승률|하락률)이 가장 높은) 종목"
+    rf"{_ASK}$"
+)
+
+def _price(q: str) -> Optional[dict]:
+    for rx in _PRICE_RES:
+        if (m := rx.match(q)) and (date := _iso(m["date"])) and (name := _name(m["name"])):
+            return _params("단순조회", date, market=_market(m), tickers=[name],
+                           metrics=[_PRICE_METRIC[m["metric"]]])
+    return None
+
+def _index(q: str) -> Optional[dict]:
+    if (m := _INDEX_RE.match(q)) and (date := _iso(m["date"])):
+        return _params("단순조회", date, market=_market(m), metrics=["지수"])
+    return None
+
+def _rank(q: str) -> Optional[dict]:
+    for rx in (_RANK_N_RE, _RANK_TOP_N_RE, _RANK_1_RE):
+        if (m := rx.match(q)) and (date := _iso(m["date"])):
+            gd = m.groupdict()
+            key = next(gd[g] for g in ("m1", "m2", "m3", "m4") if gd.get(g))
+            n = int(gd["n"]) if gd.get("n") else 1
+            if n <= 0:
+                return None
+            return _params("시장순위", date, market=_market(m),
+                           metrics=[_RANK_METRIC[key]], rank_n=n)
+    return None
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 종목검색 (조건 절 조합)
+# ──────────────────────────────────────────────────────────
+_SEARCH_RE = re.compile(
+    rf"^{_DATE}(?:에|에서)? {_MKT_IN}(?P<conds>.+?)인? 종목(?:을|들을)? (?:모두 |전부 )?(?:보여줘|알려줘|찾아줘)$"
+)
+_OP = {"이상": "min", "이하": "max", "초과": "min", "미만": "max"}
+_CLAUSES: List[tuple[re.Pattern, Callable[[re.Match], Optional[dict]]]] = [
+    (re.compile(r"^등락률이 (?P<v>[+-]?\d+(?:\.\d+)?) ?% (?P<op>이상|이하)$"),
+     lambda m: {"pct_change": {_OP[m["op"]]: _num(m["v"])}}),
+    (re.compile(r"^거래량이 전날 ?대비 (?P<v>\d+(?:\.\d+)?) ?% 이상 (?:증가|급증)한$"),
+     lambda m: {"volume_pct": {"min": _num(m["v"])}}),
+    (re.compile(rf"^거래량이 (?P<v>{_AMOUNT}) ?주 (?P<op>이상|이하)$"),
+     lambda m: {"volume": {_OP[m["op"]]: _amount(m["v"])}}),
+    (re.compile(rf"^종가가 (?P<a>{_AMOUNT}) ?원 이상 (?P<b>{_AMOUNT}) ?원 이하$"),
+     lambda m: {"price_close": {"min": _amount(m["a"]), "max": _amount(m["b"])}}),
+    (re.compile(rf"^종가가 (?P<v>{_AMOUNT}) ?원 (?P<op>이상|이하)$"),
+     lambda m: {"price_close": {_OP[m["op"]]: _amount(m["v"])}}),
+]
+
+def _clause(text: str) -> Optional[dict]:
+    for rx, build in _CLAUSES:
+        if m := rx.match(text):
+            return build(m)
+    return None
+
+def _search(q: str) -> Optional[dict]:
+    if not (m := _SEARCH_RE.match(q)) or not (date := _iso(m["date"])):
+        return None
+    conds: Dict[str, Any] = {}
+    for part in re.split(r"(?:이면서|이고|하고|하면서) ", m["conds"]):
+        c = _clause(part.strip())
+        if c is None or conds.keys() & c.keys():       # 모르는 절 · 같은 조건 중복 → HCX
+            return None
+        conds.update(c)
+    return _params("종목검색", date, market=_market(m), metrics=None, conditions=conds)
+
+
+# ──────────────────────────────────────────────────────────
+#  4. 비교질문
+# ──────────────────────────────────────────────────────────
+_CMP_METRIC = dict(_PRICE_METRIC, 시가총액="시가총액")
+_CMP_PAIR_RES = [
+    re.compile(rf"^{_DATE}(?:에)? (?P<a>.+?)(?:과|와) (?P<b>.+?) 중 "
+               r"(?P<metric>종가|시가|고가|저가|거래량|등락률|시가총액)(?:이|가)? 더 (?:높은|낮은|큰|작은|많은|적은) 종목"
+               rf"{_ASK}$"),
+    re.compile(rf"^(?P<a>.+?)(?:과|와) (?P<b>.+?) 중 {_DATE}(?:에)? "
+               r"(?P<metric>종가|시가|고가|저가|거래량|등락률|시가총액)(?:이|가)? 더 (?:높은|낮은|큰|작은|많은|적은) 종목"
+               rf"{_ASK}$"),
+]
+_CMP_INDEX_RE = re.compile(rf"^{_DATE}(?:에)? (?:KOSPI(?:와|과) KOSDAQ|KOSDAQ(?:와|과) KOSPI) 중 더 (?:높은|낮은) 지수{_ASK}$")
+_CMP_AVG_RE = re.compile(
+    rf"^{_DATE}(?:에)? (?P<name>.+)의 등락률이 (?:{_MKT} )?시장 평균보다 (?:높은가|낮은가|높아|낮아|높니|낮니)$"
+)
+
+def _compare(q: str) -> Optional[dict]:
+    for rx in _CMP_PAIR_RES:
+        if (m := rx.match(q)) and (date := _iso(m["date"])):
+            a, b = _name(m["a"]), _name(m["b"])
+            if a and b and a != b:
+                return _params("비교질문", date, tickers=[a, b], metrics=[_CMP_METRIC[m["metric"]]])
+            return None
+    if (m := _CMP_INDEX_RE.match(q)) and (date := _iso(m["date"])):
+        return _params("비교질문", date, market=["KOSPI", "KOSDAQ"], metrics=["지수"])
+    if (m := _CMP_AVG_RE.match(q)) and (date := _iso(m["date"])) and (name := _name(m["name"])):
+        mkt = _market(m)
+        return _params("비교질문", date, market=[], tickers=[name], metrics=["pct_change"],
+                       conditions={"market": [mkt] if mkt else ["KOSPI", "KOSDAQ"]})
+    return None
+
+
+# ──────────────────────────────────────────────────────────
+#  Public API
+# ──────────────────────────────────────────────────────────
+_PARSERS: List[Callable[[str], Optional[dict]]] = [_price, _index, _rank, _search, _compare]
+
+def parse(question: str) -> Optional[dict]:
+    """정형 질문이면 HCX 원본과 같은 모양의 params, 아니면 None"""
+    q = _normalize(question)
+    for fn in _PARSERS:
+        if (out := fn(q)) is not None:
+            return out
+    return None
@@ -0,0 +1,176 @@
+# app/intent.py
+"""
+로컬 의도(task) 분류기 → HCX 프롬프트 축소
+
+SYSTEM_PROMPT 는 모든 task 의 예시를 담고 있어 호출마다 입력 토큰 비용을 다 낸다.
+질문의 task 를 로컬에서 먼저 맞히고, 공통 규칙(<RULES>) + **그 task 의 예시** 에
+다른 task 예시 중 질문과 가장 비슷한 INTENT_NEIGHBOURS 개만 더한 짧은 프롬프트로 HCX 를 부른다.
+(예: "…부터 …까지 골든크로스가 발생한 종목" 처럼 횟수검색/종목검색이 헷갈리는 질문도
+ 이웃 예시로 올바른 스키마를 볼 수 있다)
+
+학습 데이터
+────────
+  SYSTEM_PROMPT 의 예시 (Q: … → {"task": …}) 만 쓴다.
+  (평가용 tests/ 질문은 쓰지 않는다 – 서빙이 tests/ 에 의존하지 않고, 평가 결과도 오염되지 않도록)
+
+모델
+────────
+  다항 나이브 베이즈 (라플라스 평활) · 특징 = 날짜/숫자를 자리표시자로 바꾼 질문의 문자 2~3-gram
+  학습은 첫 호출 때 한 번 (예시 수십~수백 문장 → 수 ms)
+
+• 최고 사후확률이 INTENT_MIN_PROB 미만이면 None → 전체 프롬프트 사용.
+• 짧은 프롬프트로 파싱에 실패하면 llm_bridge 가 전체 프롬프트로 한 번 더 부른다.
+"""
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import INTENT_MIN_PROB, INTENT_NEIGHBOURS
+
+
+class Example(NamedTuple):
+    question: str
+    block:    str           # 프롬프트 속 "Q: … \n→ {…}" 원문
+    task:     str
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 프롬프트 분해
+# ──────────────────────────────────────────────────────────
+_EXAMPLES_TAG = "<EXAMPLES>"
+_TASK_RE = re.compile(r'"task"\s*:\s*"([^"]+)"')
+_Q_RE = re.compile(r"^Q[:.]\s*(.*)$")
+
+def split_prompt(prompt: str) -> Tuple[str, List[Example]]:
+    """SYSTEM_PROMPT → (규칙 머리말 + <EXAMPLES>, 예시 목록)"""
+    head, sep, body = prompt.partition(_EXAMPLES_TAG)
+    if not sep:
+        return prompt, []
+    examples: List[Example] = []
+    for block in re.split(r"\n\s*\n", body.strip()):
+        lines = block.strip().splitlines()
+        if len(lines) < 2 or not (q := _Q_RE.match(lines[0].strip())):
+            continue
+        if m := _TASK_RE.search(lines[1]):
+            examples.append(Example(q[1].strip(), block.strip(), m[1]))
+    return head + sep, examples
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 특징 · 나이브 베이즈
+# ──────────────────────────────────────────────────────────
+_DATE_RE = re.compile(r"\d{4}\s*(?:[-./]|년\s*)\d{1,2}\s*(?:[-./]|월\s*)\d{1,2}(?:\s*일)?|\d{1,2}\s*월\s*\d{1,2}\s*일|\d{1,2}-\d{1,2}")
+_NUM_RE = re.compile(r"[+-]?\d+(?:[.,]\d+)*")
+
+def _features(question: str) -> Counter:
+    q = unicodedata.normalize("NFKC", question).lower()
+    q = _NUM_RE.sub("#", _DATE_RE.sub("@", q))
+    q = " " + re.sub(r"\s+", " ", q).strip() + " "
+    return Counter(q[i:i + n] for n in (2, 3) for i in range(len(q) - n + 1))
+
+
+def _cosine(a: Counter, b: Counter, nb: float) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(k * b[f] for f, k in a.items())
+    return dot / nb if nb else 0.0
+
+
+class NaiveBayes:
+    def __init__(self, alpha: float = 0.5):
+        self.alpha = alpha
+        self.log_prior: Dict[str, float] = {}
+        self._counts: Dict[str, Counter] = {}
+        self._totals: Dict[str, int] = {}
+        self._vocab: set = set()
+
+    def fit(self, samples: Iterable[Tuple[str, str]]) -> "NaiveBayes":
+        docs: Counter = Counter()
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        for question, label in samples:
+            docs[label] += 1
+            counts[label].update(_features(question))
+        n = sum(docs.values())
+        self.log_prior = {c: math.log(k / n) for c, k in docs.items()}
+        self._counts = dict(counts)
+        self._totals = {c: sum(f.values()) for c, f in counts.items()}
+        self._vocab = set().union(*counts.values()) if counts else set()
+        return self
+
+    def predict_proba(self, question: str) -> Dict[str, float]:
+        if not self.log_prior:
+            return {}
+        feats = _features(question)
+        v = len(self._vocab)
+        scores = {}
+        for c, prior in self.log_prior.items():
+            cnt, denom = self._counts[c], self._totals[c] + self.alpha * v
+            scores[c] = prior + sum(k * math.log((cnt[f] + self.alpha) / denom) for f, k in feats.items())
+        top = max(scores.values())
+        exp = {c: math.exp(s - top) for c, s in scores.items()}
+        z = sum(exp.values())
+        return {c: e / z for c, e in exp.items()}
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 모델
+# ──────────────────────────────────────────────────────────
+@lru_cache(maxsize=4)
+def _model(prompt: str) -> NaiveBayes:
+    _, examples = split_prompt(prompt)
+    samples = [(e.question, e.task) for e in examples]
+    return NaiveBayes().fit(samples)
+
+
+class _Index(NamedTuple):
+    head:     str
+    examples: List[Example]
+    feats:    List[Counter]
+    norms:    List[float]
+
+@lru_cache(maxsize=4)
+def _index(prompt: str) -> _Index:
+    head, examples = split_prompt(prompt)
+    feats = [_features(e.question) for e in examples]
+    norms = [math.sqrt(sum(k * k for k in f.values())) for f in feats]
+    return _Index(head, examples, feats, norms)
+
+
+# ──────────────────────────────────────────────────────────
+#  Public API
+# ──────────────────────────────────────────────────────────
+def classify(question: str, prompt: str) -> Tuple[Optional[str], float]:
+    """(예측 task, 사후확률) – 확률이 INTENT_MIN_PROB 미만이면 task = None"""
+    proba = _model(prompt).predict_proba(question)
+    if not proba:
+        return None, 0.0
+    task, p = max(proba.items(), key=lambda kv: kv[1])
+    return (task if p >= INTENT_MIN_PROB else None), p
+
+
+def prompt_for(question: str, prompt: str) -> Tuple[str, Optional[str]]:
+    """질문 → (HCX 에 보낼 시스템 프롬프트, 예측 task). 확신이 없으면 전체 프롬프트"""
+    task, _ = classify(question, prompt)
+    if task is None:
+        return prompt, None
+    idx = _index(prompt)
+    keep = {i for i, e in enumerate(idx.examples) if e.task == task}
+    if not keep:
+        return prompt, None
+    q = _features(question)
+    others = [i for i in range(len(idx.examples)) if i not in keep]
+    others.sort(key=lambda i: -_cosine(q, idx.feats[i], idx.norms[i]))
+    keep.update(others[:INTENT_NEIGHBOURS])
+    blocks = [idx.examples[i].block for i in sorted(keep)]      # 원래 예시 순서 유지
+    return idx.head + "\n" + "\n\n".join(blocks), task
+
+
+def warmup(prompt: str) -> None:
+    """모델 학습 · 프롬프트 분해를 미리 (app/warmup 에서 호출)"""
+    _model(prompt)
+    _index(prompt)
@@ -1,19 +1,29 @@
 # app/llm_bridge.py
 """
 HyperCLOVA API 래퍼
-  1) 최초 질문           → extract_params()
-  2) 후속(슬롯) 답변      → fill_missing()
+  1) 최초 질문           → extract_params()       / extract_params_async()
+  2) 후속(슬롯) 답변      → fill_missing_multi()   / fill_missing_multi_async()
+  3) 티커 후보 판별       → disambiguate_ticker_hcx() / disambiguate_ticker_hcx_async()
+
+HTTP 연결은 keep-alive 풀(httpx.Client / 이벤트 루프별 httpx.AsyncClient)을 재사용한다
+→ 호출마다 TLS 핸드셰이크를 다시 하지 않는다.
 """
 from __future__ import annotations
 
-import json, os, uuid, logging, functools, re, datetime as dt
+import json, os, uuid, logging, functools, re, hashlib, datetime as dt
+import asyncio, threading, weakref
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import copy
-import requests
+import httpx
 import time
 # from app.constants import TASK_REQUIRED
-from config import HCX_CONF_THRESHOLD
+from config import (
+    HCX_CONF_THRESHOLD, FAST_PARSE_ENABLED, INTENT_PROMPT_ENABLED,
+    LLM_TIMEOUT_S, LLM_PARSE_BUDGET_S, LLM_AUX_BUDGET_S,
+)
+from app import executor, fast_parser, intent, llm_policy, parse_cache, singleflight
 # from app.parsers import _regex_parse      # 순환 참조 방지
 
 logger = logging.getLogger(__name__)
@@ -25,9 +35,37 @@ _API_URL = os.getenv(
     "https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-005",
 )
 
-_TIMEOUT = 40
+_TIMEOUT = LLM_TIMEOUT_S            # 요청별 timeout 은 llm_policy 가 남은 예산에 맞춰 줄인다
+_POOL_LIMITS = httpx.Limits(
+    max_connections=32,               # 워커당 동시 HCX 요청 상한
+    max_keepalive_connections=16,
+    keepalive_expiry=60,              # 초 – 유휴 연결 유지
+)
 _SYS_PROMPT_PATH = Path(__file__).with_name("prompts") / "hcx_system_prompt.txt"
 SYSTEM_PROMPT = _SYS_PROMPT_PATH.read_text(encoding="utf-8").strip()
+_PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()[:16]   # 파싱 캐시 무효화 기준
+
+# ──────────────────────────── HTTP 클라이언트 풀 ────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _client() -> httpx.Client:
+    """동기 호출용 공유 클라이언트 (스레드 안전)"""
+    return httpx.Client(timeout=_TIMEOUT, limits=_POOL_LIMITS)
+
+# AsyncClient 는 만든 이벤트 루프에 묶이므로 루프별로 하나씩 둔다
+_aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _aclients.get(loop)
+    if client is None or client.is_closed:
+        client = _aclients[loop] = httpx.AsyncClient(timeout=_TIMEOUT, limits=_POOL_LIMITS)
+    return client
+
+async def aclose() -> None:
+    """현재 루프의 AsyncClient 종료 (FastAPI shutdown 훅)"""
+    client = _aclients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 # ──────────────────────────── 공통 유틸 ────────────────────────────
 def _safe_json(text: str) -> Optional[dict]:
@@ -43,15 +81,8 @@ def _safe_json(text: str) -> Optional[dict]:
         return None
 
 
-def _hcx_chat(messages: List[dict], *, api_key: str, max_tokens: int = 256, temperature: float = 0.5) -> Optional[str]:
-    """
-    messages = [{"role":"system","content":...}, {"role":"user","content":...}]
-    → assistant content 문자열 (실패 시 None)
-    """
-    if not api_key:
-        logger.info("HyperCLOVA 호출 건너뜀 (API Key 없음)")
-        return None
-
+def _hcx_request(messages: List[dict], api_key: str, max_tokens: int, temperature: float) -> tuple[dict, dict]:
+    """(headers, payload)"""
     headers = {
         "Authorization": f"Bearer {api_key}",
         "X-NCP-CLOVASTUDIO-REQUEST-ID": str(uuid.uuid4()),
@@ -67,18 +98,73 @@ def _hcx_chat(messages: List[dict], *, api_key: str, max_tokens: int = 256, temp
         "repetitionPenalty": 1.1,
         "includeAiFilters": False,
     }
+    return headers, payload
 
+def _hcx_content(r: httpx.Response) -> str:
+    r.raise_for_status()
+    data = r.json()
+    content = (
+        data.get("choices", [{}])[0].get("message", {}).get("content")
+        or data.get("result", {}).get("message", {}).get("content")
+        or ""
+    ).strip()
+    logger.debug("HCX raw answer: %s", content)
+    return content
+
+def _hcx_call(messages: List[dict], *, api_key: str, budget: llm_policy.Budget,
+              max_tokens: int = 256, temperature: float = 0.5) -> Optional[str]:
+    """
+    HCX 요청 (지연 예산 · 헤지 · 회로 차단 적용) → assistant content
+    실패는 예외 그대로 (httpx.HTTPError · llm_policy.CircuitOpen · llm_policy.BudgetExceeded)
+    """
+    if not api_key:
+        logger.info("HyperCLOVA 호출 건너뜀 (API Key 없음)")
+        return None
+
+    def send(timeout: float) -> str:
+        headers, payload = _hcx_request(messages, api_key, max_tokens, temperature)   # 헤지마다 새 request id
+        return _hcx_content(_client().post(_API_URL, headers=headers, json=payload, timeout=timeout))
+    return llm_policy.call(send, budget)
+
+async def _hcx_call_async(messages: List[dict], *, api_key: str, budget: llm_policy.Budget,
+                          max_tokens: int = 256, temperature: float = 0.5) -> Optional[str]:
+    """_hcx_call 의 비동기 버전 (응답 대기 중 이벤트 루프를 막지 않음)"""
+    if not api_key:
+        logger.info("HyperCLOVA 호출 건너뜀 (API Key 없음)")
+        return None
+
+    async def send(timeout: float) -> str:
+        headers, payload = _hcx_request(messages, api_key, max_tokens, temperature)
+        async with executor.LLM.slot():          # 워커당 동시 HCX 요청 수 제한
+            r = await _async_client().post(_API_URL, headers=headers, json=payload, timeout=timeout)
+        return _hcx_content(r)
+    return await llm_policy.acall(send, budget)
+
+def _hcx_chat(messages: List[dict], *, api_key: str, max_tokens: int = 256, temperature: float = 0.5) -> Optional[str]:
+    """
+    messages = [{"role":"system","content":...}, {"role":"user","content":...}]
+    → assistant content 문자열 (실패 시 None, 예산 LLM_AUX_BUDGET_S)
+    """
     try:
-        r = requests.post(_API_URL, headers=headers, json=payload, timeout=_TIMEOUT)
-        r.raise_for_status()
-        data = r.json()
-        content = (
-            data.get("choices", [{}])[0].get("message", {}).get("content")
-            or data.get("result", {}).get("message", {}).get("content")
-            or ""
-        ).strip()
-        logger.debug("HCX raw answer: %s", content)
-        return content
+        return _hcx_call(messages, api_key=api_key, budget=llm_policy.Budget(LLM_AUX_BUDGET_S),
+                         max_tokens=max_tokens, temperature=temperature)
+    except llm_policy.CircuitOpen:
+        logger.warning("HCX 회로 차단 중 – 호출 건너뜀")
+        return None
+    except Exception as e:
+        logger.exception("HCX 요청 실패: %s", e)
+        return None
+
+async def _hcx_chat_async(messages: List[dict], *, api_key: str, max_tokens: int = 256, temperature: float = 0.5) -> Optional[str]:
+    """_hcx_chat 의 비동기 버전"""
+    try:
+        return await _hcx_call_async(messages, api_key=api_key, budget=llm_policy.Budget(LLM_AUX_BUDGET_S),
+                                     max_tokens=max_tokens, temperature=temperature)
+    except executor.Overloaded:
+        raise
+    except llm_policy.CircuitOpen:
+        logger.warning("HCX 회로 차단 중 – 호출 건너뜀")
+        return None
     except Exception as e:
         logger.exception("HCX 요청 실패: %s", e)
         return None
@@ -117,42 +203,64 @@ _JSON_EXPECT     = {"task","date","date_from","date_to","market","tickers","metr
 _JSON_EXPECT_MIN = {"task"}
 _DEF_DATE        = (dt.date.today() - dt.timedelta(days=1)).isoformat()
 _DEF_TOPN        = 10
+UNAVAILABLE     = "llm_unavailable"   # HCX 장애(회로 차단 · 예산 소진 · 일시 오류)로 파싱 불가 → router 가 안내문 응답
 
-@functools.lru_cache(maxsize=256)
-def _extract_params_cached(question: str, api_key: str) -> Dict[str, Any]:
-    """
-    HCX 호출 후 결과 파싱 + 기본 필드 보정
-    """
+_RETRY_MAX   = 3                 # 429 재시도 횟수
+_RETRY_DELAY = 1.0               # 초 – 지수 백오프 시작값
 
-    def _try_hcx_chat_with_retry(max_retries=3, initial_delay=1.0) -> dict:
-        delay = initial_delay
-        for attempt in range(max_retries):
-            try:
-                hcx_ans = _hcx_chat(
-                    [{"role": "system", "content": SYSTEM_PROMPT},
-                     {"role": "user", "content": question}],
-                    api_key=api_key
-                ) or ""
-                return _safe_json(hcx_ans) or {}
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    logger.warning(f"429 Too Many Requests – {delay:.1f}s 후 재시도 ({attempt+1}/{max_retries})")
-                    time.sleep(delay)
-                    delay *= 2  # 지수 백오프
-                else:
-                    logger.exception("HCX API 오류")
-                    break
-
-            except Exception:
-                logger.exception("HCX 파싱 도중 예외 발생")
-                break
+# 질문 → 파싱 결과 캐시 (동기 · 비동기 경로 공용)
+_PARAMS_CACHE: "OrderedDict[tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_PARAMS_CACHE_SIZE = 256
+_params_lock = threading.Lock()
+_PARSE_FLIGHT = singleflight.group("llm_bridge.extract_params")   # 같은 질문 동시 파싱 합치기
 
-        return {}
+def _params_cache_get(key: tuple[str, str]) -> Optional[Dict[str, Any]]:
+    with _params_lock:
+        hit = _PARAMS_CACHE.get(key)
+        if hit is not None:
+            _PARAMS_CACHE.move_to_end(key)
+        return hit
+
+def _params_cache_put(key: tuple[str, str], data: Dict[str, Any]) -> None:
+    with _params_lock:
+        _PARAMS_CACHE[key] = data
+        _PARAMS_CACHE.move_to_end(key)
+        while len(_PARAMS_CACHE) > _PARAMS_CACHE_SIZE:
+            _PARAMS_CACHE.popitem(last=False)
+
+def _extract_messages(question: str, short: bool = False) -> List[dict]:
+    """short=True 면 로컬 분류기(app/intent)가 고른 task 전용 짧은 프롬프트"""
+    prompt = SYSTEM_PROMPT
+    if short and INTENT_PROMPT_ENABLED:
+        prompt, _ = intent.prompt_for(question, SYSTEM_PROMPT)
+    return [{"role": "system", "content": prompt},
+            {"role": "user", "content": question}]
+
+def _retry_delay(e: Exception, attempt: int, delay: float, budget: llm_policy.Budget) -> Optional[float]:
+    """재시도할 만하고 예산이 남았으면 다음 대기 시간, 아니면 None (재시도 중단)"""
+    if isinstance(e, llm_policy.CircuitOpen):
+        logger.warning("HCX 회로 차단 중 – 로컬 파서 결과만 사용")
+        return None
+    if isinstance(e, llm_policy.BudgetExceeded):
+        logger.warning("HCX 지연 예산 소진")
+        return None
+    if llm_policy.is_outage(e) and budget.remaining() > delay:
+        logger.warning(f"HCX 일시 오류({e.__class__.__name__}) – {delay:.1f}s 후 재시도 ({attempt+1}/{_RETRY_MAX})")
+        return delay * 2  # 지수 백오프
+    if isinstance(e, httpx.HTTPError):
+        logger.exception("HCX API 오류")
+    else:
+        logger.exception("HCX 파싱 도중 예외 발생")
+    return None
 
-    # HCX 호출 (최대 3회까지 재시도)
-    data = _try_hcx_chat_with_retry()
+def _is_down(e: Exception) -> bool:
+    """HCX 자체를 쓸 수 없는 실패인지 (응답 내용 문제 · 4xx 는 아님)"""
+    return isinstance(e, (llm_policy.CircuitOpen, llm_policy.BudgetExceeded)) or llm_policy.is_outage(e)
 
+def _finalize_params(question: str, data: dict) -> Dict[str, Any]:
+    """
+    HCX 결과 파싱 + 기본 필드 보정
+    """
     if _JSON_EXPECT_MIN.issubset(data):
         data.setdefault("date", _DEF_DATE)
         data.setdefault("date_from", _DEF_DATE)
@@ -179,11 +287,136 @@ def _extract_params_cached(question: str, api_key: str) -> Dict[str, Any]:
     logger.warning("HCX 파싱 실패: %s", question)
     return {"task": "unknown"}
 
+def _from_parse_cache(key: tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """영속 파싱 캐시(app/parse_cache) 적중 시 보정까지 끝낸 결과"""
+    raw = parse_cache.get(key[0], _PROMPT_VERSION)
+    if raw is None:
+        return None
+    out = _finalize_params(key[0], raw)
+    _params_cache_put(key, out)
+    return out
+
+def _from_fast_parser(key: tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """정형 질문이면 규칙 기반 파서(app/fast_parser) 결과, 아니면 None"""
+    if not FAST_PARSE_ENABLED:
+        return None
+    raw = fast_parser.parse(key[0])
+    if raw is None:
+        return None
+    out = _finalize_params(key[0], raw)
+    _params_cache_put(key, out)
+    return out
+
+def _to_parse_cache(question: str, data: dict) -> None:
+    """파싱에 성공한 HCX 원본만 저장 (실패 · 키 없음은 저장하지 않음)"""
+    if _JSON_EXPECT_MIN.issubset(data):
+        parse_cache.put(question, _PROMPT_VERSION, copy.deepcopy(data))
+
+def _extract_params_cached(question: str, api_key: str) -> Dict[str, Any]:
+    """
+    HCX 호출(최대 3회까지 재시도) 후 결과 파싱 + 기본 필드 보정
+    메모리 LRU → 규칙 기반 파서 → 영속 파싱 캐시 → HCX 순서로 조회
+    메모리 LRU miss 이후는 같은 질문 동시 요청끼리 한 번만 실행 (single-flight)
+    """
+    key = (question, api_key)
+    if (hit := _params_cache_get(key)) is not None:
+        return hit
+    return _PARSE_FLIGHT.do(key, _extract_params_miss, key)
+
+def _extract_params_miss(key: tuple[str, str]) -> Dict[str, Any]:
+    question, api_key = key
+    if (hit := _params_cache_get(key)) is not None:      # 앞선 leader 가 방금 채웠을 수 있음
+        return hit
+    if (hit := _from_fast_parser(key)) is not None:
+        return hit
+    if (hit := _from_parse_cache(key)) is not None:
+        return hit
+
+    data: dict = {}
+    ok = down = False
+    budget = llm_policy.Budget(LLM_PARSE_BUDGET_S)
+    delay = _RETRY_DELAY
+    for attempt in range(_RETRY_MAX):
+        try:
+            hcx_ans = _hcx_call(_extract_messages(question, short=True), api_key=api_key, budget=budget) or ""
+            data = _safe_json(hcx_ans) or {}
+            if hcx_ans and not _JSON_EXPECT_MIN.issubset(data) and INTENT_PROMPT_ENABLED:
+                # 짧은 프롬프트로 실패 → 전체 프롬프트로 한 번 더
+                hcx_ans = _hcx_call(_extract_messages(question), api_key=api_key, budget=budget) or ""
+                data = _safe_json(hcx_ans) or {}
+            ok = True
+            break
+        except executor.Overloaded:
+            raise
+        except Exception as e:
+            down = _is_down(e)
+            if (nxt := _retry_delay(e, attempt, delay, budget)) is None:
+                break
+            time.sleep(delay)
+            delay = nxt
+
+    if not ok:                          # HCX 장애 – 실패를 캐시하지 않아 복구 후 다시 파싱
+        return {"task": UNAVAILABLE} if down else _finalize_params(question, data)
+    _to_parse_cache(question, data)
+    out = _finalize_params(question, data)
+    _params_cache_put(key, out)
+    return out
+
+async def _extract_params_cached_async(question: str, api_key: str) -> Dict[str, Any]:
+    """_extract_params_cached 의 비동기 버전 (같은 캐시 공유)"""
+    key = (question, api_key)
+    if (hit := _params_cache_get(key)) is not None:
+        return hit
+    return await _PARSE_FLIGHT.ado(key, _extract_params_miss_async, key)
+
+async def _extract_params_miss_async(key: tuple[str, str]) -> Dict[str, Any]:
+    question, api_key = key
+    if (hit := _params_cache_get(key)) is not None:
+        return hit
+    if (hit := _from_fast_parser(key)) is not None:
+        return hit
+    if (hit := _from_parse_cache(key)) is not None:
+        return hit
+
+    data: dict = {}
+    ok = down = False
+    budget = llm_policy.Budget(LLM_PARSE_BUDGET_S)
+    delay = _RETRY_DELAY
+    for attempt in range(_RETRY_MAX):
+        try:
+            hcx_ans = await _hcx_call_async(_extract_messages(question, short=True), api_key=api_key, budget=budget) or ""
+            data = _safe_json(hcx_ans) or {}
+            if hcx_ans and not _JSON_EXPECT_MIN.issubset(data) and INTENT_PROMPT_ENABLED:
+                # 짧은 프롬프트로 실패 → 전체 프롬프트로 한 번 더
+                hcx_ans = await _hcx_call_async(_extract_messages(question), api_key=api_key, budget=budget) or ""
+                data = _safe_json(hcx_ans) or {}
+            ok = True
+            break
+        except executor.Overloaded:
+            raise
+        except Exception as e:
+            down = _is_down(e)
+            if (nxt := _retry_delay(e, attempt, delay, budget)) is None:
+                break
+            await asyncio.sleep(delay)
+            delay = nxt
+
+    if not ok:                          # HCX 장애 – 실패를 캐시하지 않아 복구 후 다시 파싱
+        return {"task": UNAVAILABLE} if down else _finalize_params(question, data)
+    _to_parse_cache(question, data)
+    out = _finalize_params(question, data)
+    _params_cache_put(key, out)
+    return out
+
 def extract_params(question: str, api_key: str) -> dict:
     """
     캐시된 원본을 손상시키지 않기 위해 deepcopy 해서 반환
     """
     return copy.deepcopy(_extract_params_cached(question, api_key))
+
+async def extract_params_async(question: str, api_key: str) -> dict:
+    """extract_params 의 비동기 버전"""
+    return copy.deepcopy(await _extract_params_cached_async(question, api_key))
 # ────────────────────────── ② 슬롯 전용 파서 ─────────────────────────
 _FOLLOW_PROMPTS_PATH = Path(__file__).with_name("prompts") / "follow_prompt.json"
 try:
@@ -211,14 +444,7 @@ def fill_missing(user_reply: str, slot: str, api_key: str) -> dict | None:
     logger.debug("fill_missing 실패(slot=%s): %s", slot, hcx_ans)
     return None
 
-def fill_missing_multi(user_reply: str, slots: list[str], api_key: str) -> Optional[dict]:
-    """
-    사용자의 후속 답변에서 `slots` 에 해당하는 값만 추출 → {slot: value, …}
-    실패 시 None
-    """
-    if not slots:
-        return {}
-
+def _fill_multi_messages(user_reply: str, slots: list[str]) -> List[dict]:
     # ① 시스템 프롬프트 작성
     slot_line = ", ".join(slots)
     sample = "{" + ", ".join(f'"{s}": "<value>"' for s in slots) + "}"
@@ -234,19 +460,44 @@ def fill_missing_multi(user_reply: str, slots: list[str], api_key: str) -> Optio
         "{\"tickers\"에 대해서는 {\"tickers\":[\"삼성전자\"]} 형태로 종목명을 반환하라.\n"
         "\"코스피\"/\"KOSPI\"가 질문에 포함되면 \"market\":\"KOSPI\", \"코스닥\"/\"KOSDAQ\"이 포함되면 \"market\":\"KOSDAQ\", 없으면 null로 반환하라."
     )
+    return [{"role": "system", "content": sys_prompt},
+            {"role": "user",   "content": user_reply}]
+
+def _parse_fill_multi(ans: str, slots: list[str]) -> Optional[dict]:
+    logger.debug("fill_missing_multi 응답(slots=%s): %s", slots, ans)
+    data = _safe_json(ans) or {}
+    data = _clean_params(data)
+    return {k: v for k, v in data.items() if k in slots and v not in (None, "", [])} or None
+
+def fill_missing_multi(user_reply: str, slots: list[str], api_key: str) -> Optional[dict]:
+    """
+    사용자의 후속 답변에서 `slots` 에 해당하는 값만 추출 → {slot: value, …}
+    실패 시 None
+    """
+    if not slots:
+        return {}
 
     # ② HCX 호출
     ans = _hcx_chat(
-        [{"role": "system", "content": sys_prompt},
-         {"role": "user",   "content": user_reply}],
+        _fill_multi_messages(user_reply, slots),
         api_key=api_key,
         max_tokens=128,
         temperature=0.2,
     ) or ""
-    print(ans)
-    data = _safe_json(ans) or {}
-    data = _clean_params(data)
-    return {k: v for k, v in data.items() if k in slots and v not in (None, "", [])} or None
+    return _parse_fill_multi(ans, slots)
+
+async def fill_missing_multi_async(user_reply: str, slots: list[str], api_key: str) -> Optional[dict]:
+    """fill_missing_multi 의 비동기 버전"""
+    if not slots:
+        return {}
+
+    ans = await _hcx_chat_async(
+        _fill_multi_messages(user_reply, slots),
+        api_key=api_key,
+        max_tokens=128,
+        temperature=0.2,
+    ) or ""
+    return _parse_fill_multi(ans, slots)
 
 # ──────────────────── 티커 디스앰비규에이션 ─────────────────────
 _DISAMBIG_SYS = """
@@ -256,27 +507,19 @@ _DISAMBIG_SYS = """
 {"best": "<후보 중 하나 그대로>", "confidence": 0~1}
 """
 
-def disambiguate_ticker_hcx(alias: str, candidates: list[str], api_key: str) -> tuple[str, float]:
-    """
-    별칭(alias)과 후보 종목명 리스트를 HyperCLOVA-X에 넘겨
-    가장 적합한 종목명과 confidence(0~1)를 받아온다.
-    실패 시 (첫 후보, 0.0) 반환
-    """
+def _disambig_messages(alias: str, candidates: list[str]) -> List[dict]:
     cand_line = ", ".join(candidates)
     usr_prompt = (
         f"사용자 별칭: '{alias}'\n"
         f"후보: {cand_line}\n"
         f"가장 잘 맞는 하나를 골라 JSON 형식으로 답변하세요."
     )
-    ans = _hcx_chat(
-        [
-            {"role": "system", "content": _DISAMBIG_SYS},
-            {"role": "user",   "content": usr_prompt},
-        ],
-        api_key=api_key,
-        max_tokens=128, temperature=0.0
-    ) or ""
-    # print(ans)      
+    return [
+        {"role": "system", "content": _DISAMBIG_SYS},
+        {"role": "user",   "content": usr_prompt},
+    ]
+
+def _parse_disambig(ans: str, candidates: list[str]) -> tuple[str, float]:
     data = _safe_json(ans) or {}
     best = data.get("best")
     try:
@@ -289,6 +532,76 @@ def disambiguate_ticker_hcx(alias: str, candidates: list[str], api_key: str) ->
         best, conf = candidates[0], 0.0
     return best, conf
 
+def disambiguate_ticker_hcx(alias: str, candidates: list[str], api_key: str) -> tuple[str, float]:
+    """
+    별칭(alias)과 후보 종목명 리스트를 HyperCLOVA-X에 넘겨
+    가장 적합한 종목명과 confidence(0~1)를 받아온다.
+    실패 시 (첫 후보, 0.0) 반환
+    """
+    ans = _hcx_chat(
+        _disambig_messages(alias, candidates),
+        api_key=api_key,
+        max_tokens=128, temperature=0.0
+    ) or ""
+    return _parse_disambig(ans, candidates)
+
+async def disambiguate_ticker_hcx_async(alias: str, candidates: list[str], api_key: str) -> tuple[str, float]:
+    """disambiguate_ticker_hcx 의 비동기 버전"""
+    ans = await _hcx_chat_async(
+        _disambig_messages(alias, candidates),
+        api_key=api_key,
+        max_tokens=128, temperature=0.0
+    ) or ""
+    return _parse_disambig(ans, candidates)
+
+_DISAMBIG_MULTI_SYS = """
+당신은 한국 주식 종목명을 해석하는 AI입니다.
+번호가 붙은 여러 ‘사용자 별칭’과 각 별칭의 ‘후보’ 종목명이 주어집니다.
+별칭마다 그 별칭을 가장 잘 설명하는 **하나의** 후보를 고르세요.
+반환 형식(JSON only):
+{"results": [{"id": 1, "best": "<해당 별칭 후보 중 하나 그대로>", "confidence": 0~1}, ...]}
+"""
+
+def disambiguate_tickers_hcx(items: list[tuple[str, list[str]]], api_key: str) -> list[tuple[str, float]]:
+    """
+    여러 (별칭, 후보 리스트)를 **한 번의** HyperCLOVA-X 호출로 판별.
+    반환 순서는 items 순서. 항목별 실패 시 (첫 후보, 0.0)
+    """
+    if len(items) == 1:
+        return [disambiguate_ticker_hcx(items[0][0], items[0][1], api_key)]
+
+    usr_prompt = "\n".join(
+        f"{i}. 사용자 별칭: '{alias}' / 후보: {', '.join(cands)}"
+        for i, (alias, cands) in enumerate(items, 1)
+    ) + "\n각 별칭마다 가장 잘 맞는 하나를 골라 JSON 형식으로 답변하세요."
+    ans = _hcx_chat(
+        [
+            {"role": "system", "content": _DISAMBIG_MULTI_SYS},
+            {"role": "user",   "content": usr_prompt},
+        ],
+        api_key=api_key,
+        max_tokens=64 * len(items) + 32, temperature=0.0
+    ) or ""
+    data = _safe_json(ans) or {}
+
+    picked: Dict[int, tuple[Any, Any]] = {}
+    for r in data.get("results") or []:
+        if isinstance(r, dict):
+            picked[r.get("id")] = (r.get("best"), r.get("confidence", 0))
+
+    out: list[tuple[str, float]] = []
+    for i, (_, cands) in enumerate(items, 1):
+        best, conf = picked.get(i, (None, 0))
+        try:
+            conf = float(conf)
+        except (TypeError, ValueError):
+            conf = 0.0
+        # 유효성 체크: best 가 해당 별칭 후보 안에 없으면 신뢰도 0 처리
+        if best not in cands:
+            best, conf = cands[0], 0.0
+        out.append((best, conf))
+    return out
+
 # ─────────────────── confidence 외부 접근용 ────────────────────
 def is_confident(conf: float) -> bool:
     """HCX confidence 가 임계치 이상인지 여부"""
@@ -0,0 +1,301 @@
+# app/llm_policy.py
+"""
+HCX 호출 정책 – 지연 예산 · 헤지 요청 · 회로 차단기
+
+  Budget          : 요청 1건(재시도 포함)에 쓸 수 있는 총 시간. 요청별 timeout = min(남은 예산, LLM_TIMEOUT_S)
+  LatencyTracker  : 최근 성공 호출 지연 (p50/p95/p99)
+  헤지            : 첫 요청이 p95(하한 LLM_HEDGE_MIN_MS) 안에 안 끝나면 같은 요청을 하나 더 보내
+                    먼저 성공한 응답을 쓴다. 헤지는 전체 호출의 LLM_HEDGE_MAX_RATIO 이하로 제한.
+  CircuitBreaker  : 연속 LLM_BREAKER_FAILS 회 실패(타임아웃 · 연결 오류 · 429 · 5xx) → 열림.
+                    열린 동안은 HCX 를 부르지 않고 CircuitOpen 을 바로 던진다 → llm_bridge 는
+                    규칙 기반 파서 · 파싱 캐시 결과만으로 응답. LLM_BREAKER_COOLDOWN_S 뒤 시험 호출 1건.
+
+  call(send, budget)         : 동기 – send(timeout) 는 HCX 요청 1회
+  await acall(send, budget)  : 비동기 – send(timeout) 는 코루틴 함수
+
+• 실패는 예외 그대로 올린다 (재시도 판단은 호출 측).
+• shutdown() : 동기 헤지 스레드 풀 종료 (main.py 종료 훅)
+• stats() : 호출/성공/실패/타임아웃/헤지(발사·승리)/예산 초과/차단 건수, 지연 분위수, 회로 상태 (GET /stats)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from config import (
+    LLM_TIMEOUT_S, LLM_HEDGE_ENABLED, LLM_HEDGE_MIN_MS, LLM_HEDGE_MAX_RATIO,
+    LLM_BREAKER_FAILS, LLM_BREAKER_COOLDOWN_S,
+)
+
+T = TypeVar("T")
+
+_HEDGE_MIN_SAMPLES = 20          # p95 를 믿을 만한 최소 표본 수
+
+
+class CircuitOpen(RuntimeError):
+    """HCX 회로 차단 중"""
+
+class BudgetExceeded(TimeoutError):
+    """지연 예산 소진"""
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 지연 예산
+# ──────────────────────────────────────────────────────────
+class Budget:
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout(self) -> float:
+        """이번 요청에 줄 timeout (예산이 없으면 BudgetExceeded)"""
+        left = self.remaining()
+        if left <= 0.05:
+            _count("budget_exceeded")
+            raise BudgetExceeded("HCX latency budget exhausted")
+        return min(left, LLM_TIMEOUT_S)
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 지연 분위수
+# ──────────────────────────────────────────────────────────
+class LatencyTracker:
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            xs = sorted(self._samples)
+        if not xs:
+            return None
+        return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 회로 차단기
+# ──────────────────────────────────────────────────────────
+class CircuitBreaker:
+    def __init__(self, fails: int, cooldown: float):
+        self.fails, self.cooldown = fails, cooldown
+        self._lock = threading.Lock()
+        self.state = "closed"            # closed | open | half_open
+        self._streak = 0
+        self._opened_at = 0.0
+        self.opened = 0                  # 누적 열림 횟수
+
+    def check(self) -> None:
+        """호출 허용 여부 – 막히면 CircuitOpen"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half_open"     # 시험 호출 1건만 통과
+                return
+        _count("short_circuited")
+        raise CircuitOpen("HCX circuit is open")
+
+    def success(self) -> None:
+        with self._lock:
+            self._streak = 0
+            self.state = "closed"
+
+    def failure(self) -> None:
+        with self._lock:
+            self._streak += 1
+            if self.state == "half_open" or (self.state == "closed" and self._streak >= self.fails):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+    def release(self) -> None:
+        """시험 호출이 HCX 상태를 확인하지 못하고 끝남(취소 · 로컬 오류 · 4xx) → 다음 호출이 다시 시험하도록"""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+
+def is_outage(e: BaseException) -> bool:
+    """HCX 쪽 장애로 볼 예외 (요청 자체가 잘못된 4xx 는 제외) – 재시도 · 회로 차단 판단 기준"""
+    if isinstance(e, httpx.HTTPStatusError):
+        code = e.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(e, (httpx.TimeoutException, httpx.TransportError, TimeoutError))
+
+
+# ──────────────────────────────────────────────────────────
+#  4. 공유 상태 · 통계
+# ──────────────────────────────────────────────────────────
+LATENCY = LatencyTracker()
+BREAKER = CircuitBreaker(LLM_BREAKER_FAILS, LLM_BREAKER_COOLDOWN_S)
+
+_stats_lock = threading.Lock()
+_counts: Dict[str, int] = dict.fromkeys(
+    ("calls", "ok", "failed", "timeouts", "hedged", "hedge_won", "budget_exceeded", "short_circuited"), 0)
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _counts[name] += n
+
+def _hedge_delay(timeout: float) -> Optional[float]:
+    """헤지 요청을 보낼 시점(초) – 헤지하지 않으면 None"""
+    if not LLM_HEDGE_ENABLED or len(LATENCY) < _HEDGE_MIN_SAMPLES:
+        return None
+    with _stats_lock:
+        if _counts["hedged"] >= LLM_HEDGE_MAX_RATIO * max(_counts["calls"], 1):
+            return None
+    p95 = LATENCY.quantile(0.95) or 0.0
+    delay = max(p95, LLM_HEDGE_MIN_MS / 1e3)
+    return delay if delay < timeout else None
+
+def _record(t0: float, err: BaseException | None) -> None:
+    if err is None:
+        LATENCY.add(time.monotonic() - t0)
+        BREAKER.success()
+        _count("ok")
+        return
+    if isinstance(err, asyncio.CancelledError):
+        BREAKER.release()
+        return
+    _count("failed")
+    if isinstance(err, (httpx.TimeoutException, TimeoutError)):
+        _count("timeouts")
+    if is_outage(err):
+        BREAKER.failure()
+    else:
+        # executor.Overloaded · 4xx 등은 HCX 가 건강하다는 증거가 아니다 → 닫지 않고 시험 호출만 반납
+        BREAKER.release()
+
+
+# ──────────────────────────────────────────────────────────
+#  5. 동기 호출
+# ──────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def _hedge_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="hcx-hedge")
+
+def shutdown() -> None:
+    """헤지 스레드 풀 종료 (앱 종료 훅 · 테스트에서 호출, 다음 호출 때 다시 생성)"""
+    if _hedge_pool.cache_info().currsize:
+        _hedge_pool().shutdown(wait=False, cancel_futures=True)
+        _hedge_pool.cache_clear()
+
+def _hedged(send: Callable[[float], T], timeout: float, delay: float) -> T:
+    t_end = time.monotonic() + timeout
+    first = _hedge_pool().submit(send, timeout)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+
+    _count("hedged")
+    second = _hedge_pool().submit(send, max(0.05, t_end - time.monotonic()))
+    pending = {first, second}
+    err: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, t_end - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for fut in done:
+            if fut.exception() is None:
+                if fut is second:
+                    _count("hedge_won")
+                return fut.result()          # 늦은 쪽은 timeout 안에 스스로 끝남
+            err = fut.exception()
+    raise err or httpx.ReadTimeout("HCX hedged request timed out")
+
+def call(send: Callable[[float], T], budget: Budget) -> T:
+    """정책을 적용해 HCX 요청 1건 (헤지 포함) – 실패 시 예외"""
+    BREAKER.check()
+    timeout = budget.timeout()
+    _count("calls")
+    t0, err = time.monotonic(), None
+    try:
+        delay = _hedge_delay(timeout)
+        return send(timeout) if delay is None else _hedged(send, timeout, delay)
+    except BaseException as e:
+        err = e
+        raise
+    finally:
+        _record(t0, err)
+
+
+# ──────────────────────────────────────────────────────────
+#  6. 비동기 호출
+# ──────────────────────────────────────────────────────────
+async def _ahedged(send: Callable[[float], Awaitable[T]], timeout: float, delay: float) -> T:
+    t_end = time.monotonic() + timeout
+    first = asyncio.ensure_future(send(timeout))
+    pending = {first}
+    err: BaseException | None = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+
+        _count("hedged")
+        second = asyncio.ensure_future(send(max(0.05, t_end - time.monotonic())))
+        pending.add(second)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, t_end - time.monotonic()), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for fut in done:
+                if fut.exception() is None:
+                    if fut is second:
+                        _count("hedge_won")
+                    return fut.result()
+                err = fut.exception()
+        raise err or httpx.ReadTimeout("HCX hedged request timed out")
+    finally:
+        for fut in pending:                  # 진 쪽(또는 호출 측 취소 시 남은) 요청은 취소
+            fut.cancel()
+
+async def acall(send: Callable[[float], Awaitable[T]], budget: Budget) -> T:
+    """call() 의 비동기 버전 (진 헤지 요청은 취소)"""
+    BREAKER.check()
+    timeout = budget.timeout()
+    _count("calls")
+    t0, err = time.monotonic(), None
+    try:
+        delay = _hedge_delay(timeout)
+        return await (send(timeout) if delay is None else _ahedged(send, timeout, delay))
+    except BaseException as e:
+        err = e
+        raise
+    finally:
+        _record(t0, err)
+
+
+# ──────────────────────────────────────────────────────────
+#  Public API
+# ──────────────────────────────────────────────────────────
+def stats() -> Dict[str, Any]:
+    """HCX 호출 통계 (GET /stats)"""
+    def ms(q: float) -> Optional[float]:
+        v = LATENCY.quantile(q)
+        return round(v * 1e3, 1) if v is not None else None
+
+    with _stats_lock:
+        out: Dict[str, Any] = dict(_counts)
+    out.update(
+        p50_ms=ms(0.50), p95_ms=ms(0.95), p99_ms=ms(0.99),
+        circuit=BREAKER.state, circuit_opened=BREAKER.opened,
+    )
+    return out
@@ -0,0 +1,157 @@
+# app/name_index.py
+"""
+자모 n-gram 역색인 (종목명 fuzzy 후보 압축)
+
+• 한글 음절을 초성·중성·종성 자모로 분해한 뒤 n-gram(기본 2) 을 만든다.
+  "삼성전쟈" 와 "삼성전자" 는 음절 단위로는 1/4 이 다르지만 자모 단위로는 1/10 만 다르다.
+• gram → 이름 id 배열 역색인. 질의 gram 들의 posting 을 np.bincount 로 합산해
+  Dice 계수 상위 k 개만 후보로 남긴다 → rapidfuzz 는 이 후보만 채점.
+• 영문/숫자는 소문자로 그대로 사용 (해외 종목명 · 티커 별칭).
+
+AbbrevIndex 는 초성("ㅅㅅㅈㅈ")·접두어("에코프로비") 약어 입력을 로컬에서 바로 푼다.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# 호환용 자모 (U+3131~) – 초성 19 · 중성 21 · 종성 27(+없음)
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+def jamo(text: str) -> str:
+    """'삼성' → 'ㅅㅏㅁㅅㅓㅇ' (한글 외 문자는 소문자, 공백 제거)"""
+    out: List[str] = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(_JONG[code % 28])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def ngrams(text: str, n: int = 2) -> List[str]:
+    """자모 문자열 n-gram (양 끝 패딩 포함 → 짧은 이름도 gram 확보)"""
+    s = f"^{text}$"
+    return [s[i:i + n] for i in range(max(1, len(s) - n + 1))]
+
+
+class NameIndex:
+    """이름 목록 → 자모 n-gram 역색인"""
+
+    __slots__ = ("names", "keys", "_n", "_postings", "_sizes")
+
+    def __init__(self, names: Iterable[str], n: int = 2):
+        self.names: List[str] = list(names)
+        self.keys: List[str] = [jamo(x) for x in self.names]       # rapidfuzz 채점용
+        self._n = n
+        post: Dict[str, List[int]] = {}
+        sizes = np.zeros(len(self.names), dtype=np.int32)
+        for i, key in enumerate(self.keys):
+            grams = set(ngrams(key, n))
+            sizes[i] = len(grams)
+            for g in grams:
+                post.setdefault(g, []).append(i)
+        self._postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in post.items()}
+        self._sizes = sizes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def shortlist(self, query: str, k: int = 50) -> List[int]:
+        """질의와 gram 이 많이 겹치는 이름 id 상위 k 개 (Dice 계수 내림차순)"""
+        grams = set(ngrams(jamo(query), self._n))
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return []
+        counts = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        score = 2 * counts / (self._sizes + len(grams))
+        cand = np.flatnonzero(counts)
+        if len(cand) > k:
+            cand = cand[np.argpartition(-score[cand], k - 1)[:k]]
+        return cand[np.argsort(-score[cand], kind="stable")].tolist()
+
+
+# ──────────────────────────────────────────────────────────
+#  초성 · 접두어 색인 (약어 입력 "ㅅㅅㅈㅈ", "에코프로비")
+# ──────────────────────────────────────────────────────────
+_CHO_SET = set(_CHO)
+
+
+def chosung(text: str) -> str:
+    """'삼성전자' → 'ㅅㅅㅈㅈ' (한글 외 문자는 소문자, 공백 제거)"""
+    out: List[str] = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+        elif not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung(text: str) -> bool:
+    """초성(자음)만으로 이루어진 입력인지"""
+    return bool(text) and all(ch in _CHO_SET for ch in text)
+
+
+class PrefixTrie:
+    """문자 단위 trie – 노드마다 그 접두어를 가진 id 목록을 보관"""
+
+    __slots__ = ("_root",)
+
+    def __init__(self):
+        self._root: dict = {"": []}                 # "" 키 = 이 노드를 지나는 id 목록
+
+    def insert(self, key: str, ident: int) -> None:
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {"": []})
+            node[""].append(ident)
+
+    def find(self, prefix: str) -> List[int]:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node[""]
+
+
+class AbbrevIndex:
+    """
+    초성 완전일치 · 초성 접두어 · 이름 접두어 색인
+      "ㅅㅅㅈㅈ"   → 초성이 정확히 같은 이름
+      "ㅅㅅㅈ"     → 초성이 그렇게 시작하는 이름
+      "에코프로비" → 이름이 그렇게 시작하는 이름
+    """
+
+    __slots__ = ("names", "_cho", "_cho_trie", "_name_trie")
+
+    MIN_LEN = 2                                      # 1글자 접두어는 후보가 너무 많음
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        self._cho: Dict[str, List[int]] = {}
+        self._cho_trie = PrefixTrie()
+        self._name_trie = PrefixTrie()
+        for i, name in enumerate(self.names):
+            cho = chosung(name)
+            self._cho.setdefault(cho, []).append(i)
+            self._cho_trie.insert(cho, i)
+            self._name_trie.insert(name.lower().replace(" ", ""), i)
+
+    def match(self, query: str) -> List[int]:
+        q = query.strip().lower().replace(" ", "")
+        if len(q) < self.MIN_LEN:
+            return []
+        if is_chosung(q):
+            return self._cho.get(q) or self._cho_trie.find(q)
+        return self._name_trie.find(q)
@@ -0,0 +1,116 @@
+# app/name_scanner.py
+"""
+Aho-Corasick 종목명 스캐너 (순수 Python)
+
+• app/universe 의 공식 종목명 + alias_tickers.csv 별칭 전체로 오토마톤을 1회 구성.
+• 질문 원문을 한 번 훑어 등장하는 종목명을 모두 찾는다 (영문은 대소문자 무시).
+• 겹치는 매치는 **왼쪽 우선 · 가장 긴 것** 하나만 남긴다 ("삼성전자우" > "삼성전자").
+
+router 는 이 결과로 HCX 파라미터 추출과 **병렬로** 가격 캐시를 미리 읽어 둔다.
+(추측성 선행 작업이므로 오탐은 불필요한 캐시 읽기 정도의 비용만 든다)
+"""
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from app import universe
+
+_MIN_LEN = 2          # 1글자 이름은 일반 단어와 구분이 안 됨
+
+
+class NameMatch(NamedTuple):
+    name:   str       # 사전에 등록된 표기
+    ticker: str
+    start:  int
+    end:    int       # exclusive
+
+
+class Automaton:
+    """goto(dict) · fail · output 링크로 구성한 Aho-Corasick 오토마톤"""
+
+    __slots__ = ("_goto", "_fail", "_out", "_dict_link", "_patterns")
+
+    def __init__(self, patterns: Dict[str, str]):
+        self._patterns: List[Tuple[str, str]] = []      # (name, ticker)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[int] = [-1]                    # 이 노드에서 끝나는 패턴 id
+        for name, ticker in patterns.items():
+            key = name.lower()
+            if len(key) < _MIN_LEN:
+                continue
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(-1)
+                node = nxt
+            if self._out[node] < 0:
+                self._out[node] = len(self._patterns)
+                self._patterns.append((name, ticker))
+        self._build_links()
+
+    def _build_links(self) -> None:
+        n = len(self._goto)
+        self._fail = [0] * n
+        self._dict_link = [-1] * n                     # fail 체인에서 가장 가까운 출력 노드
+        q = deque(self._goto[0].values())
+        while q:
+            u = q.popleft()
+            for ch, v in self._goto[u].items():
+                f = self._fail[u]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(ch, 0)
+                self._fail[v] = f if f != v else 0
+                self._dict_link[v] = f if self._out[f] >= 0 else self._dict_link[f]
+                q.append(v)
+
+    def iter_matches(self, text: str):
+        """겹침 포함 모든 매치 (pattern id, end)"""
+        node = 0
+        for i, ch in enumerate(text.lower()):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            hit = node if self._out[node] >= 0 else self._dict_link[node]
+            while hit > 0:
+                yield self._out[hit], i + 1
+                hit = self._dict_link[hit]
+
+    def scan(self, text: str) -> List[NameMatch]:
+        """왼쪽 우선 · 최장 일치, 겹치지 않는 매치 목록"""
+        found = []
+        for pid, end in self.iter_matches(text):
+            name, ticker = self._patterns[pid]
+            found.append(NameMatch(name, ticker, end - len(name), end))
+        found.sort(key=lambda m: (m.start, -(m.end - m.start)))
+
+        out: List[NameMatch] = []
+        last_end = 0
+        for m in found:
+            if m.start >= last_end:
+                out.append(m)
+                last_end = m.end
+        return out
+
+
+@lru_cache(maxsize=1)
+def _automaton() -> Automaton:
+    return Automaton(universe.current().name_map)
+
+universe.on_reload(_automaton.cache_clear)      # 상장 목록 변경 시 다음 scan 에서 재구성
+
+
+def scan(text: str) -> List[NameMatch]:
+    """질문 원문 → 등장 종목명 매치 목록"""
+    return _automaton().scan(text)
+
+
+def scan_tickers(text: str) -> List[str]:
+    """질문 원문 → 등장 티커 (등장 순서, 중복 제거)"""
+    return list(dict.fromkeys(m.ticker for m in scan(text)))
@@ -0,0 +1,148 @@
+# app/parallel_screen.py
+"""
+종목검색 병렬 실행 (티커 샤드 × 프로세스 풀)
+
+동작 정책
+────────
+1. 가격 패널(2-level 컬럼 DF)을 float64 2-D 배열로 **공유 메모리**에 한 번만 올린다.
+   (패널 전체 사본을 따로 만들지 않고 컬럼 묶음 단위로 공유 메모리 뷰에 바로 쓴다)
+2. 유니버스를 SCREEN_WORKERS 개 샤드로 나눠 프로세스 풀에 제출.
+   워커는 공유 메모리에 붙어 자기 샤드 컬럼만 꺼내 DF 를 복원한 뒤 필터 함수를 돌린다.
+3. 샤드별 결과를 입력 티커 순서대로 합친다.
+
+• 티커 수가 SCREEN_PARALLEL_MIN 미만이거나 워커가 1개면 그냥 현재 프로세스에서 실행.
+• 필터 함수는 (df, tickers, *args) → list[str] 형태의 **모듈 최상위 함수**여야 한다(pickle).
+• 앱 종료 시 shutdown() (main.py shutdown 훅) → 풀 종료 + 아직 남은 공유 메모리 블록 unlink.
+• 워커는 forkserver(없으면 spawn)로 띄운다. 풀은 요청 처리 중(DATA 스레드)에 처음 만들어지는데,
+  이미 스레드가 여럿 도는 프로세스를 fork 하면 다른 스레드가 잡고 있던 락이 자식에서 영영 풀리지 않을 수 있다.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import SCREEN_WORKERS, SCREEN_PARALLEL_MIN
+
+FilterFn = Callable[..., List[str]]
+
+
+class _PanelMeta(NamedTuple):
+    shm_name: str
+    shape:    Tuple[int, int]
+    index:    np.ndarray            # datetime64[ns]
+    index_name: str | None
+    columns:  List[Tuple[str, str]]
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 프로세스 풀
+# ──────────────────────────────────────────────────────────
+_FILL_CHUNK = 256                   # 공유 메모리 채울 때 한 번에 변환할 컬럼 수 (임시 배열 크기 상한)
+_live: Dict[str, shared_memory.SharedMemory] = {}     # 스크리닝 중인 공유 메모리 블록
+_live_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _pool() -> ProcessPoolExecutor:
+    # 멀티스레드 부모에서 fork 하면 교착 위험 → forkserver (없으면 spawn)
+    method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=SCREEN_WORKERS, mp_context=mp.get_context(method))
+
+
+def shutdown() -> None:
+    """풀 종료 + 남은 공유 메모리 블록 해제 (앱 종료 훅 · 테스트에서 호출)"""
+    if _pool.cache_info().currsize:
+        _pool().shutdown(wait=False, cancel_futures=True)
+        _pool.cache_clear()
+    with _live_lock:
+        blocks = list(_live.values())
+        _live.clear()
+    for shm in blocks:
+        _release(shm)
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        pass                                       # 호출 스레드가 아직 채우는 중 – 매핑은 그쪽이 끝나면 해제
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass                                       # shutdown() 과 호출 스레드가 동시에 해제
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 워커
+# ──────────────────────────────────────────────────────────
+def _run_shard(meta: _PanelMeta, cols: np.ndarray, tickers: List[str],
+               fn: FilterFn, args: tuple) -> List[str]:
+    shm = shared_memory.SharedMemory(name=meta.shm_name)
+    try:
+        arr = np.ndarray(meta.shape, dtype=np.float64, buffer=shm.buf)
+        block = arr[:, cols]                       # fancy index → 샤드만 복사
+        del arr
+    finally:
+        shm.close()
+    df = pd.DataFrame(
+        block,
+        index=pd.DatetimeIndex(meta.index, name=meta.index_name),
+        columns=pd.MultiIndex.from_tuples([meta.columns[i] for i in cols]),
+    )
+    return fn(df, tickers, *args)
+
+
+# ──────────────────────────────────────────────────────────
+#  3. Public API
+# ──────────────────────────────────────────────────────────
+def _shards(tickers: Sequence[str], n: int) -> List[List[str]]:
+    size = -(-len(tickers) // n)
+    return [list(tickers[i:i + size]) for i in range(0, len(tickers), size)]
+
+
+def screen_shards(df: pd.DataFrame, tickers: Sequence[str], fn: FilterFn, *args) -> List[str]:
+    """
+    fn(df, tickers, *args) 를 티커 샤드 단위로 병렬 실행해 결과를 합친다.
+    (결과 순서는 입력 tickers 순서)
+    """
+    tickers = list(tickers)
+    if (SCREEN_WORKERS <= 1 or len(tickers) < SCREEN_PARALLEL_MIN
+            or not isinstance(df.columns, pd.MultiIndex)):
+        return fn(df, tickers, *args)
+
+    shape = df.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 8, 1))
+    with _live_lock:
+        _live[shm.name] = shm
+    try:
+        arr = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for a in range(0, shape[1], _FILL_CHUNK):
+            arr[:, a:a + _FILL_CHUNK] = df.iloc[:, a:a + _FILL_CHUNK].to_numpy(dtype=np.float64)
+        del arr
+        meta = _PanelMeta(
+            shm.name, shape,
+            df.index.to_numpy(dtype="datetime64[ns]"), df.index.name,
+            list(df.columns),
+        )
+
+        level0 = df.columns.get_level_values(0)
+        futures = []
+        for shard in _shards(tickers, SCREEN_WORKERS):
+            cols = np.flatnonzero(level0.isin(shard))
+            futures.append(_pool().submit(_run_shard, meta, cols, shard, fn, args))
+
+        hits = set()
+        for f in futures:
+            hits.update(f.result())
+    finally:
+        with _live_lock:
+            mine = _live.pop(shm.name, None) is not None
+        if mine:
+            _release(shm)
+    return [t for t in tickers if t in hits]
@@ -0,0 +1,272 @@
+# app/parse_cache.py
+"""
+질문 → HCX 파싱 결과 영속 캐시 (SQLite, 워커 간 공유)
+
+키 = 정규화된 질문 템플릿
+────────
+1. NFKC · 소문자 · 끝 문장부호 제거 · **공백 전부 제거** ("삼성전자 종가는?" == "삼성전자종가는")
+2. 날짜(YYYY-MM-DD, YYYY.MM.DD, YYYY년 M월 D일) → <D>, 숫자(만/억/천/조 단위 포함) → <N>
+   예) "2025-05-14에 거래량이 전날대비 300% 이상 증가한 종목" → "<D>에거래량이전날대비<N>%이상증가한종목"
+
+값 = HCX 원본 JSON (기본값 보정 전)
+────────
+• 질문 속 날짜/숫자와 **값이 같은** 필드는 자리표시자로 저장 → 적중 시 새 질문의 값으로 치환.
+  ("2024-10-11 KOSPI 거래량 상위 10개" 를 저장해 두면 "2024-10-07 … 3개" 도 HCX 없이 답함)
+• 결과에 그대로 드러나지 않는 토큰(예: "2024년 3분기" 의 2024 → date_from 2024-07-01)은
+  원래 값으로 **고정(pin)** → 값이 같은 질문만 적중.
+• 상대 날짜 표현(오늘·어제·최근 …)이 있는 질문에서 질문에 없는 날짜가 나오면
+  저장 시점 기준 일수 차이로 저장 → 적중한 날 기준으로 다시 계산.
+• 그 밖에 질문에 없는 날짜를 HCX 가 추정해 채운 경우(날짜 없는 질문 → 오늘 날짜 등)는
+  고정 토큰(연도)으로 설명되지 않으면 저장하지 않는다 → 다른 날 같은 질문에 낡은 날짜로 답하지 않음.
+• 적중 기록(hits · 만료 연장)은 메모리에 모아 PARSE_HIT_FLUSH_S 마다 한 트랜잭션으로 쓴다 (조회마다 쓰기 X).
+• 시스템 프롬프트가 바뀌면(version) 이전 항목은 쓰지 않는다. PARSE_TTL_DAYS 동안 적중이 없으면 만료.
+"""
+from __future__ import annotations
+
+import atexit
+import datetime as dt
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from config import PARSE_DB, PARSE_TTL_DAYS, PARSE_HIT_FLUSH_S
+
+_TTL = PARSE_TTL_DAYS * 86_400
+_lock = threading.Lock()
+_pending_hits: Dict[Tuple[str, str, str], int] = {}   # (version, template, pins) → 아직 DB 에 안 쓴 적중 수
+_last_flush = time.time()
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 질문 정규화 · 토큰
+# ──────────────────────────────────────────────────────────
+class _Token(NamedTuple):
+    kind:  str          # 'D' | 'N'
+    text:  str          # 날짜 → ISO, 숫자 → 콤마 뺀 원문 숫자
+    value: Any          # 날짜 → ISO 문자열, 숫자 → float (단위 반영)
+
+_DATE_RE = re.compile(
+    r"(?<!\d)(\d{4})\s*(?:[-./]|년\s*)(\d{1,2})\s*(?:[-./]|월\s*)(\d{1,2})(?:\s*일)?(?!\d)"
+)
+_NUM_RE = re.compile(r"(?<![\d.])(-?\d+(?:,\d{3})*(?:\.\d+)?)(조|억|만|천)?")
+_UNIT = {"조": 1e12, "억": 1e8, "만": 1e4, "천": 1e3}
+_REL_RE = re.compile(r"오늘|금일|당일|어제|어저께|전날|전일|그제|그저께|최근|요즘|근래|요새|지난|이번|작년|올해|금년|전년")
+_TAIL_RE = re.compile(r"[\s?!.？！。]+$")
+
+def _template(question: str) -> Tuple[str, List[_Token]]:
+    """질문 → (템플릿, 등장 순서대로의 날짜/숫자 토큰)"""
+    q = _TAIL_RE.sub("", unicodedata.normalize("NFKC", question).strip().lower())
+    dates: List[_Token] = []
+    nums: List[_Token] = []
+
+    def _date(m: re.Match) -> str:
+        try:
+            iso = dt.date(int(m[1]), int(m[2]), int(m[3])).isoformat()
+        except ValueError:
+            return m[0]
+        dates.append(_Token("D", iso, iso))
+        return "\x00D\x00"
+    q = _DATE_RE.sub(_date, q)
+
+    def _num(m: re.Match) -> str:
+        text = m[1].replace(",", "")
+        nums.append(_Token("N", text, float(text) * _UNIT.get(m[2] or "", 1)))
+        return "\x00N\x00" + (m[2] or "")
+    q = _NUM_RE.sub(_num, q)
+
+    # 날짜 → 숫자 순으로 두 번 치환했으므로 템플릿 속 등장 순서로 합친다
+    ordered = [dates.pop(0) if k == "D" else nums.pop(0) for k in re.findall(r"\x00([DN])\x00", q)]
+
+    tmpl = re.sub(r"\s+", "", q).replace("\x00D\x00", "<D>").replace("\x00N\x00", "<N>")
+    return tmpl, ordered
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 값 ↔ 자리표시자
+# ──────────────────────────────────────────────────────────
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_SLOT_RE = re.compile(r"^<([DNR])([+-]?\d+)(?::([ifs]))?>$")
+
+def _leaf_matches(leaf: Any, tok: _Token) -> bool:
+    if tok.kind == "D":
+        return isinstance(leaf, str) and leaf == tok.value
+    if isinstance(leaf, bool):
+        return False
+    if isinstance(leaf, (int, float)):
+        return float(leaf) == tok.value
+    return isinstance(leaf, str) and leaf == tok.text
+
+def _walk(obj: Any, fn) -> Any:
+    if isinstance(obj, dict):
+        return {k: _walk(v, fn) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_walk(v, fn) for v in obj]
+    return fn(obj)
+
+def _encode(params: dict, tokens: List[_Token], relative: bool) -> Tuple[dict, Dict[str, str]]:
+    """params → (자리표시자 params, 고정 토큰 {index: text})"""
+    leaves: List[Any] = []
+    _walk(params, lambda v: leaves.append(v) or v)
+
+    # 토큰 i 를 쓸 수 있는 조건: 어떤 잎과 값이 같고, 그 잎이 다른 토큰과는 헷갈리지 않을 것
+    usable: Dict[int, bool] = {}
+    for i, tok in enumerate(tokens):
+        hits = [v for v in leaves if _leaf_matches(v, tok)]
+        usable[i] = bool(hits) and all(
+            sum(_leaf_matches(v, t) for t in tokens) == 1 for v in hits
+        )
+
+    today = dt.date.today()
+
+    def _enc(v: Any) -> Any:
+        for i, tok in enumerate(tokens):
+            if usable[i] and _leaf_matches(v, tok):
+                kind = "s" if isinstance(v, str) else "i" if isinstance(v, int) else "f"
+                return f"<{tok.kind}{i}:{kind}>" if tok.kind == "N" else f"<D{i}>"
+        if relative and isinstance(v, str) and _ISO_RE.match(v):
+            try:
+                return f"<R{(dt.date.fromisoformat(v) - today).days:+d}>"
+            except ValueError:
+                pass
+        return v
+
+    pins = {str(i): tok.text for i, tok in enumerate(tokens) if not usable[i]}
+    return _walk(params, _enc), pins
+
+def _unexplained_date(encoded: dict, pins: Dict[str, str]) -> bool:
+    """자리표시자로 바뀌지 않은 ISO 날짜 중 고정 토큰(연도)으로 설명되지 않는 것이 있나"""
+    years = {t[:4] if _ISO_RE.match(t) else t for t in pins.values()}
+    found: List[bool] = []
+    _walk(encoded, lambda v: found.append(
+        isinstance(v, str) and bool(_ISO_RE.match(v)) and v[:4] not in years) or v)
+    return any(found)
+
+def _decode(params: dict, tokens: List[_Token]) -> dict:
+    today = dt.date.today()
+
+    def _dec(v: Any) -> Any:
+        if not isinstance(v, str) or not (m := _SLOT_RE.match(v)):
+            return v
+        kind, n, typ = m[1], int(m[2]), m[3]
+        if kind == "R":
+            return (today + dt.timedelta(days=n)).isoformat()
+        tok = tokens[n]
+        if kind == "D":
+            return tok.value
+        if typ == "s":
+            return tok.text
+        if typ == "i" and float(tok.value).is_integer():
+            return int(tok.value)
+        return tok.value
+    return _walk(params, _dec)
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 저장소
+# ──────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def _conn() -> sqlite3.Connection:
+    PARSE_DB.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(PARSE_DB, check_same_thread=False, timeout=5)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(
+        """CREATE TABLE IF NOT EXISTS parse (
+               version  TEXT NOT NULL,
+               template TEXT NOT NULL,
+               pins     TEXT NOT NULL,
+               params   TEXT NOT NULL,
+               hits     INTEGER NOT NULL DEFAULT 0,
+               created  REAL NOT NULL,
+               last_hit REAL,
+               expires  REAL NOT NULL,
+               PRIMARY KEY (version, template, pins)
+           )"""
+    )
+    return con
+
+
+def _flush(now: float) -> None:
+    """모아 둔 적중을 한 번에 기록 (_lock 보유 상태에서 호출)"""
+    global _last_flush
+    _last_flush = now
+    if not _pending_hits:
+        return
+    rows = [(n, now, now + _TTL, *key) for key, n in _pending_hits.items()]
+    _pending_hits.clear()
+    with _conn() as con:
+        con.executemany(
+            """UPDATE parse SET hits = hits + ?, last_hit = ?, expires = ?
+               WHERE version = ? AND template = ? AND pins = ?""",
+            rows,
+        )
+
+
+# ──────────────────────────────────────────────────────────
+#  Public API
+# ──────────────────────────────────────────────────────────
+def get(question: str, version: str) -> Optional[dict]:
+    """적중하면 새 질문 값으로 치환한 HCX 원본 params, 아니면 None (hits / 만료 갱신은 모아서)"""
+    tmpl, tokens = _template(question)
+    now = time.time()
+    try:
+        with _lock:
+            con = _conn()
+            rows = con.execute(
+                "SELECT pins, params FROM parse WHERE version = ? AND template = ? AND expires > ?",
+                (version, tmpl, now),
+            ).fetchall()
+            # 고정 토큰이 많은(더 구체적인) 항목 우선
+            for pins_json, params_json in sorted(rows, key=lambda r: -len(json.loads(r[0]))):
+                pins = json.loads(pins_json)
+                if all(int(i) < len(tokens) and tokens[int(i)].text == text for i, text in pins.items()):
+                    key = (version, tmpl, pins_json)
+                    _pending_hits[key] = _pending_hits.get(key, 0) + 1
+                    if now - _last_flush >= PARSE_HIT_FLUSH_S:
+                        _flush(now)
+                    return _decode(json.loads(params_json), tokens)
+    except (sqlite3.Error, ValueError, IndexError):
+        return None
+    return None
+
+
+def put(question: str, version: str, params: dict) -> None:
+    """HCX 원본 params 기록 (같은 템플릿 · 고정값이면 덮어씀, 질문에 없는 추정 날짜가 있으면 건너뜀)"""
+    tmpl, tokens = _template(question)
+    encoded, pins = _encode(params, tokens, relative=bool(_REL_RE.search(question)))
+    if _unexplained_date(encoded, pins):
+        return
+    now = time.time()
+    try:
+        with _lock, _conn() as con:
+            con.execute(
+                """INSERT INTO parse (version, template, pins, params, hits, created, expires)
+                   VALUES (?, ?, ?, ?, 0, ?, ?)
+                   ON CONFLICT(version, template, pins) DO UPDATE SET
+                       params = excluded.params, expires = excluded.expires""",
+                (version, tmpl, json.dumps(pins, sort_keys=True),
+                 json.dumps(encoded, ensure_ascii=False), now, now + _TTL),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def flush() -> None:
+    """모아 둔 적중 기록을 지금 쓴다 (프로세스 종료 시 자동 호출)"""
+    try:
+        with _lock:
+            _flush(time.time())
+    except sqlite3.Error:
+        pass
+
+atexit.register(flush)
+
+
+def purge() -> int:
+    """만료된 항목 삭제, 삭제 건수 반환 (app/warmup 에서 호출)"""
+    with _lock, _conn() as con:
+        return con.execute("DELETE FROM parse WHERE expires <= ?", (time.time(),)).rowcount
@@ -0,0 +1,239 @@
+# app/patterns.py
+"""
+캔들스틱 패턴 · 이동평균 크로스 벡터 연산 (전 종목 패널 단위)
+
+• 입력 : _download() 결과 DataFrame (2-level 컬럼: ticker × field)
+• 출력 : 패턴 발생 마스크 DataFrame (index=date, columns=ticker, dtype=bool)
+         True 위치 = 패턴이 **완성된 날** (3봉 패턴이면 세 번째 봉)
+
+종목·날짜마다 3일 슬라이스를 만들던 방식 대신,
+시가/고가/저가/종가 패널을 shift() 해 한 번에 비교한다.
+중간에 빈 행(미거래)이 있는 티커는 그 행을 건너뛰고 직전 유효 봉과 비교한다 (streak_runs 와 같은 기준).
+
+이동평균 골든/데드크로스도 같은 방식으로 MA 차이 패널의 부호 변화 마스크로 구한다.
+연속 상승/하락 일수는 등락 부호 패널의 run-length(누적합 리셋)로 구하고, streak_summary 로 티커별 최장 · 현재 연속 일수를 낸다.
+
+새 패턴 추가
+────────
+Candles 를 받아 bool 패널을 돌려주는 함수를 @register("이름") 으로 등록하면
+detect_pattern(df, "이름") 으로 바로 사용할 수 있다.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 패널 헬퍼
+# ──────────────────────────────────────────────────────────
+def field_panel(df: pd.DataFrame, field: str) -> pd.DataFrame:
+    """2-level 컬럼 DF → 단일 필드 패널 (index=date, columns=ticker)"""
+    if df.empty or not isinstance(df.columns, pd.MultiIndex):
+        return pd.DataFrame(index=df.index)
+    try:
+        return df.xs(field, level=1, axis=1)
+    except KeyError:
+        return pd.DataFrame(index=df.index)
+
+
+class Candles(NamedTuple):
+    open:  pd.DataFrame
+    high:  pd.DataFrame
+    low:   pd.DataFrame
+    close: pd.DataFrame
+
+
+def candles(
+    df: pd.DataFrame,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    tickers: Iterable[str] | None = None,
+    *,
+    close_field: str = "Adj Close",
+) -> Candles:
+    """
+    OHLC 패널 4개를 같은 (날짜 × 티커) 축으로 맞춰 반환.
+    • date_from/date_to 로 먼저 잘라내므로 패턴은 구간 **안에서만** 완성된다.
+    • 종가는 기존 적삼병/흑삼병 판정과 동일하게 기본 'Adj Close' 사용.
+    """
+    panels = [field_panel(df, f) for f in ("Open", "High", "Low", close_field)]
+    cols = panels[0].columns.intersection(panels[3].columns)
+    if tickers is not None:
+        cols = cols.intersection(pd.Index(list(tickers)))
+
+    out = []
+    for p in panels:
+        p = p.reindex(columns=cols)
+        if date_from is not None or date_to is not None:
+            p = p.loc[date_from:date_to]
+        out.append(p)
+    return Candles(*out)
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 패턴 레지스트리
+# ──────────────────────────────────────────────────────────
+PatternFn = Callable[[Candles], pd.DataFrame]
+
+PATTERNS: Dict[str, PatternFn] = {}
+_ALIASES = {"적삼병": "white", "흑삼병": "black"}
+
+
+def register(name: str) -> Callable[[PatternFn], PatternFn]:
+    def deco(fn: PatternFn) -> PatternFn:
+        PATTERNS[name] = fn
+        return fn
+    return deco
+
+
+@register("white")
+def _three_white(c: Candles) -> pd.DataFrame:
+    # 3연속 양봉 + 종가 지속 상승
+    up = c.close > c.open
+    rising = c.close > c.close.shift(1)
+    return up & up.shift(1, fill_value=False) & up.shift(2, fill_value=False) \
+        & rising & rising.shift(1, fill_value=False)
+
+
+@register("black")
+def _three_black(c: Candles) -> pd.DataFrame:
+    # 3연속 음봉 + 종가 지속 하락
+    down = c.close < c.open
+    falling = c.close < c.close.shift(1)
+    return down & down.shift(1, fill_value=False) & down.shift(2, fill_value=False) \
+        & falling & falling.shift(1, fill_value=False)
+
+
+@register("bullish_engulfing")
+def _bullish_engulfing(c: Candles) -> pd.DataFrame:
+    # 전일 음봉 몸통을 당일 양봉 몸통이 감싸는 형태
+    po, pc = c.open.shift(1), c.close.shift(1)
+    return (pc < po) & (c.close > c.open) & (c.open <= pc) & (c.close >= po)
+
+
+@register("bearish_engulfing")
+def _bearish_engulfing(c: Candles) -> pd.DataFrame:
+    # 전일 양봉 몸통을 당일 음봉 몸통이 감싸는 형태
+    po, pc = c.open.shift(1), c.close.shift(1)
+    return (pc > po) & (c.close < c.open) & (c.open >= pc) & (c.close <= po)
+
+
+@register("doji")
+def _doji(c: Candles) -> pd.DataFrame:
+    # 몸통이 당일 변동폭의 10% 이하
+    rng = c.high - c.low
+    return (rng > 0) & ((c.close - c.open).abs() <= rng * 0.1)
+
+
+@register("hammer")
+def _hammer(c: Candles) -> pd.DataFrame:
+    # 아래꼬리 ≥ 몸통×2, 위꼬리 ≤ 몸통
+    body = (c.close - c.open).abs()
+    lower = c.open.where(c.open < c.close, c.close) - c.low
+    upper = c.high - c.open.where(c.open > c.close, c.close)
+    return (body > 0) & (lower >= body * 2) & (upper <= body)
+
+
+# ──────────────────────────────────────────────────────────
+#  3. Public API
+# ──────────────────────────────────────────────────────────
+def detect_pattern(
+    df: pd.DataFrame,
+    pattern: str,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    tickers: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """패턴 발생 마스크 (index=date, columns=ticker, dtype=bool)"""
+    fn = PATTERNS.get(_ALIASES.get(pattern, pattern))
+    if fn is None:
+        raise ValueError(f"지원하지 않는 패턴: {pattern}")
+    c = candles(df, date_from, date_to, tickers)
+    return _on_valid_bars(fn, c).fillna(False).astype(bool)
+
+
+def _on_valid_bars(fn: PatternFn, c: Candles) -> pd.DataFrame:
+    """
+    패턴 판정 – 직전 봉은 직전 *유효* 봉 (기존 티커별 dropna 판정과 동일)
+    • 중간에 빈 행(미거래)이 있는 티커만 유효 행으로 줄여 따로 계산
+    • 앞뒤 NaN 만 있는 티커는 shift 결과가 같으므로 패널 한 번에
+    """
+    valid = c.open.notna() & c.close.notna()
+    interior = ~valid & valid.cummax() & valid[::-1].cummax()[::-1]
+    gappy = interior.any()
+    if not gappy.any():
+        return fn(c)
+
+    parts = [fn(Candles(*(p.loc[:, ~gappy] for p in c)))]
+    for t in c.close.columns[gappy]:
+        rows = valid[t].to_numpy()
+        sub = fn(Candles(*(p.loc[rows, [t]] for p in c)))
+        parts.append(sub.reindex(c.close.index, fill_value=False))
+    return pd.concat(parts, axis=1).reindex(columns=c.close.columns)
+
+
+def occurrences(mask: pd.DataFrame) -> List[Tuple[str, str]]:
+    """마스크 → [(ticker, 'YYYY-MM-DD'), ...]  (티커별 날짜 오름차순)"""
+    cols, rows = mask.to_numpy().T.nonzero()
+    return [
+        (mask.columns[c], mask.index[r].strftime("%Y-%m-%d"))
+        for c, r in zip(cols, rows)
+    ]
+
+
+def tickers_with(mask: pd.DataFrame) -> List[str]:
+    """구간 내 1회 이상 발생한 티커 목록"""
+    hit = mask.any(axis=0)
+    return list(hit.index[hit.to_numpy()])
+
+
+# ──────────────────────────────────────────────────────────
+#  4. 이동평균 크로스
+# ──────────────────────────────────────────────────────────
+def cross_masks(
+    close: pd.DataFrame, short: int = 5, long: int = 20
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    종가 패널 → (골든크로스 마스크, 데드크로스 마스크)
+    • MA(short) − MA(long) 부호가 음→양이면 골든, 양→음이면 데드
+    • 차이가 0 이거나 NaN(이력 부족)인 날은 부호 0 → 크로스로 보지 않음
+    """
+    delta = close.rolling(short).mean() - close.rolling(long).mean()
+    sign = np.sign(delta).fillna(0)
+    prev = sign.shift(1).fillna(0)
+    golden = (prev < 0) & (sign > 0)
+    dead = (prev > 0) & (sign < 0)
+    return golden, dead
+
+
+# ──────────────────────────────────────────────────────────
+#  5. 연속 상승/하락 (run-length)
+# ──────────────────────────────────────────────────────────
+def streak_runs(close: pd.DataFrame, direction: str = "up") -> pd.DataFrame:
+    """
+    날짜별로 '그날까지 이어진 연속 상승(하락) 일수' 패널 (int)
+    • 비교 대상은 직전 *유효* 종가 → 중간 NaN 행(미거래)은 건너뛰고 연속성 유지
+    • 보합(0)이거나 반대 방향이면 0 으로 리셋
+    """
+    diff = close - close.ffill().shift(1)
+    valid = diff.notna()
+    hit = diff > 0 if direction == "up" else diff < 0
+
+    csum = hit.astype(int).cumsum()
+    reset = csum.where(valid & ~hit).ffill().fillna(0)
+    return (csum - reset).astype(int)
+
+
+def streak_summary(close: pd.DataFrame, direction: str = "up") -> pd.DataFrame:
+    """
+    티커별 연속 상승(하락) 요약 (index=ticker)
+      longest : 구간 내 최장 연속 일수
+      current : 마지막 날 기준 진행 중인 연속 일수
+    """
+    runs = streak_runs(close, direction)
+    if runs.empty:
+        return pd.DataFrame(0, index=close.columns, columns=["longest", "current"])
+    return pd.DataFrame({"longest": runs.max(), "current": runs.iloc[-1]})
@@ -1,20 +1,35 @@
 # app/router.py
 from __future__ import annotations
+import asyncio
 import logging
 import datetime as dt
 from typing import Callable, Optional, Dict, Any
 from app import session                  # ↩︎ 간단한 in-mem 세션 캐시 (앞서 제안)
 from app.utils import _holiday_msg, _prev_bday
-from app.llm_bridge import extract_params, fill_missing, fill_missing_multi
+from app.llm_bridge import (
+    extract_params, fill_missing, fill_missing_multi,
+    extract_params_async, fill_missing_multi_async, UNAVAILABLE,
+)
 from app.task_handlers import (
     task_search,
     task1_simple,
     task_compare,
 )
+from app import executor, name_scanner, universe, yf_cache
+from app.ticker_lookup import to_tickers
 from config import AmbiguousTickerError
 
 logger = logging.getLogger(__name__)
 _FAIL = "질문을 이해하지 못했습니다."
+_LLM_DOWN = "현재 질문 분석(LLM) 서비스를 사용할 수 없습니다. 잠시 후 다시 시도해 주세요."
+
+# 질문 원문의 종목명 선행 스캔 → 티커 해석 · 가격 캐시 프리패치 (HCX 파싱과 병렬, executor.PREFETCH 스테이지)
+def _prefetch_mentioned(question: str, api_key: str) -> list[str]:
+    names = list(dict.fromkeys(m.name for m in name_scanner.scan(question)))
+    # 스캐너는 유니버스 사전 표기만 찾으므로 로컬 단계에서 확정 – 핸들러와 같은 해석 경로 (HCX 호출 없음)
+    tickers = list(dict.fromkeys(t for t in to_tickers(names, api_key=api_key, strict=False) if t))
+    yf_cache.prefetch(tickers)
+    return tickers
 
 # ─────────────────────────────────────────────────────
 # 0. 보조 유틸  ← ★ 새로 추가
@@ -594,89 +609,162 @@ def _check_and_prompt(task: str, p: dict) -> tuple[bool, str | None, list[str]]:
 
 
 # ────────────────────────────── 메인 ──────────────────────────────
+def _merge_filled(pending: dict, filled: dict | None) -> None:
+    """fill_missing_multi 결과를 대기 중 슬롯에 병합"""
+    if not filled:
+        return
+    for k, v in filled.items():
+        if "." in k:
+            _walk_set(pending.setdefault("conditions", {}), k.split("."), v)
+        else:
+            pending[k] = v
+    pending["_missing"] = [s for s in pending["_missing"] if pending.get(s) in (None, [], "", {})]
+
+def _merge_follow(pending: dict, follow: dict) -> None:
+    """새 파싱 결과로 비어 있는 슬롯 병합"""
+    for k, v in follow.items():
+        if not v:
+            continue
+        if k == "task":
+            continue
+        if k == "tickers":
+            orig = pending.get("tickers", [])
+            pending["tickers"] = list(dict.fromkeys(orig + v))
+        else:
+            if pending.get(k) in (None, [], "", {}):
+                pending[k] = v
+
+def _parse_follow(question: str, pending: dict, api_key: str) -> tuple[dict | None, dict]:
+    """
+    후속 답변 파싱 – 슬롯 보충(fill_missing_multi)과 일반 파싱(extract_params)은 서로 독립이므로
+    동시에 보내 HCX 왕복 1회 지연으로 끝낸다. (병합 순서는 호출 측에서 그대로 유지)
+    """
+    missing = list(pending.get("_missing") or [])
+    if not missing:
+        return None, extract_params(question, api_key)
+    try:
+        fut = executor.LLM_SYNC.submit(fill_missing_multi, question, missing, api_key)
+    except executor.Overloaded:                      # 밀려 있으면 순서대로
+        return fill_missing_multi(question, missing, api_key), extract_params(question, api_key)
+    follow = extract_params(question, api_key)
+    return fut.result(), follow
+
+async def _aparse_follow(question: str, pending: dict, api_key: str) -> tuple[dict | None, dict]:
+    """_parse_follow 의 비동기 버전"""
+    missing = list(pending.get("_missing") or [])
+    if not missing:
+        return None, await extract_params_async(question, api_key)
+    filled, follow = await asyncio.gather(
+        fill_missing_multi_async(question, missing, api_key),
+        extract_params_async(question, api_key),
+    )
+    return filled, follow
+
+def _dispatch(question: str, conv_id: str, params: dict, api_key: str) -> str:
+    """필수 슬롯 확인 → 재질문 또는 핸들러 실행 (LLM 파싱 이후 단계)"""
+    _auto_fill_relative_dates(question, params)
+    ready, follow_up, miss = _check_and_prompt(params["task"], params)
+    if not ready:
+        params["_missing"] = miss
+        session.set(conv_id, params)
+        return follow_up
+
+    hinfo = TASK_REGISTRY[params["task"]]
+    ans = _safe_handle(hinfo["fn"], question, params, api_key) or _FAIL
+    session.clear(conv_id)
+    return ans
+
+def _on_ambiguous(e: AmbiguousTickerError, conv_id: str, params: dict | None) -> str:
+    cur = session.get(conv_id)
+    if cur:
+        cur["tickers"] = [t for t in cur.get("tickers", []) if t != e.alias]
+        session.set(conv_id, cur)
+    elif params:                                   # 첫 질문의 params
+        pending = params.copy()
+        keep = [t for t in pending.get("tickers", []) if t != e.alias]
+        pending['tickers'] = keep                  # ← 후속 답변 채울 자리
+        session.set(conv_id, pending)
+
+    sugg = " · ".join(e.candidates)
+    return f"종목명 인식에 실패하였습니다: \"{e.alias}\". 조회할 종목명을 정확하게 입력해 주세요 (제안: {sugg})"
+
+def _begin(question: str, api_key: str) -> None:
+    universe.maybe_reload()          # 상장 목록(CSV/npz) 변경 시 공유 사전 · 파생 캐시 갱신 (평소엔 stat 만)
+    # 결과는 기다리지 않는다 – 핸들러가 같은 parquet 을 읽을 때 LRU 적중
+    try:
+        executor.PREFETCH.submit(_prefetch_mentioned, question, api_key)
+    except executor.Overloaded:
+        pass                         # 추측성 작업 → 밀려 있으면 건너뜀
+
 def route(question: str, conv_id: str, api_key: str) -> str:
     """
     conv_id : 세션 ID (웹소켓 UUID, 슬랙 thread_ts 등)
     """
+    params = None
     try:
         question = question.strip()
         if not question:
             return _FAIL
+        _begin(question, api_key)
 
         # ── 1) 이전 세션 이어받기 ──────────────────────
         pending = session.get(conv_id)
         if pending:
-            filled = None
-            if pending.get("_missing"):
-                filled = fill_missing_multi(question, pending["_missing"], api_key)
-            if filled:
-                for k, v in filled.items():
-                    if "." in k:
-                        _walk_set(pending.setdefault("conditions", {}), k.split("."), v)
-                    else:
-                        pending[k] = v
-                pending["_missing"] = [s for s in pending["_missing"] if pending.get(s) in (None, [], "", {})]
-            
-            # ── 1-b. 새로 추가로 들어온 정보는 기존 파서로 병합
-            follow = extract_params(question, api_key)
-
-            # ── 1-a. 새 파싱 결과로 슬롯 병합 ──────────
-            for k, v in follow.items():
-                if not v:
-                    continue
-                if k == "task":
-                    continue
-                if k == "tickers":
-                    orig = pending.get("tickers", [])
-                    pending["tickers"] = list(dict.fromkeys(orig + v))
-                else:
-                    if pending.get(k) in (None, [], "", {}):
-                        pending[k] = v
-
-            _auto_fill_relative_dates(question, pending)
-            ready, follow_up, miss = _check_and_prompt(pending["task"], pending)
-            if not ready:
-                pending["_missing"] = miss
-                session.set(conv_id, pending)
-                return follow_up
-            
-            # ── 1-b. 실행 가능 → 핸들러 호출 ───────────
-            hinfo = TASK_REGISTRY[pending["task"]]
-            ans = _safe_handle(hinfo["fn"], question, pending, api_key) or _FAIL
-            session.clear(conv_id)
-            return ans
-        
+            filled, follow = _parse_follow(question, pending, api_key)
+            _merge_filled(pending, filled)
+            # 새로 추가로 들어온 정보는 기존 파서로 병합
+            _merge_follow(pending, follow)
+            return _dispatch(question, conv_id, pending, api_key)
+
         # ── 2) 첫 질문 파싱 ────────────────────────────
         params = extract_params(question, api_key)
-        _auto_fill_relative_dates(question, params)
-        print(params)
-        ready, follow_up, miss = _check_and_prompt(params["task"], params)
-
-        if not ready:
-            params["_missing"] = miss
-            session.set(conv_id, params)
-            return follow_up
-        
-        hinfo = TASK_REGISTRY[params["task"]]
-        ans = _safe_handle(hinfo["fn"], question, params, api_key) or _FAIL
-        session.clear(conv_id)
-        return ans
-    
+        logger.debug("parsed params: %s", params)
+        if params["task"] == UNAVAILABLE:          # HCX 장애 – '이해 못 함'과 구분해 안내
+            return _LLM_DOWN
+        return _dispatch(question, conv_id, params, api_key)
+
     except AmbiguousTickerError as e:
-        cur = session.get(conv_id)
-        if cur:
-            cur["tickers"] = [t for t in cur.get("tickers", []) if t != e.alias]
-            session.set(conv_id, cur)
-        elif 'params' in locals() and params:           # 첫 질문의 params
-            pending = params.copy()
-            keep = [t for t in pending.get("tickers", []) if t != e.alias]
-            pending['tickers'] = keep                  # ← 후속 답변 채울 자리
-            session.set(conv_id, pending)
-
-        sugg = " · ".join(e.candidates)
-        return f"종목명 인식에 실패하였습니다: \"{e.alias}\". 조회할 종목명을 정확하게 입력해 주세요 (제안: {sugg})"
+        return _on_ambiguous(e, conv_id, params)
 
     except Exception as ex:
         logger.exception("route() 처리 중 예외 발생: %s", ex)
         return _FAIL
 
+async def aroute(question: str, conv_id: str, api_key: str) -> str:
+    """
+    route() 의 비동기 버전.
+    HCX 호출은 풀링된 AsyncClient 로 await 하고(executor.LLM), 데이터 조회 · 계산(핸들러)은
+    executor.DATA 스레드 풀에서 실행 → 느린 LLM 응답 하나가 같은 워커의 다른 요청을 막지 않는다.
+    대기열이 가득 차면 executor.Overloaded 를 그대로 올린다 (main.py → 503).
+    """
+    params = None
+    try:
+        question = question.strip()
+        if not question:
+            return _FAIL
+        _begin(question, api_key)
+
+        # ── 1) 이전 세션 이어받기 ──────────────────────
+        pending = session.get(conv_id)
+        if pending:
+            filled, follow = await _aparse_follow(question, pending, api_key)
+            _merge_filled(pending, filled)
+            _merge_follow(pending, follow)
+            return await executor.DATA.run(_dispatch, question, conv_id, pending, api_key)
+
+        # ── 2) 첫 질문 파싱 ────────────────────────────
+        params = await extract_params_async(question, api_key)
+        logger.debug("parsed params: %s", params)
+        if params["task"] == UNAVAILABLE:          # HCX 장애 – '이해 못 함'과 구분해 안내
+            return _LLM_DOWN
+        return await executor.DATA.run(_dispatch, question, conv_id, params, api_key)
+
+    except AmbiguousTickerError as e:
+        return _on_ambiguous(e, conv_id, params)
+
+    except executor.Overloaded:
+        raise
+
+    except Exception as ex:
+        logger.exception("aroute() 처리 중 예외 발생: %s", ex)
+        return _FAIL
@@ -4,13 +4,16 @@ from typing import Dict, List, Iterable, Tuple
 import pandas as pd
 import numpy as np
 import datetime as dt
+from functools import lru_cache
 
-from app.data_fetcher import _download, _next_day
-from app.universe import NAME_BY_TICKER, KOSPI_TICKERS, KOSDAQ_TICKERS
+from app.data_fetcher import _download, _next_day, _within_prefetch_window
 from app.utils import _holiday_msg, _prev_bday, _next_day, _universe
 from app.ticker_lookup import to_ticker
-
-ALL = KOSPI_TICKERS + KOSDAQ_TICKERS
+from app.patterns import detect_pattern, occurrences, tickers_with, field_panel, cross_masks, streak_summary
+from app.event_index import EventIndex
+from app import event_store, universe
+from app.yf_cache import data_version
+from config import EVENT_PEAK_DAYS, EVENT_GAP_PCT, EVENT_SPIKE_WINDOW, EVENT_SPIKE_PCT
 
 # ────────────────────────── 1. 가격/거래량 조건 기반 필터 ──────────────────────────
 def search_by_pct_change_range(df: pd.DataFrame, from_date: str, to_date: str, cond: dict, tickers: list[str]) -> list[str]:
@@ -36,22 +39,15 @@ def search_by_pct_change_range(df: pd.DataFrame, from_date: str, to_date: str, c
 def search_by_consecutive_change(df: pd.DataFrame, from_date: str, to_date: str, cond: dict, tickers: list[str]) -> list[str]:
     direction = cond.get("direction", "up")
     count = cond.get("count", 3)
-    out = []
-    sliced = df.loc[pd.to_datetime(from_date):pd.to_datetime(to_date)]
+    try:
+        vol = field_panel(df, "Volume").reindex(columns=tickers).loc[pd.to_datetime(to_date)]
+    except KeyError:
+        return []
+    close = field_panel(df, "Close").reindex(columns=tickers).loc[pd.to_datetime(from_date):pd.to_datetime(to_date)]
 
-    for t in tickers:
-        try:
-            close = sliced[(t, "Close")].dropna()
-            vol = df.loc[pd.to_datetime(to_date), (t, "Volume")]
-        except KeyError:
-            continue
-        if len(close) < count or pd.isna(vol) or vol == 0:
-            continue
-        diff = close.diff().iloc[1:]
-        cmp = diff > 0 if direction == "up" else diff < 0
-        if cmp.rolling(count).apply(all).any():
-            out.append(t)
-    return out
+    longest = streak_summary(close, direction)["longest"]
+    ok = (longest >= count) & vol.notna() & (vol != 0)
+    return [t for t in tickers if ok.get(t, False)]
 
 def search_cross_count_by_stock(name: str, from_date: str, to_date: str, cross: str, api_key: str) -> str:
     g, d = count_crosses(from_date, to_date, name, api_key)
@@ -64,35 +60,43 @@ def search_cross_count_by_stock(name: str, from_date: str, to_date: str, cross:
     else:
         return f"{name}에서 {from_date}부터 {to_date}까지 골든크로스 {g}번, 데드크로스 {d}번 발생했습니다."
 
+def _cross_hit_tickers(close: pd.DataFrame, side: str, short: int, long: int) -> set[str]:
+    """
+    구간 종가 패널 → 크로스가 1회 이상 난 티커
+    • 기존 판정처럼 티커별 dropna 후 이동평균 – 중간에 빈 행이 있는 티커만 따로 계산
+      (앞뒤 NaN 은 rolling 결과가 같으므로 나머지는 패널 한 번에)
+    """
+    interior = close.isna() & close.ffill().notna() & close.bfill().notna()
+    gappy = interior.any()
+    hits: set[str] = set()
+
+    def collect(panel: pd.DataFrame) -> None:
+        golden, dead = cross_masks(panel, short, long)
+        for mask in {"golden": (golden,), "dead": (dead,), "both": (golden, dead)}.get(side, ()):
+            hits.update(mask.columns[mask.to_numpy().any(axis=0)])
+
+    collect(close.loc[:, ~gappy])
+    for t in close.columns[gappy]:
+        collect(close[[t]].dropna())
+    return hits
+
 def search_cross_dates_by_condition(df: pd.DataFrame, from_date: str, to_date: str, cross: str, tickers: list[str]) -> list[str]:
+    """
+    구간 내 골든/데드크로스가 난 종목
+    • 프리패치 구간 → 이벤트 스토어 (날짜검색 · 횟수검색과 같은 Adj Close · MA 워밍업 기준)
+    • 그 외 구간   → 구간 종가(Close)만으로 판정 (기존 방식)
+    """
     window_short, window_long = 5, 20
-    out = []
-
-    for t in tickers:
-        if (t, "Close") not in df.columns:
-            continue
-        close = df[t, "Close"].dropna().loc[from_date:to_date]
-        if len(close) < window_long:
-            continue
-        ma_short = close.rolling(window=window_short).mean()
-        ma_long  = close.rolling(window=window_long).mean()
-        prev_diff = None
-
-        for i in range(len(close)):
-            if pd.isna(ma_short.iloc[i]) or pd.isna(ma_long.iloc[i]):
-                continue
-            diff = ma_short.iloc[i] - ma_long.iloc[i]
-            if prev_diff is not None:
-                if cross == "golden" and prev_diff < 0 and diff > 0:
-                    out.append(t)
-                    break
-                if cross == "dead" and prev_diff > 0 and diff < 0:
-                    out.append(t)
-                    break
-            prev_diff = diff
-    return out
+    if _within_prefetch_window(*_cross_window(from_date, to_date)):
+        present = set(df.columns.get_level_values(0))
+        pool = [t for t in tickers if t in present]
+        sides = {"golden": ("golden",), "dead": ("dead",), "both": ("golden", "dead")}.get(cross, ())
+        hit = {t for s in sides for t in event_store.tickers_with(f"{s}_cross", from_date, to_date, pool)}
+        return [t for t in pool if t in hit]
 
-ALL = KOSPI_TICKERS + KOSDAQ_TICKERS
+    close = field_panel(df, "Close").reindex(columns=tickers).loc[from_date:to_date]
+    hits = _cross_hit_tickers(close, cross, window_short, window_long)
+    return [t for t in tickers if t in hits]
 
 # ───────────────────────────────────────────────
 def compute_rsi(series: pd.Series, date: str, window: int = 14) -> float | None:
@@ -235,48 +239,62 @@ def detect_bollinger_touch(df: pd.DataFrame, date: str, band: str, tickers: list
     return out
 
 # ───────────────────────────────────────────────
+def _cross_window(from_date: str, to_date: str) -> tuple[str, str]:
+    """크로스 계산용 다운로드 구간 (MA20 워밍업 60일 포함)"""
+    start = (pd.Timestamp(from_date) - pd.Timedelta(days=60)).strftime("%Y-%m-%d")
+    end = (pd.Timestamp(to_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    return start, end
+
+@lru_cache(maxsize=512)
+def _cross_events(ticker: str, start: str, end: str, version: int) -> tuple[EventIndex, EventIndex]:
+    """
+    (골든, 데드) 이벤트 인덱스 – MA5/MA20, Adj Close 기준
+    version(가격 캐시 데이터 버전)이 바뀌면 키가 달라져 자동으로 다시 계산된다.
+    """
+    df = _download((ticker,), start=start, end=end)
+    close = field_panel(df, "Adj Close").reindex(columns=[ticker]).dropna()
+    golden, dead = cross_masks(close, 5, 20)
+    return EventIndex.from_mask(golden), EventIndex.from_mask(dead)
+
+def _cross_dates(ticker: str, from_date: str, to_date: str, side: str) -> list[str]:
+    """
+    side ∈ {"golden","dead"} 크로스 발생일
+    • 프리패치 구간 → 이벤트 스토어 이진 탐색
+    • 그 외 구간   → 다운로드 후 EventIndex 생성
+    """
+    start, end = _cross_window(from_date, to_date)
+    if _within_prefetch_window(start, end):
+        return event_store.query(ticker, f"{side}_cross", from_date, to_date)
+    golden, dead = _cross_events(ticker, start, end, data_version())
+    return (golden if side == "golden" else dead).dates(ticker, from_date, to_date)
+
 def count_crosses(from_date: str, to_date: str, target: str, api_key: str) -> tuple[int, int]:
     code = to_ticker(target, api_key = api_key)
     if code is None:
         return -1, -1
-    start = (pd.Timestamp(from_date) - pd.Timedelta(days=60)).strftime("%Y-%m-%d")
-    end = (pd.Timestamp(to_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
-    df = _download((code,), start=start, end=end)
-    close = df[code, "Adj Close"].dropna()
-    ma5 = close.rolling(5).mean()
-    ma20 = close.rolling(20).mean()
-    delta = ma5 - ma20
-    prev_sign = delta.shift(1).apply(lambda x: 1 if x > 0 else -1 if x < 0 else 0)
-    curr_sign = delta.apply(lambda x: 1 if x > 0 else -1 if x < 0 else 0)
-    cross_dates = (prev_sign * curr_sign < 0)
-    golden = 0
-    dead = 0
-    for d in cross_dates.index:
-        if from_date <= d.strftime("%Y-%m-%d") <= to_date:
-            if prev_sign[d] < 0 and curr_sign[d] > 0:
-                golden += 1
-            elif prev_sign[d] > 0 and curr_sign[d] < 0:
-                dead += 1
-    return golden, dead
+    return (
+        len(_cross_dates(code, from_date, to_date, "golden")),
+        len(_cross_dates(code, from_date, to_date, "dead")),
+    )
+
+def search_cross_dates_by_stock(ticker: str, from_date: str, to_date: str, cross: str) -> str:
+    name = universe.name_of(ticker)
+    sides = {
+        "golden": [("골든크로스", "golden")],
+        "dead":   [("데드크로스", "dead")],
+    }.get(cross, [("골든크로스", "golden"), ("데드크로스", "dead")])
+
+    parts = []
+    for label, side in sides:
+        dates = _cross_dates(ticker, from_date, to_date, side)
+        parts.append(f"{label} 발생일은 {', '.join(dates)}" if dates else f"{label} 발생일은 없음")
+    return f"{name} ({from_date}~{to_date}) " + ", ".join(parts) + "입니다."
 
 
 # ───────────────────────────────────────────────────────────
 # ⑤ 캔들스틱 패턴: 3-연속 양봉/음봉 (‘적삼병’ / ‘흑삼병’)
+#    판정 자체는 app.patterns 의 패널 벡터 연산을 사용
 # ───────────────────────────────────────────────────────────
-def _slice_three(sr: pd.Series, loc: int) -> Tuple[pd.Series, pd.Series] | None:
-    """loc(정수 인덱스) 포함해 직전 2일·당일 총 3거래일을 반환"""
-    if loc < 2:
-        return None
-    return sr.iloc[loc - 2 : loc + 1]
-
-def _white(open_s, close_s) -> bool:
-    # 3연속 양봉 + 종가 지속 상승
-    return bool((close_s > open_s).all() and np.diff(close_s).min() > 0)
-
-def _black(open_s, close_s) -> bool:
-    # 3연속 음봉 + 종가 지속 하락
-    return bool((close_s < open_s).all() and np.diff(close_s).max() < 0)
-
 def _scan_three_pattern(
     pattern: str,
     start: str,
@@ -284,79 +302,48 @@ def _scan_three_pattern(
     tickers: Iterable[str] | None = None,
 ) -> List[Tuple[str, str]]:
     """
-    - pattern: "적삼병" | "흑삼병"
+    - pattern: "white"(적삼병) | "black"(흑삼병)
     - 반환: [(ticker, 'YYYY-MM-DD'), ...]
     """
     if tickers is None or not tickers:
-        tickers = tuple(ALL)
+        tickers = tuple(universe.all_tickers())
 
     df = _download(tuple(tickers),start=start, end=_next_day(end), interval="1d")
     if df.empty or not isinstance(df.columns, pd.MultiIndex):
         return []
-    occurs: list[Tuple[str, str]] = []
-    for t in df.columns.levels[0]:
-        try:
-            op = df[t, "Open"].dropna()
-            cl = df[t, "Adj Close"].dropna()
-        except KeyError:
-            continue
-
-        # ── 연속 3거래일 슬라이딩 ──────────────────────────
-        for idx in range(2, len(op)):
-            sub_o = _slice_three(op, idx)
-            sub_c = _slice_three(cl, idx)
-            if sub_o is None or sub_c is None:
-                continue            # 자료 부족
+    return occurrences(detect_pattern(df, pattern))
 
-            if (pattern == "white" and _white(sub_o, sub_c)) or \
-               (pattern == "black" and _black(sub_o, sub_c)):
-                occurs.append((t, str(op.index[idx].date())))
-    return occurs
+def _three_pattern_occurrence_dates(ticker: str, pattern: str, date_from: str, date_to: str) -> list[str]:
+    """프리패치 구간이면 이벤트 스토어, 아니면 다운로드 후 스캔"""
+    if pattern in ("white", "black") and _within_prefetch_window(date_from, date_to):
+        return event_store.query(ticker, f"three_{pattern}", date_from, date_to)
+    return [d for _, d in _scan_three_pattern(pattern, date_from, date_to, [ticker])]
 
 def three_pattern_dates(ticker: str, pattern: str, date_from: str, date_to: str) -> str:
-    occ = _scan_three_pattern(pattern, date_from, date_to, [ticker])
+    occ = _three_pattern_occurrence_dates(ticker, pattern, date_from, date_to)
     if not occ:
-        return (f"{NAME_BY_TICKER.get(ticker, ticker)}은(는) {date_from}~{date_to} 기간에 {pattern} 패턴이 없습니다.")
-    dates = ", ".join(d for _, d in occ)
-    return (f"{NAME_BY_TICKER.get(ticker, ticker)} ({date_from}~{date_to}) {pattern} 발생일은 {dates}입니다.")
+        return (f"{universe.name_of(ticker)}은(는) {date_from}~{date_to} 기간에 {pattern} 패턴이 없습니다.")
+    dates = ", ".join(occ)
+    return (f"{universe.name_of(ticker)} ({date_from}~{date_to}) {pattern} 발생일은 {dates}입니다.")
 
 def three_pattern_counts(ticker: str, pattern: str, date_from: str, date_to: str) -> str:
-    occ = _scan_three_pattern(pattern, date_from, date_to, [ticker])
-    counts = len(occ)
-    return (f"{NAME_BY_TICKER.get(ticker, ticker)} ({date_from}~{date_to}) {pattern} 발생 횟수는 {counts}입니다.")
+    counts = len(_three_pattern_occurrence_dates(ticker, pattern, date_from, date_to))
+    return (f"{universe.name_of(ticker)} ({date_from}~{date_to}) {pattern} 발생 횟수는 {counts}입니다.")
 
 def check_three_pattern_occurrence(df: pd.DataFrame, pattern: str, date_from: str, date_to: str, ticker: str) -> bool:
     """
     주어진 df에 대해, 특정 ticker가 구간 내에 지정한 패턴을 최소 1회 만족하는지 여부 반환
-    - pattern: "적삼병" or "흑삼병"
+    - pattern: "white"(적삼병) or "black"(흑삼병)
     """
-    try:
-        op = df[ticker, "Open"].dropna().loc[date_from:date_to]
-        cl = df[ticker, "Adj Close"].dropna().loc[date_from:date_to]
-    except KeyError:
-        return False
-
-    for idx in range(2, len(op)):
-        sub_o = _slice_three(op, idx)
-        sub_c = _slice_three(cl, idx)
-        if sub_o is None or sub_c is None:
-            continue
-
-        if pattern == "white" and _white(sub_o, sub_c):
-            return True
-        elif pattern == "black" and _black(sub_o, sub_c):
-            return True
-
-    return False
+    mask = detect_pattern(df, pattern, date_from, date_to, [ticker])
+    return bool(mask.to_numpy().any())
 
 def three_pattern_tickers( df: pd.DataFrame, pattern: str, date_from: str, date_to: str, tickers: list[str],) -> list[str]:
-    result = []
-    for t in tickers:
-        if (t, "Open") not in df.columns or (t, "Adj Close") not in df.columns:
-            continue
-        if check_three_pattern_occurrence(df, pattern, date_from, date_to, t):
-            result.append(t)
-    return result
+    if pattern in ("white", "black") and _within_prefetch_window(date_from, date_to):
+        present = set(df.columns.get_level_values(0))
+        return event_store.tickers_with(f"three_{pattern}", date_from, date_to, [t for t in tickers if t in present])
+    hits = set(tickers_with(detect_pattern(df, pattern, date_from, date_to, tickers)))
+    return [t for t in tickers if t in hits]
 
 def search_by_price_close(df: pd.DataFrame, date: str, cond: dict, tickers: list[str]) -> list[str]:
     try:
@@ -550,3 +537,41 @@ def search_by_gap_pct(df: pd.DataFrame, date: str, cond: dict,
         out.append(t)
     return out
 
+
+
+# ────────────────────────── 4. 이벤트 스토어 단일일 조건 ──────────────────────────
+def _store_event(key: str, sub: dict) -> Tuple[str, dict] | None:
+    """
+    단일일 조건 → (이벤트, min_value/max_value) – 저장된 판정 기준으로 답할 수 있을 때만.
+    기준이 다르면(기간 · 창 · 임계치) None → 기존 루프로 처리.
+    """
+    if key in ("peak_break", "peak_low") and sub.get("period_days", EVENT_PEAK_DAYS) == EVENT_PEAK_DAYS:
+        return ("high_52w" if key == "peak_break" else "low_52w"), {}
+    if key == "volume_spike" and sub.get("window", 20) == EVENT_SPIKE_WINDOW:
+        ratio = sub.get("volume_ratio", {}).get("min", 0)
+        if ratio >= EVENT_SPIKE_PCT:
+            return "volume_spike", {"min_value": ratio}
+    if key == "gap_pct":
+        gmin, gmax = sub.get("min"), sub.get("max")
+        if gmin is not None and gmin >= EVENT_GAP_PCT:
+            return "gap_up", {"min_value": gmin, "max_value": gmax}
+        if gmax is not None and gmax <= -EVENT_GAP_PCT:
+            return "gap_down", {"min_value": gmin, "max_value": gmax}
+    return None
+
+def screen_by_events(date: str, cond: dict, tickers: list[str]) -> Tuple[list[str], dict]:
+    """
+    프리패치 구간이면 이벤트 스토어로 답할 수 있는 조건(52주 신고가/신저가 · 갭 · 거래량 급증)을
+    먼저 적용 → (남은 티커, 스토어로 처리하지 못한 조건)
+    """
+    if not _within_prefetch_window(date, date):
+        return list(tickers), cond
+    result, rest = list(tickers), {}
+    for key, sub in cond.items():
+        hit = _store_event(key, sub) if isinstance(sub, dict) else None
+        if hit is None:
+            rest[key] = sub
+        else:
+            event, kw = hit
+            result = event_store.tickers_with(event, date, date, result, **kw)
+    return result, rest
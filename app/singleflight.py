@@ -0,0 +1,113 @@
+# app/singleflight.py
+"""
+동시에 들어온 **같은 키** 작업 합치기 (single-flight)
+
+장 시작 직후처럼 같은 질문이 한꺼번에 몰리면 lru_cache 는 첫 호출이 끝난 뒤에야 도움이 된다.
+그 전까지 들어온 호출은 각자 HCX 파싱 · 전 종목 _download · 스크리닝을 반복한다.
+Group 은 키별로 먼저 온 호출(leader) 하나만 실행하고, 나머지는 그 결과를 함께 기다린다.
+
+  do(key, fn, *args)          : 스레드용 – 대기자는 concurrent.futures.Future 로 블록
+  await ado(key, coro_fn, …)  : asyncio 용 – 루프별 Task 공유 (한 대기자가 취소돼도 공유 작업은 계속)
+  @coalesce                   : 함수 인자 전체를 키로 do() 를 씌우는 데코레이터
+                                lru_cache 안쪽에 두면 캐시 miss 끼리만 합쳐진다.
+
+  @lru_cache(maxsize=…)
+  @singleflight.coalesce
+  def _download(...): ...
+
+• 결과 · 예외 모두 대기자 전원에게 그대로 전달되고, 끝나면 키는 바로 지워진다 (결과를 보관하지 않음).
+• 대기자에게 돌아가는 결과는 같은 객체다 → 호출 측은 수정하지 말 것 (lru_cache 와 같은 규칙).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class Group:
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self.leaders = self.shared = 0
+
+    # ── 스레드 ──────────────────────────────────────────────
+    def do(self, key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return fut.result()
+
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return fut.result()
+
+    # ── asyncio ─────────────────────────────────────────────
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.get(loop)
+        if tasks is None:
+            tasks = self._tasks[loop] = {}
+
+        task = tasks.get(key)                   # 같은 루프 안에서는 await 전까지 원자적
+        leader = task is None
+        if leader:
+            task = tasks[key] = loop.create_task(fn(*args, **kwargs))
+            task.add_done_callback(lambda t, k=key: tasks.pop(k, None) if tasks.get(k) is t else None)
+        with self._lock:
+            if leader:
+                self.leaders += 1
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._calls) + sum(len(t) for t in self._tasks.values())
+            return {"leaders": self.leaders, "shared": self.shared, "inflight": inflight}
+
+
+GROUPS: Dict[str, Group] = {}
+_groups_lock = threading.Lock()
+
+def group(name: str) -> Group:
+    """이름별 Group (통계 집계용으로 등록)"""
+    with _groups_lock:
+        return GROUPS.setdefault(name, Group(name))
+
+
+def coalesce(fn: Callable[..., T]) -> Callable[..., T]:
+    """인자 전체(위치 + 키워드)를 키로 같은 호출을 합치는 데코레이터"""
+    g = group(f"{fn.__module__}.{fn.__qualname__}")
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        return g.do(key, fn, *args, **kwargs)
+
+    wrapper.flight = g
+    return wrapper
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Group 별 leader(실제 실행) · shared(합쳐진 호출) · 진행 중 키 수"""
+    return {name: g.stats() for name, g in GROUPS.items()}
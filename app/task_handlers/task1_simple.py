@@ -9,22 +9,17 @@ from functools import lru_cache
 from typing import List, Dict, Tuple, Iterable
 
 import pandas as pd
-import yfinance as yf
 import numpy as np
 
-from app.ticker_lookup import to_ticker, TickerInfo, disambiguate_ticker_hcx
+from app.ticker_lookup import to_ticker, to_tickers, TickerInfo, disambiguate_ticker_hcx
 from app.data_fetcher import get_price_on_date, get_volume_top, _download, _slice_single
-from app.universe import (
-    KOSPI_TICKERS, KOSDAQ_TICKERS, GLOBAL_TICKERS,
-    NAME_BY_TICKER, KOSPI_MAP, KOSDAQ_MAP,
-)
+from app import universe
 from app.utils import _is_zero_volume, _holiday_msg, _universe, _prev_bday, _next_day, _find_prev_close, _nth_prev_bday
 from config import AmbiguousTickerError
 
 
 # ──────────────────────────────
 FIELD_MAP = {"종가": "Close", "시가": "Open", "고가": "High", "저가": "Low", "pct_change": "%Change", "거래량": "Volume"}
-TICK2NAME: Dict[str, str] = {v: k for k, v in {**KOSPI_MAP, **KOSDAQ_MAP}.items()}
 
                    # 지난 7 일 안에서 직전 거래일 탐색
 
@@ -45,6 +40,18 @@ def _fmt(val, kind):
         return f"{val:+.2f}%"
     return f"{val:,.0f}원"
 
+def _to_ticker_or_ask(alias: str, api_key: str) -> TickerInfo:
+    try:
+        return to_ticker(alias, with_name=True, api_key=api_key)  # 한글명 → 코드
+    except AmbiguousTickerError as e:
+        raise
+    except Exception:                                    # 완전 미인식
+        u = universe.current()
+        all_names = list(u.kospi_map) + list(u.kosdaq_map)
+        best, _ = disambiguate_ticker_hcx(alias, all_names, api_key)
+        cands = [best] + [n for n in all_names if n != best][:5]
+        raise AmbiguousTickerError(alias, cands)
+
 def _answer_multi(params: dict, api_key: str) -> str:
     date     = params["date"]
     metrics  = params["metrics"]
@@ -53,17 +60,14 @@ def _answer_multi(params: dict, api_key: str) -> str:
 
     results = []
 
-    for alias in aliases:
-        try:
-            info = to_ticker(alias, with_name=True, api_key=api_key)  # 한글명 → 코드
-        except AmbiguousTickerError as e:
-            raise
-        except Exception:                                    # 완전 미인식
-            all_names = list(KOSPI_MAP.keys()) + list(KOSDAQ_MAP.keys())
-            best, _ = disambiguate_ticker_hcx(alias, all_names, api_key)
-            cands = [best] + [n for n in all_names if n != best][:5]
-            raise AmbiguousTickerError(alias, cands)
+    try:
+        infos = to_tickers(aliases, with_name=True, api_key=api_key)  # 한글명 → 코드 (일괄)
+    except AmbiguousTickerError:
+        raise
+    except Exception:
+        infos = [_to_ticker_or_ask(alias, api_key) for alias in aliases]
 
+    for alias, info in zip(aliases, infos):
         tic, name = info.ticker, info.name
         parts = []
 
@@ -173,7 +177,7 @@ def _answer_total_trading_value(date: str, market: str | None) -> str:
     if df.empty:
         return f"{date}에 {market_txt} 거래대금 데이터가 없습니다"
     total = 0
-    for t in GLOBAL_TICKERS:
+    for t in universe.all_tickers():
         try:
             sub = _slice_single(df, t)
             price, vol = sub["Close"].iloc[0], sub["Volume"].iloc[0]
@@ -240,8 +244,8 @@ def _answer_volume_top(date: str, market: str|None, n: int) -> str:
         return f"{date} 데이터 없음"
     if n == 1:
         t, v = top.index[0], int(top.iloc[0])
-        return f"{TICK2NAME.get(t, t)} ({v:,}주)"
-    names = [TICK2NAME.get(t, t) for t in top.index[:n]]
+        return f"{universe.name_of(t)} ({v:,}주)"
+    names = [universe.name_of(t) for t in top.index[:n]]
     return ", ".join(names)
 
 def _answer_top_mover(date: str, market: str|None, direction: str, n: int) -> str:
@@ -271,7 +275,7 @@ def _answer_top_mover(date: str, market: str|None, direction: str, n: int) -> st
         return f"{date} 데이터 없음"
 
     rank = sorted(pct.items(), key=lambda x: x[1], reverse=(direction == "상승률"))[:n]
-    return ", ".join(TICK2NAME.get(t, t) for t, _ in rank)
+    return ", ".join(universe.name_of(t) for t, _ in rank)
 
 def _answer_top_price(date: str, market: str|None, n: int) -> str:
     tickers = _universe(market)
@@ -294,7 +298,7 @@ def _answer_top_price(date: str, market: str|None, n: int) -> str:
     if not closes:
         return f"{date} 데이터 없음"
     top = sorted(closes.items(), key=lambda x: x[1], reverse=True)[:n]
-    return ", ".join(TICK2NAME.get(t, t) for t, _ in top)
+    return ", ".join(universe.name_of(t) for t, _ in top)
 
 def _batch_ohlcv(tickers: list[str], start: str, end: str) -> pd.DataFrame:
     return _download(tuple(tickers), start=start, end=end, interval="1d")
@@ -425,22 +429,25 @@ def _answer_volatility_rank(date, market, n, order="low"):
     tk = _universe(market)
     vol = _volatility_all(date, tk)
     ranked = sorted(vol.items(), key=lambda x: x[1], reverse=(order=="high"))[:n]
-    return ", ".join(TICK2NAME.get(t, t) for t, _ in ranked)
+    return ", ".join(universe.name_of(t) for t, _ in ranked)
 
 def _answer_beta_rank(date, market, n, order="low"):
     tk = _universe(market)
     bet = _beta_all(date, tk, market)
     ranked = sorted(bet.items(), key=lambda x: x[1], reverse=(order=="high"))[:n]
-    return ", ".join(TICK2NAME.get(t, t) for t, _ in ranked)
+    return ", ".join(universe.name_of(t) for t, _ in ranked)
 
 
 def _answer_risk_single(date: str, tickers: Iterable[str], metrics: Iterable[str],
                         market: str | None, api_key: str) -> str:
     results = []
-    for raw in tickers:
-        try:
-            info = to_ticker(raw, with_name=True, api_key=api_key)          # 한글명 → 코드
-        except Exception:
+    tickers = list(tickers)
+    try:
+        infos = to_tickers(tickers, with_name=True, api_key=api_key, strict=False)  # 한글명 → 코드 (일괄)
+    except Exception:
+        infos = [None] * len(tickers)
+    for raw, info in zip(tickers, infos):
+        if info is None:
             results.append(f"{raw}: 티커 인식 실패")
             continue
 
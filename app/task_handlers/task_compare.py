@@ -4,8 +4,8 @@ from typing import Literal
 
 from app.data_fetcher import _download, _next_day, get_index_level
 from app.utils import _prev_bday, _universe
-from app.universe import NAME_BY_TICKER, GLOBAL_TICKERS
-from app.ticker_lookup import to_ticker
+from app import universe
+from app.ticker_lookup import to_tickers
 
 Metric = Literal["시가", "종가", "고가", "저가", "거래량", "등락률", "지수", "시가총액"]
 
@@ -23,7 +23,7 @@ def handle(_: str, p: dict, api_key: str) -> str:
     metric   = metrics[0] if metrics else None
     names    = p.get("tickers", [])
     markets  = p.get("market") or []
-    tickers  = [to_ticker(name, api_key=api_key) for name in names]
+    tickers  = to_tickers(names, api_key=api_key)
 
     if not date or not metric:
         return "비교를 위한 날짜와 지표가 필요합니다."
@@ -50,7 +50,7 @@ def handle(_: str, p: dict, api_key: str) -> str:
 
         if market_set.issubset(allowed_markets) and metric in ("등락률", "pct_change"):
             ticker = tickers[0]
-            name = NAME_BY_TICKER.get(ticker, ticker)
+            name = universe.name_of(ticker)
 
             # 종목 데이터
             df = _download((ticker,), start=_prev_bday(date), end=_next_day(date), interval="1d")
@@ -130,8 +130,8 @@ def handle(_: str, p: dict, api_key: str) -> str:
         if pd.isna(val_a) or pd.isna(val_b):
             return f"{date}에 필요한 데이터를 찾을 수 없습니다."
 
-        name_a = NAME_BY_TICKER.get(a, a)
-        name_b = NAME_BY_TICKER.get(b, b)
+        name_a = universe.name_of(a)
+        name_b = universe.name_of(b)
 
         # 방향성 판단
         higher_is_better = metric not in ("저가",)  # 저가는 낮을수록 좋음
@@ -1,13 +1,20 @@
 from __future__ import annotations
+import json
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
 from app.utils import _universe, _holiday_msg, _prev_bday, _nth_prev_bday
 from app.data_fetcher import _download, _next_day
 from app.ticker_lookup import to_ticker
-from app.universe import NAME_BY_TICKER, KOSPI_TICKERS, KOSDAQ_TICKERS
+from app import singleflight, universe
+from app.yf_cache import data_version
+from app.parallel_screen import screen_shards
 from app.search_utils import (
     search_by_pct_change_range,
     search_by_consecutive_change,
     search_cross_count_by_stock,
     search_cross_dates_by_condition,
+    search_cross_dates_by_stock,
     search_by_price_close,
     search_by_volume,
     search_by_pct_change,
@@ -23,8 +30,10 @@ from app.search_utils import (
     detect_52w_low,
     detect_off_peak,
     search_by_gap_pct,
+    screen_by_events,
 )
 from app.ticker_lookup import to_ticker
+from config import SCREEN_CACHE_SIZE
 import pandas as pd
 
 def handle(_: str, p: dict, api_key: str) -> str:
@@ -45,111 +54,183 @@ def _handle_stock_search(p: dict) -> str:
     date = p.get("date")
     date_from = p.get("date_from")
     date_to = p.get("date_to")
-    market = p.get("market")
 
-    # ───────────────────── 단일일 조건 처리 ─────────────────────
     if date:
         if msg := _holiday_msg(date):
             return msg
-        def _need_history_depth(cond: dict) -> int:
-            days = 0
-            if "pct_change" in cond or "volume_pct" in cond:
-                days = max(days, 1)
-            if "RSI" in cond:
-                days = max(days, cond["RSI"].get("window", 14))
-            if "volume_spike" in cond:
-                days = max(days, cond["volume_spike"].get("window", 20))
-            if "moving_avg" in cond:
-                days = max(days, cond["moving_avg"].get("window", 20))
-            if "bollinger_touch" in cond:
-                days = max(days, 20)
-            if "peak_break" in cond or "peak_low" in cond or "off_peak" in cond:
-                days = max(days, cond.get("peak_break", {}).get("period_days",
-                                 cond.get("peak_low", {}).get("period_days",
-                                 cond.get("off_peak", {}).get("period_days", 260))))
-            if "gap_pct" in cond:
-                days = max(days, 1)
-            if "net_buy" in cond:
-                days = max(days, 1)
-            return days
-        
-        depth = _need_history_depth(cond)
-        start = _nth_prev_bday(date, depth)
-        end = _next_day(date)
-
-        tickers = tuple(_universe(market))
+    elif not (date_from and date_to):
+        return "[ERROR] 날짜 정보가 없습니다."
 
-        df = _download(tickers, start=start, end=end, interval="1d")
-        if df.empty:
-            return f"{date}의 데이터를 불러올 수 없습니다."
-
-        result = list(tickers)
-
-        if "price_close" in cond:
-            result = search_by_price_close(df, date, cond["price_close"], result)
-        if "volume" in cond:
-            result = search_by_volume(df, date, cond["volume"], result)
-        if "pct_change" in cond:
-            result = search_by_pct_change(df, date, cond["pct_change"], result)
-        if "volume_pct" in cond:
-            result = search_by_volume_pct(df, date, cond["volume_pct"], result)
-        if "RSI" in cond:
-            result = detect_rsi(df, date, cond["RSI"], result)
-        if "volume_spike" in cond:
-            result = detect_volume_spike(df, date, cond["volume_spike"], result)
-        if "moving_avg" in cond:
-            result = detect_ma_break(df, date, cond["moving_avg"], result)
-        if "bollinger_touch" in cond:
-            result = detect_bollinger_touch(df, date, cond["bollinger_touch"], result)
-        if "peak_break" in cond:
-            period = cond["peak_break"].get("period_days", 260)
-            result = detect_52w_high_break(df, date, period, result)
-        if "peak_low" in cond:
-            period = cond["peak_low"].get("period_days", 260)
-            result = detect_52w_low(df, date, period, result)   
-        if "off_peak" in cond:
-            period = cond["off_peak"].get("period_days", 260)
-            drop  = cond["off_peak"].get("min", 30)
-            result = detect_off_peak(df, date, period, drop, result)
-        if "gap_pct" in cond:
-            result = search_by_gap_pct(df, date, cond["gap_pct"], result)
+    try:
+        result = _screen(_screen_key(p), data_version())
+    except _NoData:
+        period = date or f"{date_from} ~ {date_to}"
+        return f"{period}의 데이터를 불러올 수 없습니다."
 
-        if not result:
-            return "조건에 맞는 종목이 없습니다."
+    if not result:
+        return "조건에 맞는 종목이 없습니다."
 
-        names = [NAME_BY_TICKER.get(t, t) for t in result]
+    if date:
+        names = sorted(universe.name_of(t) for t in result)
         desc = _describe_conditions(date, cond)
-        return desc + "\n" + ", ".join(sorted(names))
+    else:
+        names = [universe.name_of(t) for t in sorted(result)]
+        desc = _describe_range_conditions(date_from, date_to, cond)
+    return desc + "\n" + ", ".join(names)
 
-    # ───────────────────── 기간 조건 처리 ─────────────────────
-    elif date_from and date_to:
-        tickers = list(_universe(market))
-        df = _download(tuple(tickers), start=date_from, end=_next_day(date_to), interval="1d")
-        if df.empty:
-            return f"{date_from} ~ {date_to}의 데이터를 불러올 수 없습니다."
 
-        result = tickers
+# ───────────────────── 스크리너 결과 캐시 ─────────────────────
+class _NoData(Exception):
+    """가격 데이터를 불러오지 못함 (lru_cache 에 남기지 않기 위해 예외로 전달)"""
+
 
-        if "pct_change_range" in cond:
-            result = search_by_pct_change_range(df, date_from, date_to, cond["pct_change_range"], result)
-        if "consecutive_change" in cond:
-            result = search_by_consecutive_change(df, date_from, date_to, cond["consecutive_change"], result)
-        if "cross" in cond:
-            result = search_cross_dates_by_condition(df, date_from, date_to, cond["cross"], result)
-        if "three_pattern" in cond:
-            result = three_pattern_tickers(df, cond["three_pattern"], date_from, date_to, result)
+def _canon(obj):
+    """조건 dict 정규화 – 정수값 float(30.0) → int(30), 키 정렬은 json.dumps 에서"""
+    if isinstance(obj, dict):
+        return {str(k): _canon(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canon(v) for v in obj]
+    if isinstance(obj, float) and obj.is_integer():
+        return int(obj)
+    return obj
 
+
+def _screen_key(p: dict) -> str:
+    """(날짜 또는 기간, 시장, 조건) → 정규화된 JSON 문자열"""
+    market = p.get("market")
+    key = {
+        "date": p.get("date"),
+        "date_from": None if p.get("date") else p.get("date_from"),
+        "date_to": None if p.get("date") else p.get("date_to"),
+        "market": market if market in ("KOSPI", "KOSDAQ") else None,
+        "conditions": _canon(p.get("conditions") or {}),
+    }
+    return json.dumps(key, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+@lru_cache(maxsize=SCREEN_CACHE_SIZE)
+@singleflight.coalesce                          # 같은 조건 동시 요청은 스크리닝 한 번만
+def _screen(key: str, version: int) -> Tuple[str, ...]:
+    """
+    조건에 맞는 티커 튜플.
+    version(가격 캐시 데이터 버전)이 바뀌면 키가 달라져 자동으로 다시 계산된다.
+    """
+    k = json.loads(key)
+    if k["date"]:
+        result = _screen_date(k["date"], k["market"], k["conditions"])
+    else:
+        result = _screen_range(k["date_from"], k["date_to"], k["market"], k["conditions"])
+    return tuple(result)
+
+universe.on_reload(_screen.cache_clear)         # 상장 목록이 바뀌면 스크리닝 대상도 바뀜
+
+
+# ───────────────────── 단일일 조건 처리 ─────────────────────
+# 조건별 (필요 이력 거래일 수, 필요 필드, 필터) – 얕은 조건부터 순서대로 적용
+_PEAK_DAYS = 260
+
+_DATE_PREDICATES: Dict[str, Tuple[Callable[[dict], int], Tuple[str, ...], Callable]] = {
+    "price_close":     (lambda c: 0, ("Close", "Volume"),
+                        lambda df, d, c, t: search_by_price_close(df, d, c, t)),
+    "volume":          (lambda c: 0, ("Volume",),
+                        lambda df, d, c, t: search_by_volume(df, d, c, t)),
+    "pct_change":      (lambda c: 1, ("Close", "Volume"),
+                        lambda df, d, c, t: search_by_pct_change(df, d, c, t)),
+    "volume_pct":      (lambda c: 1, ("Volume",),
+                        lambda df, d, c, t: search_by_volume_pct(df, d, c, t)),
+    "gap_pct":         (lambda c: 1, ("Open", "Close", "Volume"),
+                        lambda df, d, c, t: search_by_gap_pct(df, d, c, t)),
+    "RSI":             (lambda c: c.get("window", 14), ("Adj Close", "Volume"),
+                        lambda df, d, c, t: detect_rsi(df, d, c, t)),
+    "volume_spike":    (lambda c: c.get("window", 20), ("Adj Close", "Volume"),
+                        lambda df, d, c, t: detect_volume_spike(df, d, c, t)),
+    "moving_avg":      (lambda c: c.get("window", 20), ("Adj Close", "Volume"),
+                        lambda df, d, c, t: detect_ma_break(df, d, c, t)),
+    "bollinger_touch": (lambda c: 20, ("Adj Close", "Volume"),
+                        lambda df, d, c, t: detect_bollinger_touch(df, d, c, t)),
+    "peak_break":      (lambda c: c.get("period_days", _PEAK_DAYS), ("Close", "Volume"),
+                        lambda df, d, c, t: detect_52w_high_break(df, d, c.get("period_days", _PEAK_DAYS), t)),
+    "peak_low":        (lambda c: c.get("period_days", _PEAK_DAYS), ("Close", "Volume"),
+                        lambda df, d, c, t: detect_52w_low(df, d, c.get("period_days", _PEAK_DAYS), t)),
+    "off_peak":        (lambda c: c.get("period_days", _PEAK_DAYS), ("Close", "Volume"),
+                        lambda df, d, c, t: detect_off_peak(df, d, c.get("period_days", _PEAK_DAYS), c.get("min", 30), t)),
+}
+
+
+def _date_stages(cond: dict) -> List[Tuple[int, Tuple[str, ...], List[str]]]:
+    """
+    조건 → [(이력 깊이, 필드, 조건 키들), ...]  (깊이 오름차순)
+    같은 깊이의 조건은 한 번에 로드해 같이 거른다.
+    """
+    keys = [k for k in _DATE_PREDICATES if k in cond]
+    keys.sort(key=lambda k: _DATE_PREDICATES[k][0](cond[k]))   # stable → 표 순서 유지
+
+    stages: List[Tuple[int, Tuple[str, ...], List[str]]] = []
+    for k in keys:
+        depth, fields, _ = _DATE_PREDICATES[k]
+        depth = depth(cond[k])
+        if stages and stages[-1][0] == depth:
+            d, f, ks = stages[-1]
+            stages[-1] = (d, tuple(sorted(set(f) | set(fields))), ks + [k])
+        else:
+            stages.append((depth, tuple(sorted(fields)), [k]))
+    return stages or [(0, ("Close", "Volume"), [])]
+
+
+def _screen_date(date: str, market: str | None, cond: dict) -> list[str]:
+    """
+    단계별 로드 – 얕은 이력·적은 필드 조건으로 먼저 거른 뒤,
+    살아남은 티커에 대해서만 더 깊은 이력을 읽는다 (52주 조건의 메모리 ↓).
+    이벤트 스토어로 답할 수 있는 조건은 가격을 읽기 전에 먼저 거른다.
+    """
+    result, rest = screen_by_events(date, cond, list(_universe(market)))
+    if cond and not rest:
+        return result
+    cond = rest
+    end = _next_day(date)
+
+    for i, (depth, fields, keys) in enumerate(_date_stages(cond)):
+        start = _nth_prev_bday(date, depth)
+        df = _download(tuple(result), start=start, end=end, interval="1d", fields=fields)
+        if df.empty:
+            if i == 0:
+                raise _NoData
+            return []
+        result = screen_shards(df, result, _date_filters, date, {k: cond[k] for k in keys})
         if not result:
-            return "조건에 맞는 종목이 없습니다."
+            break
+    return result
 
-        names = [NAME_BY_TICKER.get(t, t) for t in sorted(result)]
-        desc = _describe_range_conditions(date_from, date_to, cond)
-        return desc + "\n" + ", ".join(names)
 
+def _date_filters(df: pd.DataFrame, tickers: list[str], date: str, cond: dict) -> list[str]:
+    result = list(tickers)
+    for k, sub in cond.items():
+        result = _DATE_PREDICATES[k][2](df, date, sub, result)
+    return result
+
+
+# ───────────────────── 기간 조건 처리 ─────────────────────
+def _screen_range(date_from: str, date_to: str, market: str | None, cond: dict) -> list[str]:
+    tickers = list(_universe(market))
+    df = _download(tuple(tickers), start=date_from, end=_next_day(date_to), interval="1d")
+    if df.empty:
+        raise _NoData
+
+    return screen_shards(df, tickers, _range_filters, date_from, date_to, cond)
 
-    # ───────────────────── 날짜 없음 ─────────────────────
-    else:
-        return "[ERROR] 날짜 정보가 없습니다."
+
+def _range_filters(df: pd.DataFrame, tickers: list[str], date_from: str, date_to: str, cond: dict) -> list[str]:
+    result = list(tickers)
+
+    if "pct_change_range" in cond:
+        result = search_by_pct_change_range(df, date_from, date_to, cond["pct_change_range"], result)
+    if "consecutive_change" in cond:
+        result = search_by_consecutive_change(df, date_from, date_to, cond["consecutive_change"], result)
+    if "cross" in cond:
+        result = search_cross_dates_by_condition(df, date_from, date_to, cond["cross"], result)
+    if "three_pattern" in cond:
+        result = three_pattern_tickers(df, cond["three_pattern"], date_from, date_to, result)
+    return result
 
 # ───────────────────────────── 횟수검색 ─────────────────────────────
 def _handle_count_search(p: dict, api_key: str) -> str:
@@ -172,6 +253,8 @@ def _handle_date_search(p: dict, api_key: str) -> str:
 
     if "three_pattern" in cond:
         return three_pattern_dates(ticker, cond["three_pattern"], date_from, date_to)
+    if "cross" in cond:
+        return search_cross_dates_by_stock(ticker, date_from, date_to, cond["cross"])
 
     return "[ERROR] 지원하지 않는 날짜검색 조건입니다."
 
@@ -3,13 +3,17 @@ from __future__ import annotations
 import json, re, functools
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, NamedTuple
+from typing import Dict, Optional, NamedTuple, Tuple
 import numpy as np
-import yfinance as yf
 
-from app.universe import KOSPI_MAP, KOSDAQ_MAP, _load_alias_csv, NAME_BY_TICKER
-from app.llm_bridge import disambiguate_ticker_hcx
-from config import TOP_K_FUZZY, TOP_K_EMBED, HCX_CONF_THRESHOLD, AmbiguousTickerError
+from app import universe
+from app.llm_bridge import disambiguate_ticker_hcx, disambiguate_tickers_hcx
+from app import embed_index, alias_cache
+from app.name_index import NameIndex, AbbrevIndex, jamo, is_chosung
+from config import (
+    TOP_K_FUZZY, TOP_K_EMBED, HCX_CONF_THRESHOLD, EMBED_MODEL, AmbiguousTickerError,
+    FUZZY_SHORTLIST, FUZZY_AUTO_ACCEPT, FUZZY_ACCEPT_SCORE, FUZZY_ACCEPT_MARGIN,
+)
 
 from rapidfuzz import process, fuzz             # 나중에 아래 try 코드로 변경해야 함.
 # try:
@@ -17,24 +21,34 @@ from rapidfuzz import process, fuzz             # 나중에 아래 try 코드로
 # except ImportError:
 #     process = fuzz = None
 
-from sentence_transformers import SentenceTransformer # 나중에 아래 try 코드로 변경해야 함.
-import faiss
-# try:
-#     from sentence_transformers import SentenceTransformer
-#     import faiss
-# except ImportError:
-#     SentenceTransformer = None         # graceful-degrade
+# sentence_transformers(torch) · faiss 는 임베딩 fallback 이 처음 필요할 때 import (graceful-degrade)
+from app.yf_lazy import yf
 
 class TickerInfo(NamedTuple):
     ticker: str        # ‘005930.KS’
     name:   str        # ‘삼성전자’
 
 
-# 1️⃣ 메모리 사전 (CSV + 수동 보강)
+# 1️⃣ 메모리 사전 (공유 유니버스 + 수동 보강)
 _STATIC_MAP: Dict[str, str] = {}
-_STATIC_MAP.update(KOSPI_MAP)
-_STATIC_MAP.update(KOSDAQ_MAP)
-_STATIC_MAP.update(_load_alias_csv())
+_EMBED_NAMES: list[str] = []                # 임베딩 인덱스 대상 (CSV 기준 → 디스크 인덱스 해시와 일치)
+_TICKER_SET: set[str] = set()
+
+def _build_static_map() -> None:
+    """유니버스 name_map + 승격 별칭 → _STATIC_MAP (새로 만든 뒤 참조 교체)"""
+    global _STATIC_MAP, _EMBED_NAMES, _TICKER_SET
+    names = universe.current().name_map
+    static = dict(names)
+    tickers = set(static.values())
+    # 별칭 캐시에서 자주 적중한 별칭 승격
+    static.update({
+        a: t for a, t in alias_cache.popular().items()
+        if t in tickers and a not in static
+    })
+    _STATIC_MAP, _EMBED_NAMES, _TICKER_SET = static, list(names), tickers
+
+_build_static_map()
+
 # _STATIC_MAP.update({           # 필요 시 수동 보강
 #     "마이크로소프트": "MSFT",
 #     "애플": "AAPL",
@@ -45,14 +59,14 @@ _STATIC_MAP.update(_load_alias_csv())
 def _fallback_lookup(name: str) -> Optional[str]:
     """yfinance.Lookup / Search 로 티커 추정 (주식만 반환)"""
     try:
-        res = yf.Lookup(name)
+        res = yf().Lookup(name)
         for item in res.stock:  # type: ignore[attr-defined]
             return item.symbol
     except Exception:
         pass
 
     try:
-        res = yf.Search(name, max_results=5)
+        res = yf().Search(name, max_results=5)
         for q in res.quotes:
             if q.quoteType == "EQUITY":
                 return q.symbol
@@ -69,9 +83,10 @@ def _strip_particle(text: str) -> str:
 
 def _lookup_korean(name: str) -> Optional[str]:
     """KOSPI/KOSDAQ 사전 + yfinance Lookup 검색"""
+    u = universe.current()
     return (
-        KOSPI_MAP.get(name)
-        or KOSDAQ_MAP.get(name)
+        u.kospi_map.get(name)
+        or u.kosdaq_map.get(name)
         or _fallback_lookup(name)
     )
 
@@ -82,25 +97,53 @@ def _lookup_korean(name: str) -> Optional[str]:
 @lru_cache(maxsize=1)
 def _get_model():
     """Sentence-BERT 모델 1회 로드 (없으면 None)"""
-    if SentenceTransformer is None:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
         return None
-    return SentenceTransformer("jhgan/ko-sbert-sts")
+    return SentenceTransformer(EMBED_MODEL)
 
 _EMBED_DIM = 768
 
 @lru_cache(maxsize=1)
 def _init_embed_index():
-    """한 번만 호출: 이름들 → 임베딩 → Faiss 인덱스 구성"""
-    if SentenceTransformer is None or faiss is None:
+    """한 번만 호출: 디스크 인덱스 로드 (유니버스 변경 시에만 이름 → 임베딩 → Faiss 재구성)"""
+    try:
+        import faiss  # noqa: F401
+    except ImportError:
+        return None, None
+    if (hit := embed_index.load()) is not None:        # 디스크 인덱스면 모델 로드 불필요
+        return hit
+    if _get_model() is None:
         return None, None
+    return embed_index.build(_EMBED_NAMES, _get_model())
 
-    names = list(_STATIC_MAP.keys())
-    model = _get_model()
-    vecs = model.encode(names, normalize_embeddings=True, batch_size=128)
+# ─────────────────────────── 자모 n-gram 역색인 ───────────────────────────
+@lru_cache(maxsize=1)
+def _name_index() -> NameIndex:
+    return NameIndex(_STATIC_MAP.keys())
+
+@lru_cache(maxsize=1)
+def _abbrev_index() -> AbbrevIndex:
+    return AbbrevIndex(_STATIC_MAP.keys())
 
-    index = faiss.IndexFlatIP(_EMBED_DIM)      # cosine sim == dot prod (L2-norm=1)
-    index.add(np.asarray(vecs, dtype="float32"))
-    return (index, names)
+@universe.on_reload
+def _on_universe_reload() -> None:
+    """상장 목록 변경 → 정적 사전 재구성 + 파생 인덱스 무효화"""
+    _build_static_map()
+    for fn in (_name_index, _abbrev_index, _init_embed_index, _fallback_lookup):
+        fn.cache_clear()
+
+def _abbrev_candidates(identifier: str) -> list[str]:
+    """초성/접두어 매칭 종목명 (티커당 하나, 공식명 우선)"""
+    aidx = _abbrev_index()
+    out: Dict[str, str] = {}
+    for i in aidx.match(identifier):
+        name = aidx.names[i]
+        ticker = _STATIC_MAP[name]
+        official = universe.current().name_by_ticker.get(ticker)
+        out.setdefault(ticker, official if official in _STATIC_MAP else name)
+    return list(out.values())
 
 # class LowConfidenceTickerError(Exception):
 #     """confidence 가 기준치보다 낮을 때 발생"""
@@ -114,59 +157,139 @@ def _init_embed_index():
 def to_ticker(identifier: str, *, with_name: bool = False, api_key: str) -> str | TickerInfo:
     """
     1) _STATIC_MAP에서 먼저 찾기
-    2) 없으면 yfinance Lookup/Search
-    3) 그래도 없으면 identifier를 대문자로 반환
+    2) 별칭 캐시 · 초성/접두어 · fuzzy
+    3) 임베딩 후보 + HCX 판별 (자신 없으면 AmbiguousTickerError)
 
     with_name=True → TickerInfo(ticker, 공식종목명) 반환
     """
-    identifier = identifier.strip()
+    return to_tickers([identifier], with_name=with_name, api_key=api_key)[0]
+
+
+class _Pending(NamedTuple):
+    """로컬 단계에서 확정 못 한 별칭"""
+    alias:  str
+    fuzzy:  list            # [(종목명, 점수), ...]
+    direct: list | None     # 약어(초성/접두어) 후보 → 임베딩 생략하고 바로 HCX
+
 
+def _resolve_local(identifier: str) -> Tuple[str, str] | _Pending:
+    """①~② 로컬 단계: 확정되면 (ticker, 공식명), 아니면 _Pending"""
     # ---------- ① 정적/alias 매핑 ----------
     for name_try in (identifier, _strip_particle(identifier)):
         if (ticker := _STATIC_MAP.get(name_try)):
-            official = name_try
-            return (
-                TickerInfo(ticker, official) if with_name else ticker
-            )
+            return ticker, name_try
 
-    # # ---------- ② fuzzy 후보 N 개 ----------
+    # ---------- ①-1 별칭 캐시 (이전에 확신 있게 해석된 별칭) ----------
+    if (hit := alias_cache.get(identifier)) and hit.ticker in _TICKER_SET:
+        return hit.ticker, hit.name
+
+    # ---------- ①-2 초성 / 접두어 약어 ----------
+    # 2글자 약어는 우연히 한 종목만 맞는 경우가 많아 확정 · 캐시하지 않고 HCX 후보로만 넘긴다.
+    # HCX 가 확신한 경우에만 별칭 캐시에 남는다 (source='hcx').
+    abbrev: list[str] = []
+    for name_try in (identifier, _strip_particle(identifier)):
+        if (abbrev := _abbrev_candidates(name_try)):
+            break
+    if len(abbrev) == 1 or (
+        abbrev and len(abbrev) <= TOP_K_FUZZY + TOP_K_EMBED and is_chosung(identifier.replace(" ", ""))
+    ):
+        # 유일한 약어 후보 · 초성 입력(fuzzy/임베딩 무의미) → 약어 후보만으로 바로 판별
+        return _Pending(identifier, [], abbrev)
+
+    # # ---------- ② fuzzy 후보 N 개 (자모 n-gram 역색인으로 후보 압축) ----------
     fuzzy_cands: list[tuple[str, float]] = []
     if process:
+        nidx = _name_index()
+        ids = nidx.shortlist(identifier, FUZZY_SHORTLIST)
         raw_fuzzy = process.extract(
-            identifier,
-            _STATIC_MAP.keys(),
+            jamo(identifier),
+            {nidx.names[i]: nidx.keys[i] for i in ids},
             scorer=fuzz.QRatio,
             limit=TOP_K_FUZZY,
         )
-        # rapidfuzz는 (choice, score, idx)를 반환하므로 앞 두 개만 사용
-        fuzzy_cands = [(choice, float(score)) for choice, score, *_ in raw_fuzzy]
+        # dict 입력이면 rapidfuzz는 (value, score, key)를 반환 → key(종목명)와 score 사용
+        fuzzy_cands = [(key, float(score)) for _, score, key in raw_fuzzy]
+
+        # 오타 1~2 자모 수준으로 확실하면 임베딩/HCX 없이 확정 (삼성전쟈 → 삼성전자, 삼성전가 는 동점이라 HCX)
+        # 검증되지 않은 추정이므로 별칭 캐시에 남기지 않는다 → 캐시 적중 · 정적 사전 승격 대상 아님
+        if FUZZY_AUTO_ACCEPT and fuzzy_cands and fuzzy_cands[0][1] >= FUZZY_ACCEPT_SCORE and (
+            len(fuzzy_cands) == 1 or fuzzy_cands[0][1] - fuzzy_cands[1][1] >= FUZZY_ACCEPT_MARGIN
+        ):
+            official = fuzzy_cands[0][0]
+            return _STATIC_MAP[official], official
 
-    # ---------- ③ 임베딩 fallback (Sentence-BERT) ----------
-    embed_cands: list[tuple[str, float]] = []
+    return _Pending(identifier, fuzzy_cands, None)
+
+
+def _embed_candidates(aliases: list[str]) -> list[list[tuple[str, float]]]:
+    """③ 임베딩 후보 – 별칭 전체를 한 번에 인코딩 · Faiss 검색 1회"""
+    if not aliases:
+        return []
     idx, names = _init_embed_index()
     model = _get_model()
-    if idx is not None and model is not None:
-        q_vec = model.encode([identifier], normalize_embeddings=True)
-        D, I = idx.search(np.asarray(q_vec, dtype="float32"), TOP_K_EMBED)
-        for sim, ix in zip(D[0], I[0]):
-            embed_cands.append((names[ix], float(sim)))
-    # if (_sem := _semantic_fallback(identifier)):
-    #     return _sem
-    # ----- ④ 후보 합치기 (중복 제거·유사도 기준 정렬) -----
-    cand_all: dict[str, float] = {}
-    for item in fuzzy_cands + embed_cands:
-        name, score = item[:2]          # 앞 두 값만 사용
-        cand_all[name] = max(cand_all.get(name, 0), score)
-    candidates = sorted(cand_all.items(), key=lambda x: -x[1])[:TOP_K_FUZZY+TOP_K_EMBED]
-    official_names = [n for n, _ in candidates]
-
-    # ----- ⑤ hcx에게 어떤 후보가 alias와 가장 유사한지 판단시키기 -----
-    best, conf = disambiguate_ticker_hcx(alias=identifier, candidates=official_names, api_key=api_key)
-    
-    if conf >= HCX_CONF_THRESHOLD:
-        ticker = _STATIC_MAP[best]
-        official = best
-        return TickerInfo(ticker, official) if with_name else ticker
-
-    # ----- ⑥ 자신 없으면 사용자 재질문을 위해 예외 발생 -----
-    raise AmbiguousTickerError(identifier, official_names)
+    if idx is None or model is None:
+        return [[] for _ in aliases]
+    q_vec = model.encode(aliases, normalize_embeddings=True)
+    D, I = idx.search(np.asarray(q_vec, dtype="float32"), TOP_K_EMBED)
+    return [
+        [(names[ix], float(sim)) for sim, ix in zip(d, i) if ix >= 0]
+        for d, i in zip(D, I)
+    ]
+
+
+def to_tickers(
+    identifiers: list[str], *, with_name: bool = False, api_key: str, strict: bool = True,
+) -> list:
+    """
+    여러 별칭을 한 번에 해석 (입력 순서 유지)
+    • 로컬 단계(①~②)는 별칭별로, 임베딩(③)은 미해결 별칭을 **한 배치**로,
+      HCX 판별(⑤)은 미해결 별칭 전체를 **한 번의 호출**로 처리.
+    • strict=True  → 확정 못 한 첫 별칭에서 AmbiguousTickerError
+      strict=False → 확정 못 한 별칭 자리는 None
+    """
+    out: list = [None] * len(identifiers)
+    pending: Dict[int, _Pending] = {}
+    for i, identifier in enumerate(identifiers):
+        r = _resolve_local(identifier.strip())
+        if isinstance(r, _Pending):
+            pending[i] = r
+        else:
+            out[i] = r
+
+    if pending:
+        need = [i for i, p in pending.items() if p.direct is None]
+        embeds = dict(zip(need, _embed_candidates([pending[i].alias for i in need])))
+
+        # ----- ④ 후보 합치기 (중복 제거·유사도 기준 정렬) -----
+        cand_lists: Dict[int, list[str]] = {}
+        for i, p in pending.items():
+            if p.direct is not None:
+                cand_lists[i] = p.direct
+                continue
+            cand_all: dict[str, float] = {}
+            for name, score in p.fuzzy + embeds.get(i, []):
+                cand_all[name] = max(cand_all.get(name, 0), score)
+            candidates = sorted(cand_all.items(), key=lambda x: -x[1])[:TOP_K_FUZZY+TOP_K_EMBED]
+            cand_lists[i] = [n for n, _ in candidates]
+
+        # ----- ⑤ hcx에게 어떤 후보가 alias와 가장 유사한지 판단시키기 (1회 호출) -----
+        asked = [i for i in pending if cand_lists[i]]
+        picks = disambiguate_tickers_hcx(
+            [(pending[i].alias, cand_lists[i]) for i in asked], api_key=api_key
+        ) if asked else []
+        for i, (best, conf) in zip(asked, picks):
+            if conf >= HCX_CONF_THRESHOLD:
+                ticker = _STATIC_MAP[best]
+                alias_cache.put(pending[i].alias, ticker, best, "hcx", conf)
+                out[i] = (ticker, best)
+
+        # ----- ⑥ 자신 없으면 사용자 재질문을 위해 예외 발생 -----
+        if strict:
+            for i in sorted(pending):
+                if out[i] is None:
+                    raise AmbiguousTickerError(pending[i].alias, cand_lists[i])
+
+    return [
+        None if r is None else (TickerInfo(*r) if with_name else r[0])
+        for r in out
+    ]
@@ -1,54 +1,159 @@
 # app/universe.py
+"""
+종목 유니버스 (KOSPI/KOSDAQ 종목명 · 시장 구분 · 별칭)
+
+컴파일 아티팩트 (UNIVERSE_NPZ, `python -m scripts.build_universe`)
+────────
+  version   : 포맷 버전
+  hash      : CSV 3개(KOSPI/KOSDAQ/alias) 내용 sha256 → CSV 가 바뀌면 아티팩트는 무시
+  tickers   : 고유 티커 (ticker id = 배열 위치)
+  names     : 행별 종목명 (중복 종목명 '(코드6)' 접미사 적용 완료)
+  tid       : 행별 ticker id (int32)
+  market    : 행별 시장 (0=KOSPI, 1=KOSDAQ)
+  alias     : 별칭
+  alias_tid : 별칭별 ticker id
+
+• 해시가 맞는 아티팩트가 있으면 그대로 읽고, 없으면 CSV 를 (iterrows 없이) 벡터 연산으로 파싱.
+• 티커 문자열은 intern → 모든 사전이 같은 객체를 공유.
+
+스냅샷 · 핫 리로드
+────────
+• reload 는 사전/목록을 **새로 만들어** Universe 스냅샷 하나로 묶은 뒤 _lock 안에서 참조만 교체한다.
+  읽는 쪽은 중간 상태(일부만 갱신된 사전)를 보지 않는다.
+• 읽는 쪽은 `from app.universe import …` 로 사전을 들고 있지 말고 호출 시점에 접근자를 부른다
+  (current() · tickers() · all_tickers() · name_of()). 한 요청 안에서 여러 사전을 함께 쓰면
+  current() 를 한 번만 불러 같은 스냅샷을 쓴다. 스냅샷의 사전은 읽기 전용으로 취급.
+• 파생 캐시(이름 인덱스 · 스캐너 오토마톤 · 스크리너 결과 등)는 on_reload() 콜백으로 비운다.
+• maybe_reload() 는 CSV/아티팩트 mtime 만 비교 → 요청마다 불러도 stat 몇 번.
+"""
 from __future__ import annotations
 
-import pandas as pd
-from functools import lru_cache
-from typing import Dict, List
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from config import KOSPI_CSV, KOSDAQ_CSV, ALIAS_CSV, UNIVERSE_NPZ
+
+_FORMAT = 1
+_MARKETS = ("KOSPI", "KOSDAQ")
+_LISTINGS = (KOSPI_CSV, KOSDAQ_CSV)          # 순서 = market 코드
+
 
-from config import KOSPI_CSV, KOSDAQ_CSV, ALIAS_CSV
+class _Rows(NamedTuple):
+    names:   List[str]          # 행별 종목명
+    tickers: List[str]          # 행별 티커
+    market:  List[int]          # 행별 시장 코드
+    alias:   Dict[str, str]     # {별칭: 티커}
 
-@lru_cache(maxsize=1)
-def _load_csv(path) -> Dict[str, str]:
-    """
-    CSV → {종목명: '티커.확장자'} 사전  
-    """
-    df = pd.read_csv(path, sep=",", encoding="utf-8-sig")  # 헤더: 종목코드, 종목명
-    mapping: Dict[str, str] = {}
 
-    for _, row in df.iterrows():
-        raw_ticker: str = str(row["종목코드"]).strip().upper()  # 예: '069730.KS'
-        name: str = str(row["종목명"]).strip()
+# ──────────────────────────────────────────────────────────
+#  1. 원본 CSV
+# ──────────────────────────────────────────────────────────
+def content_hash() -> str:
+    """유니버스 CSV 내용 → sha256 hex"""
+    h = hashlib.sha256(f"universe-v{_FORMAT}".encode())
+    for fp in (*_LISTINGS, ALIAS_CSV):
+        h.update(fp.name.encode())
+        if fp.exists():
+            h.update(fp.read_bytes())
+    return h.hexdigest()
 
-        # 종목명이 중복될 경우 뒤에 (티커 앞 6자리)로 구분
-        if name in mapping:
-            code_part = raw_ticker.split(".")[0]  # '069730'
-            name = f"{name}({code_part})"
+def _parse_listing(path: Path) -> Tuple[List[str], List[str]]:
+    """CSV → (종목명 목록, 티커 목록)"""
+    import pandas as pd
 
-        mapping[name] = raw_ticker
+    df = pd.read_csv(path, sep=",", encoding="utf-8-sig", dtype=str)  # 헤더: 종목코드, 종목명
+    tickers = df["종목코드"].astype(str).str.strip().str.upper()      # 예: '069730.KS'
+    names = df["종목명"].astype(str).str.strip()
 
-    return mapping
+    # 종목명이 중복될 경우 뒤에 (티커 앞 6자리)로 구분
+    code_part = tickers.str.split(".").str[0]
+    names = names.where(~names.duplicated(), names + "(" + code_part + ")")
+    return names.tolist(), tickers.tolist()
 
-@lru_cache(maxsize=1)
-def _load_alias_csv(path=ALIAS_CSV) -> Dict[str, str]:
+def _parse_alias(path: Path = ALIAS_CSV) -> Dict[str, str]:
     """alias_tickers.csv → {별칭: '티커.확장자'}"""
     if not path.exists():
         return {}
-    df = pd.read_csv(path, encoding="utf-8-sig")
-    return {
-        str(a).strip(): str(t).strip().upper()
-        for a, t in zip(df["alias"], df["ticker"])
-        if a and t
-    }
+    import pandas as pd
 
-# ----------- 공개 API -----------
-KOSPI_MAP:  Dict[str, str] = _load_csv(KOSPI_CSV)
-KOSDAQ_MAP: Dict[str, str] = _load_csv(KOSDAQ_CSV)
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=str).dropna(subset=["alias", "ticker"])
+    return dict(zip(df["alias"].str.strip(), df["ticker"].str.strip().str.upper()))
 
-KOSPI_TICKERS:  List[str] = list(KOSPI_MAP.values())
-KOSDAQ_TICKERS: List[str] = list(KOSDAQ_MAP.values())
+def _from_csv() -> _Rows:
+    names: List[str] = []
+    tickers: List[str] = []
+    market: List[int] = []
+    for code, fp in enumerate(_LISTINGS):
+        n, t = _parse_listing(fp)
+        names += n
+        tickers += t
+        market += [code] * len(n)
+    return _Rows(names, tickers, market, _parse_alias())
 
-GLOBAL_TICKERS: List[str] = KOSPI_TICKERS + KOSDAQ_TICKERS
-NAME_BY_TICKER: Dict[str, str] = {v: k for k, v in {**KOSPI_MAP, **KOSDAQ_MAP}.items()}
+
+# ──────────────────────────────────────────────────────────
+#  2. 컴파일 아티팩트
+# ──────────────────────────────────────────────────────────
+def build(out: Path = UNIVERSE_NPZ) -> Path:
+    """CSV → 컴파일 아티팩트 저장 (임시 파일 → 교체)"""
+    rows = _from_csv()
+    all_tickers = np.array(rows.tickers + list(rows.alias.values()), dtype=str)
+    uniq, tid = np.unique(all_tickers, return_inverse=True)
+    n = len(rows.names)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            version=np.int32(_FORMAT),
+            hash=np.array(content_hash()),
+            tickers=uniq,
+            names=np.array(rows.names, dtype=str),
+            tid=tid[:n].astype(np.int32),
+            market=np.array(rows.market, dtype=np.int8),
+            alias=np.array(list(rows.alias), dtype=str),
+            alias_tid=tid[n:].astype(np.int32),
+        )
+    os.replace(tmp, out)                       # 같은 파일시스템 → 원자적 교체
+    return out
+
+def _from_artifact(expected_hash: str, path: Path = UNIVERSE_NPZ) -> _Rows | None:
+    """해시가 맞으면 _Rows, 없거나 낡았으면 None"""
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != _FORMAT or str(z["hash"]) != expected_hash:
+                return None
+            tickers = z["tickers"].tolist()
+            return _Rows(
+                names=z["names"].tolist(),
+                tickers=[tickers[i] for i in z["tid"].tolist()],
+                market=z["market"].tolist(),
+                alias=dict(zip(z["alias"].tolist(), (tickers[i] for i in z["alias_tid"].tolist()))),
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# ──────────────────────────────────────────────────────────
+#  3. 공개 API (스냅샷 접근자 – reload 시 참조 교체)
+# ──────────────────────────────────────────────────────────
+class Universe(NamedTuple):
+    kospi_map:        Dict[str, str]     # {종목명: 티커}
+    kosdaq_map:       Dict[str, str]
+    alias_map:        Dict[str, str]     # {별칭: 티커}
+    name_map:         Dict[str, str]     # KOSPI + KOSDAQ + 별칭 (정적 종목 사전)
+    kospi_tickers:    Tuple[str, ...]
+    kosdaq_tickers:   Tuple[str, ...]
+    global_tickers:   Tuple[str, ...]    # KOSPI + KOSDAQ
+    name_by_ticker:   Dict[str, str]
+    market_by_ticker: Dict[str, str]     # {티커: 'KOSPI' | 'KOSDAQ'}
 
 INDEX_TICKERS = [
     "^KS11",   # KOSPI Composite
@@ -57,4 +162,90 @@ INDEX_TICKERS = [
     "^KQ100",  # KOSDAQ 100
 ]
 
-ALL_TICKERS = GLOBAL_TICKERS + INDEX_TICKERS
\ No newline at end of file
+_current = Universe({}, {}, {}, {}, (), (), (), {}, {})
+
+def current() -> Universe:
+    """현재 스냅샷 (여러 사전을 함께 쓸 때 한 번만 불러 일관된 상태로 사용)"""
+    return _current
+
+def tickers(market: str | None = None) -> List[str]:
+    """시장별 티커 목록 (KOSPI · KOSDAQ, 그 외 → 전체) – 호출마다 새 list"""
+    u = _current
+    return list(
+        u.kospi_tickers  if market == "KOSPI"  else
+        u.kosdaq_tickers if market == "KOSDAQ" else
+        u.global_tickers
+    )
+
+def all_tickers() -> List[str]:
+    """KOSPI + KOSDAQ 전체 티커 (호출 시점 기준)"""
+    return list(_current.global_tickers)
+
+def name_of(ticker: str) -> str:
+    """티커 → 종목명 (모르면 티커 그대로)"""
+    return _current.name_by_ticker.get(ticker, ticker)
+
+
+# ──────────────────────────────────────────────────────────
+#  4. 핫 리로드
+# ──────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_listeners: List[Callable[[], None]] = []
+_state = {"hash": None, "sig": None, "source": None}
+
+def _signature() -> Tuple[int, ...]:
+    return tuple(fp.stat().st_mtime_ns if fp.exists() else 0
+                 for fp in (*_LISTINGS, ALIAS_CSV, UNIVERSE_NPZ))
+
+def _build(rows: _Rows) -> Universe:
+    maps: Tuple[Dict[str, str], ...] = ({}, {})
+    for name, ticker, code in zip(rows.names, rows.tickers, rows.market):
+        maps[code][name] = sys.intern(ticker)
+    kospi, kosdaq = maps
+    alias = {a: sys.intern(t) for a, t in rows.alias.items()}
+    listed = {**kospi, **kosdaq}
+    return Universe(
+        kospi_map=kospi,
+        kosdaq_map=kosdaq,
+        alias_map=alias,
+        name_map={**listed, **alias},
+        kospi_tickers=tuple(kospi.values()),
+        kosdaq_tickers=tuple(kosdaq.values()),
+        global_tickers=tuple(kospi.values()) + tuple(kosdaq.values()),
+        name_by_ticker={v: k for k, v in listed.items()},
+        market_by_ticker={t: _MARKETS[code] for code, m in enumerate(maps) for t in m.values()},
+    )
+
+def on_reload(fn: Callable[[], None]) -> Callable[[], None]:
+    """유니버스가 바뀌었을 때 호출할 콜백 등록 (파생 캐시 비우기용)"""
+    _listeners.append(fn)
+    return fn
+
+def reload() -> bool:
+    """CSV/아티팩트 다시 읽기. 내용이 바뀌었으면 스냅샷 교체 + 콜백 호출 후 True"""
+    global _current
+    with _lock:
+        sig, digest = _signature(), content_hash()
+        _state["sig"] = sig
+        if digest == _state["hash"]:
+            return False
+        rows = _from_artifact(digest)
+        _state["source"] = "artifact" if rows is not None else "csv"
+        _current = _build(rows if rows is not None else _from_csv())   # 새 스냅샷으로 참조 교체
+        _state["hash"] = digest
+    for fn in list(_listeners):
+        fn()
+    return True
+
+def maybe_reload() -> bool:
+    """CSV/아티팩트 mtime 이 바뀌었을 때만 reload()"""
+    if _signature() == _state["sig"]:
+        return False
+    return reload()
+
+def source() -> str | None:
+    """마지막 로드 출처 ('artifact' | 'csv')"""
+    return _state["source"]
+
+
+reload()
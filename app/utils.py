@@ -2,13 +2,10 @@
 import datetime as dt
 import pandas as pd
 from typing import List, Dict, Tuple
+from functools import lru_cache
 from pandas import isna
 from pandas.tseries.offsets import BDay
-import pandas_market_calendars as mcal
-from app.universe import (
-    KOSPI_TICKERS, KOSDAQ_TICKERS, GLOBAL_TICKERS,
-    NAME_BY_TICKER, KOSPI_MAP, KOSDAQ_MAP,
-)
+from app import universe
 from app.data_fetcher import get_price_on_date
 
 _LOOKBACK_DAYS = 7   
@@ -24,11 +21,7 @@ def _is_zero_volume(sub_df: pd.DataFrame, idx: int = -1) -> bool:
     )
 
 def _universe(market: str|None) -> List[str]:
-    return (
-        KOSPI_TICKERS  if market == "KOSPI"  else
-        KOSDAQ_TICKERS if market == "KOSDAQ" else
-        GLOBAL_TICKERS
-    )
+    return universe.tickers(market)
 
 def _find_prev_close(
     ticker: str, date: str, *, max_back: int = _LOOKBACK_DAYS
@@ -70,8 +63,11 @@ def fmt_price(val: float, is_pct: bool = False) -> str:
 
 
 # ── 휴장일 캘린더 ────────────────────────────────────────────────
-_XKRX_CAL = mcal.get_calendar("XKRX")     # 한국거래소(KRX) 영업일 달력
-_BDAY = pd.tseries.offsets.CustomBusinessDay(calendar=_XKRX_CAL)
+@lru_cache(maxsize=1)
+def _xkrx_cal():
+    """한국거래소(KRX) 영업일 달력 (첫 사용 시 로드)"""
+    import pandas_market_calendars as mcal
+    return mcal.get_calendar("XKRX")
 
 # 휴장일 메세지
 def _holiday_msg(date: str) -> str | None:
@@ -82,7 +78,7 @@ def _holiday_msg(date: str) -> str | None:
     if date == None:
         return None
     ts = pd.Timestamp(date)
-    if _XKRX_CAL.schedule(start_date=ts, end_date=ts).empty:
+    if _xkrx_cal().schedule(start_date=ts, end_date=ts).empty:
         return f"{date}는 휴장일입니다. 데이터가 없습니다."
     return None
 
@@ -90,7 +86,7 @@ def _holiday_msg(date: str) -> str | None:
 def _prev_bday(date: str, lookback_days: int = 20) -> str:
     ts = pd.Timestamp(date)
     start = ts - pd.Timedelta(days=lookback_days)
-    sched = _XKRX_CAL.schedule(start_date=start, end_date=ts)
+    sched = _xkrx_cal().schedule(start_date=start, end_date=ts)
     days = sched.index
     if days.empty:
         raise ValueError(f"No trading days found in window up to {date}")
@@ -115,7 +111,7 @@ def _nth_prev_bday(date: str, n: int) -> str:
     lookback_days = int(n * 2 + 10)  # n일 확보를 위한 여유 기간
 
     start = ts - pd.Timedelta(days=lookback_days)
-    sched = _XKRX_CAL.schedule(start_date=start, end_date=ts)
+    sched = _xkrx_cal().schedule(start_date=start, end_date=ts)
     days = sched.index
 
     if days.empty or len(days) <= n:
@@ -0,0 +1,129 @@
+# app/warmup.py
+"""
+서버 시작 시 백그라운드 워밍업
+
+단계 (순서대로 실행)
+────────
+  universe     : 컴파일 유니버스(npz) 또는 KOSPI/KOSDAQ/alias CSV → 종목 사전
+  calendar     : XKRX 거래일 캘린더 (첫 schedule 계산 포함)
+  embed_model  : Sentence-BERT 로드 + 더미 인코딩 1회
+  embed_index  : 종목명 Faiss 인덱스 (디스크 mmap 또는 재빌드)
+  intent       : 로컬 task 분류기 학습 + 프롬프트 예시 색인
+  purge        : 만료된 별칭 캐시 · 파싱 캐시 항목 삭제
+
+• 단계별 상태(pending/running/ok/error)와 소요 시간을 기록한다.
+• 모든 단계가 끝나고 핵심 단계(CRITICAL)가 전부 ok 여야 ready → main.py 의 /ready 가 200.
+  핵심 단계가 실패하면 state="failed" · failed=[단계] 와 함께 503 (요청 경로가 매번 같은 로드를 다시 시도).
+  부가 단계(embed_model · purge) 실패는 기록만 하고 ready 를 막지 않는다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────────────────
+#  1. 워밍업 단계
+# ──────────────────────────────────────────────────────────
+def _universe() -> None:
+    from app import universe
+    universe.maybe_reload()
+
+def _calendar() -> None:
+    from app.utils import _nth_prev_bday
+    _nth_prev_bday(time.strftime("%Y-%m-%d"), 1)
+
+def _embed_model() -> None:
+    from app.ticker_lookup import _get_model
+    model = _get_model()
+    if model is not None:
+        model.encode(["삼성전자"], normalize_embeddings=True)
+
+def _embed_index() -> None:
+    from app.ticker_lookup import _init_embed_index
+    _init_embed_index()
+
+def _intent() -> None:
+    from app import intent
+    from app.llm_bridge import SYSTEM_PROMPT
+    intent.warmup(SYSTEM_PROMPT)
+
+def _purge() -> None:
+    from app import alias_cache, parse_cache
+    alias_cache.purge()
+    parse_cache.purge()
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("universe",    _universe),
+    ("calendar",    _calendar),
+    ("embed_model", _embed_model),
+    ("embed_index", _embed_index),
+    ("intent",      _intent),
+    ("purge",       _purge),
+]
+CRITICAL = {"universe", "calendar", "embed_index", "intent"}     # 요청 경로가 바로 쓰는 단계
+
+
+# ──────────────────────────────────────────────────────────
+#  2. 상태
+# ──────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_status: Dict[str, dict] = {name: {"state": "pending"} for name, _ in STEPS}
+_thread: threading.Thread | None = None
+
+def _set(name: str, **kw) -> None:
+    with _lock:
+        _status[name] = kw
+
+def run() -> None:
+    """모든 단계를 현재 스레드에서 순서대로 실행"""
+    for name, fn in STEPS:
+        _set(name, state="running")
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            _set(name, state="error", seconds=round(time.perf_counter() - t0, 3), error=repr(e))
+            logger.warning("[warmup] %s 실패: %r", name, e)
+        else:
+            _set(name, state="ok", seconds=round(time.perf_counter() - t0, 3))
+            logger.info("[warmup] %s %.3fs", name, _status[name]["seconds"])
+
+def start() -> threading.Thread:
+    """백그라운드 워밍업 시작 (중복 호출 시 기존 스레드 반환)"""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run, name="warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+def _state(steps: Dict[str, dict]) -> Tuple[str, List[str]]:
+    """전체 상태 (starting / ready / failed) + 실패한 핵심 단계"""
+    failed = [name for name in steps if name in CRITICAL and steps[name]["state"] == "error"]
+    if failed:
+        return "failed", failed
+    if all(s["state"] in ("ok", "error") for s in steps.values()):
+        return "ready", []
+    return "starting", []
+
+def is_ready() -> bool:
+    with _lock:
+        steps = {name: dict(s) for name, s in _status.items()}
+    return _state(steps)[0] == "ready"
+
+def status() -> dict:
+    with _lock:
+        steps = {name: dict(s) for name, s in _status.items()}
+    state, failed = _state(steps)
+    return {
+        "ready": state == "ready",
+        "state": state,
+        "failed": failed,
+        "steps": steps,
+        "total_seconds": round(sum(s.get("seconds", 0.0) for s in steps.values()), 3),
+    }
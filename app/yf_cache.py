@@ -1,25 +1,15 @@
 # app/yf_cache.py
-import yfinance as yf
 from pathlib import Path
+import logging
 import pandas as pd
 import time, random
 from typing import List, Tuple, Dict, Set
+from functools import lru_cache
 from config import CACHE_DIR
-from yfinance import Ticker
+from app.yf_lazy import yf, errors as yf_errors    # yfinance 는 원격 호출 시에만 import
+from app import singleflight
 
-try:                    # 0.2.28+  (공식 위치)
-    from yfinance.exceptions import (
-        YFRateLimitError, YFTzMissingError, YFPricesMissingError,
-    )
-except ImportError:     # 0.2.17 ~ 0.2.27
-    try:
-        from yfinance.shared import (
-            YFRateLimitError, YFTzMissingError, YFPricesMissingError,
-        )
-    except ImportError: # 0.2.16 이하
-        from yfinance.shared._utils import (
-            YFRateLimitError, YFTzMissingError, YFPricesMissingError,
-        )
+logger = logging.getLogger(__name__)
 
 # ────────────────────────────────────────────────────────────────
 # 1) 기본 유틸
@@ -31,15 +21,59 @@ def _next_day(date: str) -> str:
 def _path(ticker: str) -> Path:
     return CACHE_DIR / f"{ticker}.parquet"
 
-def load(ticker: str, start: str, end: str, *, strict: bool = False) -> pd.DataFrame | None:
+_VERSION_FILE = CACHE_DIR / ".data_version"
+
+def data_version() -> int:
+    """가격 캐시 데이터 버전 (ingest 때마다 touch 되는 마커 파일의 mtime, 없으면 0)"""
+    try:
+        return _VERSION_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def _bump_version() -> None:
+    _VERSION_FILE.touch()
+
+@lru_cache(maxsize=8_192)
+@singleflight.coalesce                     # 프리패치와 요청이 같은 파일을 동시에 읽지 않도록
+def _read(ticker: str, mtime_ns: int, columns: Tuple[str, ...] | None) -> pd.DataFrame:
+    """parquet 읽기 (파일 mtime 이 바뀌면 키가 달라져 다시 읽음) – 반환 DF 는 수정 금지"""
+    return pd.read_parquet(_path(ticker), columns=list(columns) if columns else None)
+
+_full: Dict[str, int] = {}          # 전체 필드로 읽어 둔 티커 → 그때 파일 mtime
+
+def _frame(ticker: str, mtime_ns: int, columns: Tuple[str, ...] | None) -> pd.DataFrame:
+    """
+    _read 키 정규화 – 전체 필드 프레임이 이미 올라와 있으면 필드 한정 조회도 그 부분집합으로 답하고,
+    아니면 필드 집합(정렬 · 중복 제거) 하나당 키 하나로 읽는다. 반환 컬럼 순서는 요청 순서.
+    """
+    if columns is None or _full.get(ticker) == mtime_ns:
+        df = _read(ticker, mtime_ns, None)
+        _full[ticker] = mtime_ns
+        return df if columns is None else df[list(columns)]
+    return _read(ticker, mtime_ns, tuple(sorted(set(columns))))[list(columns)]
+
+def prefetch(tickers: List[str]) -> None:
+    """가격 캐시를 전체 필드로 미리 읽어 _read LRU 에 올려 둔다 (질문 처리와 병렬 – 필드 한정 조회도 적중)"""
+    for t in tickers:
+        try:
+            _frame(t, _path(t).stat().st_mtime_ns, None)
+        except Exception:
+            pass
+
+def load(
+    ticker: str, start: str, end: str, *, strict: bool = False, columns: List[str] | None = None,
+) -> pd.DataFrame | None:
     """
     strict=True  → start~end 모든 영업일이 캐시에 있어야만 DataFrame 반환 (프리패치용)
     strict=False → 일부만 있어도 slice 반환
+    columns      → 지정한 필드만 읽음 (parquet 컬럼 단위 로드)
     """
     fp = _path(ticker)
-    if not fp.exists():
+    try:
+        mtime = fp.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
-    df = pd.read_parquet(fp)
+    df = _frame(ticker, mtime, tuple(columns) if columns else None)
     if strict:
         need = pd.date_range(start, end, freq="B")
         if not set(need).issubset(df.index):
@@ -63,6 +97,14 @@ def save_or_append(ticker: str, df_new: pd.DataFrame, *, write_cache: bool = Fal
     combined = combined[~combined.index.duplicated(keep="last")]
     combined.sort_index(inplace=True)
     combined.to_parquet(fp)
+    _bump_version()     # 스크리너 결과 캐시 무효화
+
+    # 이벤트 스토어 갱신 (실패해도 조회 시 자가 복구되므로 기록만 남김)
+    try:
+        from app import event_store
+        event_store.refresh(ticker, combined)
+    except Exception:
+        logger.exception("event_store.refresh failed for %s", ticker)
 
 def assure(
     tickers: Tuple[str, ...] | List[str],
@@ -92,7 +134,7 @@ def assure(
             batch = todo[i:i+chunk]
 
             # ① 1차 배치-다운로드 (keep_errors 없음)
-            df = yf.download(
+            df = yf().download(
                 batch, start=start, end=end_excl,
                 interval="1d", group_by="ticker",
                 progress=False, threads=True, auto_adjust=False,
@@ -109,17 +151,17 @@ def assure(
             # ③ 누락 티커를 단건으로 재확인
             for t in missing:
                 try:
-                    sub = Ticker(t).history(
+                    sub = yf().Ticker(t).history(
                         start=start, end=end_excl,
                         interval="1d", auto_adjust=False,
                         raise_errors=True,        # history()는 지원
                     )
-                except YFRateLimitError as e:
+                except yf_errors().RateLimit as e:
                     rate_limited.add(t)
                     error_log[t] = str(e)
                     next_round.append(t)
                     continue
-                except (YFPricesMissingError, YFTzMissingError) as e:
+                except (yf_errors().PricesMissing, yf_errors().TzMissing) as e:
                     permanent_fail.append(t)
                     error_log[t] = str(e)
                     continue
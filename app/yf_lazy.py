@@ -0,0 +1,43 @@
+# app/yf_lazy.py
+"""
+yfinance 지연 import
+
+프리패치 구간 질문은 로컬 parquet 만으로 답하므로 yfinance(+requests/curl_cffi/bs4)를
+import 할 필요가 없다. 실제로 원격 호출이 필요한 시점에만 yf() 로 불러온다.
+
+예외 클래스는 except 절에서 `except errors().RateLimit:` 처럼 쓴다.
+(except 식은 예외가 났을 때만 평가되므로 정상 경로에서는 import 가 일어나지 않는다)
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from types import SimpleNamespace
+
+
+@lru_cache(maxsize=1)
+def yf():
+    import yfinance
+    return yfinance
+
+
+@lru_cache(maxsize=1)
+def errors() -> SimpleNamespace:
+    """yfinance 버전별 위치가 다른 예외 클래스 모음"""
+    try:                    # 0.2.28+  (공식 위치)
+        from yfinance.exceptions import (
+            YFRateLimitError, YFTzMissingError, YFPricesMissingError,
+        )
+    except ImportError:     # 0.2.17 ~ 0.2.27
+        try:
+            from yfinance.shared import (
+                YFRateLimitError, YFTzMissingError, YFPricesMissingError,
+            )
+        except ImportError: # 0.2.16 이하
+            from yfinance.shared._utils import (
+                YFRateLimitError, YFTzMissingError, YFPricesMissingError,
+            )
+    return SimpleNamespace(
+        RateLimit=YFRateLimitError,
+        TzMissing=YFTzMissingError,
+        PricesMissing=YFPricesMissingError,
+    )
@@ -1,4 +1,5 @@
 # config.py
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -8,11 +9,62 @@ INFO_DIR = DATA_DIR / "info_cache"
 KOSPI_CSV  = DATA_DIR / "kospi_tickers.csv"
 KOSDAQ_CSV = DATA_DIR / "kosdaq_tickers.csv"
 ALIAS_CSV = DATA_DIR / "alias_tickers.csv"
+UNIVERSE_NPZ = DATA_DIR / "universe.npz"   # ⇦ scripts/build_universe.py 로 만든 컴파일 유니버스
 
 # ─────────────  티커 디스앰비규에이션  ─────────────
 TOP_K_FUZZY       = 3          # fuzzy 로 뽑을 후보 수
 TOP_K_EMBED       = 3          # 임베딩으로 뽑을 후보 수
 HCX_CONF_THRESHOLD = 0.82      # hcx confidence ≥ 0.82 → 확정
+FUZZY_SHORTLIST   = 50         # 자모 n-gram 역색인으로 남길 fuzzy 채점 후보 수
+FUZZY_AUTO_ACCEPT = True       # 아래 기준을 넘는 fuzzy 1위를 HCX 없이 확정 (별칭 캐시에는 안 씀)
+FUZZY_ACCEPT_SCORE = 90        # 자모 QRatio ≥ 90 이고
+FUZZY_ACCEPT_MARGIN = 5        #   2위와 5점 이상 차이 → HCX 없이 확정
+ALIAS_DB          = DATA_DIR / "alias_cache.sqlite3"   # 별칭 → 티커 해석 캐시
+ALIAS_TTL_DAYS    = 30         # 마지막 적중 후 30일 지나면 만료
+ALIAS_PROMOTE_HITS = 5         # 적중 5회 이상 → 시작 시 정적 사전으로 승격
+ALIAS_HIT_FLUSH_S = 300        # 적중 기록(hits · 만료 연장)을 모아서 쓰는 주기
+EMBED_MODEL       = "jhgan/ko-sbert-sts"
+EMBED_DIR         = DATA_DIR / "embed_index"   # 이름 임베딩 · Faiss 인덱스 (CSV 해시로 갱신)
+EMBED_INDEX_TYPE  = "flat"     # flat | hnsw | hnsw_sq | ivf_sq | ivfpq  (scripts/bench_embed_index.py 로 비교)
+EMBED_HNSW_M      = 32         # HNSW 이웃 수
+EMBED_EF_SEARCH   = 64         # HNSW 검색 폭
+EMBED_NPROBE      = 16         # IVF 탐색 클러스터 수
+
+# ─────────────  질문 파싱 캐시  ─────────────
+PARSE_DB           = DATA_DIR / "parse_cache.sqlite3"   # 정규화 질문 템플릿 → HCX 파싱 결과 (워커 공유)
+PARSE_TTL_DAYS     = 30        # 마지막 적중 후 30일 지나면 만료
+PARSE_HIT_FLUSH_S  = 300       # 적중 기록(hits · 만료 연장)을 모아서 쓰는 주기
+FAST_PARSE_ENABLED = True      # 정형 질문은 규칙 기반 파서(app/fast_parser)로 HCX 생략
+INTENT_PROMPT_ENABLED = True   # 로컬 task 분류(app/intent) → task 전용 짧은 프롬프트
+INTENT_MIN_PROB    = 0.90      # 분류 사후확률이 이보다 낮으면 전체 프롬프트
+INTENT_NEIGHBOURS  = 8         # 짧은 프롬프트에 더할 다른 task 의 유사 예시 수
+
+# ─────────────  이벤트 스토어  ─────────────
+EVENT_DIR          = DATA_DIR / "event_cache"   # 티커별 이벤트 parquet
+EVENT_PEAK_DAYS    = 260       # 52주 신고가/신저가 기준 거래일 수
+EVENT_GAP_PCT      = 3.0       # |갭| ≥ 3% → gap_up / gap_down
+EVENT_SPIKE_WINDOW = 20        # 거래량 급증 기준 평균 기간
+EVENT_SPIKE_PCT    = 100.0     # 평균 대비 +100% 이상 → volume_spike
+
+# ─────────────  종목검색 (스크리너)  ─────────────
+SCREEN_CACHE_SIZE  = 256       # (조건, 데이터 버전)별 결과 LRU 크기
+SCREEN_WORKERS     = min(4, os.cpu_count() or 1)   # 샤드 병렬 프로세스 수 (1 → 병렬 끔)
+SCREEN_PARALLEL_MIN = 800      # 이 티커 수 이상일 때만 병렬 실행
+
+# ─────────────  요청 실행 (스테이지별 동시성)  ─────────────
+EXEC_LLM_CONCURRENCY = 16      # 워커당 동시에 대기할 HCX 요청 수
+EXEC_DATA_WORKERS  = 8         # 파싱 이후 단계(parquet 읽기 · pandas 계산 · 핸들러) 스레드 수
+EXEC_MAX_QUEUE     = 64        # 스테이지별 대기열 상한 (넘으면 503)
+
+# ─────────────  HCX 호출 정책 (지연 예산 · 헤지 · 회로 차단)  ─────────────
+LLM_TIMEOUT_S      = 10        # HCX 요청 1회 상한 (예산이 더 적게 남으면 그만큼만)
+LLM_PARSE_BUDGET_S = 25        # 질문 파싱 1건 전체 예산 (재시도 · 헤지 포함, 1회 상한의 2배 이상이어야 재시도 가능)
+LLM_AUX_BUDGET_S   = 10        # 슬롯 보충 · 종목 판별 등 보조 호출 예산 (재시도 없음)
+LLM_HEDGE_ENABLED  = True      # p95 를 넘기면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+LLM_HEDGE_MIN_MS   = 800       # 헤지 대기 하한 (p95 가 이보다 짧아도 이만큼은 기다림)
+LLM_HEDGE_MAX_RATIO = 0.10     # 전체 호출 대비 헤지 비율 상한 (토큰 비용 제한)
+LLM_BREAKER_FAILS  = 5         # 연속 실패 N회 → 회로 열림 (HCX 건너뛰고 로컬 파서만)
+LLM_BREAKER_COOLDOWN_S = 30    # 열린 뒤 이 시간이 지나면 시험 호출 1건 허용
 
 # ─────────────  공용 예외  ─────────────
 class AmbiguousTickerError(Exception):
@@ -1,10 +1,39 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from app.router import route
+from app.router import aroute
 from app.session import new_id, clear
+from app import warmup, llm_bridge, llm_policy, executor, singleflight, parallel_screen
 
 app = FastAPI()
 
+@app.on_event("startup")
+async def _start_warmup():
+    # 모델·인덱스·캘린더를 백그라운드에서 미리 로드 (준비 상태는 /ready)
+    warmup.start()
+
+@app.on_event("shutdown")
+async def _close_clients():
+    await llm_bridge.aclose()
+    executor.shutdown()
+    llm_policy.shutdown()             # 동기 HCX 헤지 스레드 풀
+    parallel_screen.shutdown()        # 스크리닝 워커 프로세스 · 공유 메모리 정리
+
+@app.get("/ready")
+async def ready():
+    # starting(워밍업 중) · failed(핵심 단계 실패, failed 에 단계명) → 503, ready → 200
+    st = warmup.status()
+    return JSONResponse(content=st, status_code=200 if st["ready"] else 503)
+
+@app.get("/stats")
+async def stats():
+    # 스테이지별 실행 중 · 대기열 깊이 · 평균 대기/실행 시간 + single-flight 합치기 건수
+    # + HCX 지연 분위수 · 헤지 · 회로 상태
+    return JSONResponse(content={
+        **executor.stats(),
+        "singleflight": singleflight.stats(),
+        "llm": llm_policy.stats(),
+    })
+
 @app.get("/agent")
 async def handle_agent(request: Request):
     question = request.query_params.get("question", "").strip()
@@ -21,7 +50,10 @@ async def handle_agent(request: Request):
         return JSONResponse(content={"answer": "질문이 비어 있습니다."}, status_code=400)
 
     # 질문 처리
-    answer = route(question, cid, api_key)
+    try:
+        answer = await aroute(question, cid, api_key)  # HCX 대기 중에도 다른 요청 처리
+    except executor.Overloaded:
+        return JSONResponse(content={"answer": "요청이 많아 잠시 후 다시 시도해 주세요."}, status_code=503)
 
     # 로그 출력
     print(f"[질문] {question}")
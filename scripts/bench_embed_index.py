@@ -0,0 +1,64 @@
+# scripts/bench_embed_index.py
+"""
+임베딩 인덱스 종류별 recall / 지연 / 메모리 비교 (flat 기준)
+
+• 색인 벡터 : data/embed_index/vectors.npy (없으면 build_embed_index 먼저 실행)
+• --scale N : 원본 벡터에 작은 잡음을 섞어 N 배로 부풀림 (ETF·해외·영문명 추가 상황 가정)
+• 질의     : 색인 벡터 일부에 잡음을 더한 것 (오타·별칭 입력 가정)
+• 정답     : flat(전수 탐색) top-k
+
+    python -m scripts.bench_embed_index [--scale 10] [--queries 500] [--k 3]
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from app import embed_index
+
+KINDS = ("flat", "hnsw", "hnsw_sq", "ivf_sq", "ivfpq")
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype("float32")
+
+
+def _jitter(x: np.ndarray, sigma: float, rng: np.random.Generator) -> np.ndarray:
+    return _normalize(x + rng.normal(0, sigma, x.shape).astype("float32"))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--scale", type=int, default=1)
+    p.add_argument("--queries", type=int, default=500)
+    p.add_argument("--k", type=int, default=3)
+    p.add_argument("--noise", type=float, default=0.02)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = np.asarray(embed_index.load_vectors(), dtype="float32")
+    xb = np.concatenate([base] + [_jitter(base, args.noise, rng) for _ in range(args.scale - 1)])
+    xq = _jitter(xb[rng.choice(len(xb), args.queries, replace=False)], args.noise, rng)
+    print(f"vectors={len(xb):,} dim={xb.shape[1]} queries={len(xq)} k={args.k}")
+
+    truth = None
+    print(f"{'kind':<8} {'build(s)':>9} {'size(MB)':>9} {'recall@k':>9} {'p50(us)':>9} {'p95(us)':>9}")
+    for kind in KINDS:
+        t0 = time.perf_counter()
+        index = embed_index.make_index(xb, kind)
+        build_s = time.perf_counter() - t0
+        size_mb = faiss.serialize_index(index).nbytes / 1e6
+
+        lat, found = [], []
+        for q in xq:                                   # 실제 사용처처럼 질의 1건씩
+            t0 = time.perf_counter()
+            _, I = index.search(q[None, :], args.k)
+            lat.append((time.perf_counter() - t0) * 1e6)
+            found.append(I[0])
+        found = np.asarray(found)
+        if truth is None:                              # KINDS[0] == flat
+            truth = found
+        recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(found, truth)])
+        print(f"{kind:<8} {build_s:>9.2f} {size_mb:>9.1f} {recall:>9.3f} "
+              f"{np.percentile(lat, 50):>9.0f} {np.percentile(lat, 95):>9.0f}")
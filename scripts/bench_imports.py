@@ -0,0 +1,63 @@
+# scripts/bench_imports.py
+"""
+모듈 import 비용 리포트 (python -X importtime 파싱)
+
+• 새 인터프리터에서 대상 모듈을 import 하며 모듈별 self / cumulative 시간을 수집
+• 최상위 패키지 단위로 묶어 누적 비용 상위 N 개와 전체 wall time 출력
+
+    python -m scripts.bench_imports [--module main] [--top 20] [--repeat 3]
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _profile(module: str):
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        sys.exit(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if (m := _LINE.match(line)):
+            self_us, cum_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cum_us), len(indent) // 2))
+    return wall, rows
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--module", default="main")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    walls = []
+    for _ in range(args.repeat):
+        wall, rows = _profile(args.module)
+        walls.append(wall)
+
+    # 최상위 패키지별 self 시간 합계 (= 그 패키지가 실제로 차지한 비용)
+    by_pkg = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_pkg[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: wall {min(walls):.2f}s (best of {args.repeat}), "
+          f"{len(rows)} modules")
+    print(f"\n{'package':<32} {'self(ms)':>10}")
+    for pkg, us in sorted(by_pkg.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"{pkg:<32} {us / 1000:>10.1f}")
+
+    print(f"\n{'module (app.*)':<32} {'cumulative(ms)':>15}")
+    for name, _, cum, _ in sorted((r for r in rows if r[0].startswith("app")), key=lambda r: -r[2])[:args.top]:
+        print(f"{name:<32} {cum / 1000:>15.1f}")
@@ -0,0 +1,23 @@
+# scripts/build_embed_index.py
+"""
+종목명 임베딩 · Faiss 인덱스를 미리 만들어 data/embed_index 에 저장.
+(유니버스 CSV 가 바뀌지 않았으면 건너뜀, --force 로 강제 재빌드)
+
+    python -m scripts.build_embed_index [--force]
+"""
+import argparse
+import time
+
+from app import embed_index, ticker_lookup
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--force", action="store_true")
+    args = p.parse_args()
+
+    if not args.force and embed_index.load() is not None:
+        print(f"[embed_index] up to date ({embed_index.content_hash()[:12]})")
+    else:
+        t0 = time.perf_counter()
+        index, names = embed_index.build(ticker_lookup._EMBED_NAMES, ticker_lookup._get_model())   # 런타임 지연 빌드와 같은 이름 목록
+        print(f"[embed_index] {len(names)} names encoded in {time.perf_counter() - t0:.1f}s")
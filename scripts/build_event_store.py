@@ -0,0 +1,28 @@
+# scripts/build_event_store.py
+"""
+가격 캐시(data/yf_cache) 전체로 이벤트 스토어(data/event_cache)를 일괄 생성.
+(평소에는 ingest/조회 시 티커 단위로 갱신되므로, 최초 배포나 기준값 변경 시에만 실행)
+
+    python -m scripts.build_event_store [--only-stale]
+"""
+import argparse
+import time
+
+from app import event_store
+from config import CACHE_DIR
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--only-stale", action="store_true", help="없거나 오래된 티커만 다시 계산")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    built = 0
+    for fp in sorted(CACHE_DIR.glob("*.parquet")):
+        ticker = fp.stem
+        ev = event_store._path(ticker)
+        if args.only_stale and ev.exists() and ev.stat().st_mtime_ns >= fp.stat().st_mtime_ns:
+            continue
+        event_store.refresh(ticker)
+        built += 1
+    print(f"[event_store] {built} tickers built in {time.perf_counter() - t0:.1f}s")
@@ -0,0 +1,32 @@
+# scripts/build_universe.py
+"""
+KOSPI/KOSDAQ/alias CSV → 컴파일 유니버스 아티팩트 (data/universe.npz)
+(CSV 가 바뀌지 않았으면 건너뜀, --force 로 강제 재빌드)
+
+실행 중인 서버는 다음 요청에서 mtime 변화를 감지해 자동으로 다시 읽는다 (universe.maybe_reload).
+
+    python -m scripts.build_universe [--force]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app import universe
+from config import UNIVERSE_NPZ
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--force", action="store_true")
+    args = p.parse_args()
+
+    digest = universe.content_hash()
+    if not args.force and universe._from_artifact(digest) is not None:
+        print(f"[universe] up to date ({digest[:12]})")
+    else:
+        t0 = time.perf_counter()
+        out = universe.build()
+        with np.load(out) as z:
+            print(f"[universe] {len(z['names'])} names · {len(z['tickers'])} tickers · "
+                  f"{len(z['alias'])} aliases → {out.name} "
+                  f"({out.stat().st_size / 1e3:.0f} KB, {time.perf_counter() - t0:.2f}s, {digest[:12]})")
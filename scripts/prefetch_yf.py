@@ -1,7 +1,7 @@
 # scripts/prefetch_yf.py
 import argparse
 from pathlib import Path
-from app.universe import KOSPI_TICKERS, KOSDAQ_TICKERS, NAME_BY_TICKER, INDEX_TICKERS
+from app import universe
 from app.yf_cache import assure
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ if __name__ == "__main__":
     p.add_argument("--end", required=True)
     args = p.parse_args()
 
-    tickers = tuple(KOSPI_TICKERS + KOSDAQ_TICKERS + INDEX_TICKERS)
+    tickers = tuple(universe.all_tickers() + universe.INDEX_TICKERS)
     rate_limited = assure(tickers, args.start, args.end, write_cache=True)
 
     # ── 영구 실패 목록 기록 ──────────────────────────
@@ -22,7 +22,7 @@ if __name__ == "__main__":
     if rate_limited:
         err_map = getattr(assure, "error_log", {})
         lines = [
-            f"{t}\t{NAME_BY_TICKER.get(t, '')}\t{err_map.get(t, 'YFRateLimitError')}"
+            f"{t}\t{universe.current().name_by_ticker.get(t, '')}\t{err_map.get(t, 'YFRateLimitError')}"
             for t in rate_limited
         ]
         Path("remaining.txt").write_text("\n".join(lines))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+tests/replay_fast_parser.py
+tests/test_json/*.json 질문을 규칙 기반 파서(app/fast_parser)에 재생
+→ 파일별 · task별 처리 비율, 파서 지연(p50/p95), 생략된 HCX 시간 추정치 출력.
+
+--api-key 를 주면 처리된 질문을 실제 HCX 로도 파싱해 필드 일치율과 실측 HCX 지연을 함께 보여준다.
+(이때는 parse_cache · 메모리 캐시를 거치지 않도록 _hcx_call 을 직접 부른다)
+출력만 하는 측정 스크립트 – 파싱 결과 검증은 pytest 케이스(tests/unit_test/test_fast_parser.py)에서 한다.
+
+    python tests/replay_fast_parser.py [--hcx-ms 1500] [--api-key KEY] [--show-miss 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from app import fast_parser  # noqa: E402
+
+JSON_DIR = ROOT / "tests/test_json"
+FIELDS = ("task", "date", "date_from", "date_to", "market", "tickers", "metrics", "rank_n", "conditions")
+
+
+def _pct(xs: list[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+
+def _hcx_parse(question: str, api_key: str) -> tuple[dict, float]:
+    from app import llm_policy
+    from app.llm_bridge import _extract_messages, _hcx_call, _safe_json
+    from config import LLM_PARSE_BUDGET_S
+
+    t0 = time.perf_counter()
+    try:
+        ans = _hcx_call(_extract_messages(question), api_key=api_key,
+                        budget=llm_policy.Budget(LLM_PARSE_BUDGET_S)) or ""
+    except Exception:
+        ans = ""
+    return _safe_json(ans) or {}, time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hcx-ms", type=float, default=1500, help="HCX 파싱 1회 평균 지연 가정치 (ms)")
+    ap.add_argument("--api-key", default=None, help="주면 HCX 결과와 필드 일치율 비교")
+    ap.add_argument("--show-miss", type=int, default=0, help="처리하지 못한 질문 예시 개수")
+    args = ap.parse_args()
+
+    per_file: dict[str, list[int]] = {}
+    per_task: Counter = Counter()
+    lat_hit: list[float] = []
+    lat_miss: list[float] = []
+    hits: list[tuple[str, dict]] = []
+    misses: list[str] = []
+
+    for fp in sorted(JSON_DIR.glob("*.json")):
+        with open(fp, encoding="utf-8") as f:
+            items = json.load(f)
+        n_hit = 0
+        for item in items:
+            q = str(item["input_data"]["message"]).strip()
+            t0 = time.perf_counter()
+            out = fast_parser.parse(q)
+            dt = time.perf_counter() - t0
+            if out is None:
+                lat_miss.append(dt)
+                misses.append(q)
+                continue
+            lat_hit.append(dt)
+            n_hit += 1
+            per_task[out["task"]] += 1
+            hits.append((q, out))
+        per_file[fp.name] = [n_hit, len(items)]
+
+    total = sum(n for _, n in per_file.values())
+    handled = len(hits)
+
+    print("── 파일별 처리 비율 ──")
+    for name, (h, n) in per_file.items():
+        print(f"  {name:<28} {h:>4}/{n:<4} ({h / n:6.1%})")
+    print(f"  {'합계':<28} {handled:>4}/{total:<4} ({handled / total:6.1%})")
+
+    print("\n── task별 처리 건수 ──")
+    for task, n in per_task.most_common():
+        print(f"  {task:<10} {n}")
+
+    all_lat = lat_hit + lat_miss
+    print("\n── 파서 지연 ──")
+    print(f"  적중   p50 {_pct(lat_hit, .5) * 1e3:.3f} ms · p95 {_pct(lat_hit, .95) * 1e3:.3f} ms")
+    print(f"  미적중 p50 {_pct(lat_miss, .5) * 1e3:.3f} ms · p95 {_pct(lat_miss, .95) * 1e3:.3f} ms"
+          "  (HCX 앞에 붙는 추가 비용)")
+
+    hcx_ms = args.hcx_ms
+    if args.api_key:
+        agree: Counter = Counter()
+        hcx_lat: list[float] = []
+        for q, out in hits:
+            ref, sec = _hcx_parse(q, args.api_key)
+            hcx_lat.append(sec)
+            for k in FIELDS:
+                agree[k] += ref.get(k) == out.get(k)
+            agree["all"] += all(ref.get(k) == out.get(k) for k in FIELDS)
+        hcx_ms = statistics.mean(hcx_lat) * 1e3 if hcx_lat else hcx_ms
+        print("\n── HCX 대비 필드 일치율 ──")
+        for k in (*FIELDS, "all"):
+            print(f"  {k:<10} {agree[k] / max(handled, 1):6.1%}")
+        print(f"  HCX 실측 p50 {_pct(hcx_lat, .5) * 1e3:.0f} ms · p95 {_pct(hcx_lat, .95) * 1e3:.0f} ms")
+
+    saved = handled * hcx_ms / 1e3 - sum(all_lat)
+    print("\n── 절감 추정 ──")
+    print(f"  HCX 1회 {hcx_ms:.0f} ms 기준, {handled}건 생략 → 약 {saved:.1f} s 절감 "
+          f"(질문당 평균 {saved / total * 1e3:.0f} ms)")
+
+    if args.show_miss:
+        print("\n── 미처리 질문 예시 ──")
+        for q in list(dict.fromkeys(misses))[: args.show_miss]:
+            print(f"  {q}")
+
+
+if __name__ == "__main__":
+    main()
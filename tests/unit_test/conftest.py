@@ -0,0 +1,69 @@
+# tests/unit_test/conftest.py
+"""
+pytest 공통 설정 · 고정 가격 패널
+
+• 루트를 sys.path 에 넣어 `from app import …` 가 되도록 한다.
+• 아래 스크립트는 import 시점에 CSV 를 돌리거나 input() 을 기다리는 수동 실행용이라 수집하지 않는다.
+• panel : 시드 고정 난수로 만든 2-level 컬럼(ticker × field) 가격 DF.
+  프리패치 구간(2023-01-01~) 밖의 날짜라 이벤트 스토어 · 가격 캐시를 건드리지 않는다.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+collect_ignore = [
+    "test1.py",
+    "holiday_test.py",
+    "test_to_ticker.py",
+    "test_simple_queries.py",
+    "test_conditional_queries.py",
+    "test_signal_queries.py",
+]
+
+TICKERS = [f"{i:06d}.KS" for i in range(1, 9)]
+START, END = "2022-01-03", "2022-09-30"
+
+
+def make_panel(seed: int = 7) -> pd.DataFrame:
+    """
+    OHLCV 고정 패널
+    • 종목마다 추세 구간이 섞인 랜덤워크 → 적삼병 · 크로스 · 연속 상승/하락이 실제로 나온다.
+    • 마지막 종목은 중간 상장(앞부분 NaN), 일부 날은 거래량 0.
+    """
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(START, END, name="Date")
+    n = len(idx)
+    cols = {}
+    for k, t in enumerate(TICKERS):
+        drift = np.repeat(rng.normal(0, 0.01, n // 10 + 1), 10)[:n]
+        close = 10_000 * np.exp(np.cumsum(drift + rng.normal(0, 0.015, n)))
+        open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.005, n))
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n))
+        vol = rng.integers(1_000, 100_000, n).astype(float)
+        vol[rng.random(n) < 0.03] = 0
+        data = {"Open": open_, "High": high, "Low": low, "Close": close,
+                "Adj Close": close * np.where(np.arange(n) < n // 2, 0.99, 1.0),   # 중간 배당 조정
+                "Volume": vol}
+        if k == len(TICKERS) - 1:
+            for v in data.values():
+                v[:40] = np.nan
+        for f, v in data.items():
+            cols[(t, f)] = v
+    df = pd.DataFrame(cols, index=idx)
+    df.columns = pd.MultiIndex.from_tuples(df.columns)
+    return df
+
+
+@pytest.fixture(scope="session")
+def panel() -> pd.DataFrame:
+    return make_panel()
@@ -0,0 +1,108 @@
+# tests/unit_test/test_cross.py
+"""
+골든/데드크로스 벡터 판정(cross_masks · EventIndex) == 기존 루프 판정 (고정 패널)
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import search_utils
+from app.search_utils import search_cross_dates_by_condition
+from conftest import TICKERS
+
+WINDOWS = [
+    ("2022-01-03", "2022-09-30"),
+    ("2022-03-01", "2022-05-31"),
+    ("2022-06-01", "2022-07-15"),
+]
+
+
+# ── 기존 구현 (리팩토링 전 search_utils) ─────────────────────
+def _legacy_cross_tickers(df: pd.DataFrame, from_date: str, to_date: str, cross: str, tickers: list[str]) -> list[str]:
+    out = []
+    for t in tickers:
+        close = df[t, "Close"].dropna().loc[from_date:to_date]
+        if len(close) < 20:
+            continue
+        ma_s, ma_l = close.rolling(5).mean(), close.rolling(20).mean()
+        prev = None
+        for i in range(len(close)):
+            if pd.isna(ma_s.iloc[i]) or pd.isna(ma_l.iloc[i]):
+                continue
+            diff = ma_s.iloc[i] - ma_l.iloc[i]
+            if prev is not None and ((cross == "golden" and prev < 0 < diff) or (cross == "dead" and prev > 0 > diff)):
+                out.append(t)
+                break
+            prev = diff
+    return out
+
+
+def _legacy_count(close: pd.Series, from_date: str, to_date: str) -> tuple[int, int]:
+    delta = close.rolling(5).mean() - close.rolling(20).mean()
+    sign = lambda x: 1 if x > 0 else -1 if x < 0 else 0       # noqa: E731
+    prev, curr = delta.shift(1).apply(sign), delta.apply(sign)
+    golden = dead = 0
+    for d in close.index[(prev * curr < 0).to_numpy()]:
+        if from_date <= d.strftime("%Y-%m-%d") <= to_date:
+            golden += prev[d] < 0 < curr[d]
+            dead += prev[d] > 0 > curr[d]
+    return golden, dead
+
+
+# ── 비교 ─────────────────────────────────────────────────
+@pytest.mark.parametrize("cross", ["golden", "dead"])
+@pytest.mark.parametrize("window", WINDOWS)
+def test_cross_tickers_match_legacy(panel, cross, window):
+    date_from, date_to = window
+    assert search_cross_dates_by_condition(panel, date_from, date_to, cross, TICKERS) == \
+        _legacy_cross_tickers(panel, date_from, date_to, cross, TICKERS)
+
+
+@pytest.mark.parametrize("cross", ["golden", "dead", "both"])
+@pytest.mark.parametrize("window", WINDOWS)
+def test_cross_tickers_with_trading_halts(panel, cross, window):
+    """중간 미거래(NaN) 행 – 기존 구현은 티커별 dropna 후 이동평균"""
+    df = panel.copy()
+    rng = np.random.default_rng(3)
+    for t in TICKERS[::2]:
+        rows = rng.choice(np.arange(45, len(df)), 12, replace=False)
+        df.iloc[rows, df.columns.get_loc((t, "Close"))] = np.nan
+    sides = ["golden", "dead"] if cross == "both" else [cross]
+    hits = {t for s in sides for t in _legacy_cross_tickers(df, *window, s, TICKERS)}
+    expected = [t for t in TICKERS if t in hits]
+    assert search_cross_dates_by_condition(df, *window, cross, TICKERS) == expected
+
+
+@pytest.fixture
+def fake_download(panel, monkeypatch):
+    """search_utils._download → 고정 패널 슬라이스 (호출 횟수 기록)"""
+    calls = []
+
+    def _download(tickers, start, end, interval="1d", fields=None):
+        calls.append((tickers, start, end))
+        return panel.loc[start:end, list(tickers)]
+
+    monkeypatch.setattr(search_utils, "_download", _download)
+    search_utils._cross_events.cache_clear()
+    yield calls
+    search_utils._cross_events.cache_clear()
+
+
+@pytest.mark.parametrize("window", WINDOWS[1:])
+def test_cross_counts_match_legacy(panel, fake_download, window):
+    date_from, date_to = window
+    start, end = search_utils._cross_window(date_from, date_to)
+    for t in TICKERS:
+        expected = _legacy_count(panel[t, "Adj Close"].loc[start:end].dropna(), date_from, date_to)
+        got = tuple(len(search_utils._cross_dates(t, date_from, date_to, side)) for side in ("golden", "dead"))
+        assert got == expected, t
+
+
+def test_cross_events_follow_data_version(fake_download, monkeypatch):
+    version = iter([1, 1, 2])
+    monkeypatch.setattr(search_utils, "data_version", lambda: next(version))
+    for _ in range(3):
+        search_utils._cross_dates(TICKERS[0], *WINDOWS[1], "golden")
+    assert len(fake_download) == 2            # 같은 버전은 캐시, 버전이 바뀌면 다시 계산
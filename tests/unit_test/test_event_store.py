@@ -0,0 +1,174 @@
+# tests/unit_test/test_event_store.py
+"""
+이벤트 스토어 refresh → query 왕복 (임시 디렉터리, 고정 패널)
+저장된 이벤트가 기존 루프 판정과 같은지, 가격 파일이 바뀌면 조회 시 다시 계산되는지 확인
+"""
+from __future__ import annotations
+
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from app import event_store, search_utils
+from app.search_utils import detect_52w_high_break, detect_52w_low, detect_volume_spike, search_by_gap_pct
+from app.utils import _prev_bday
+from conftest import TICKERS
+from test_cross import _legacy_count
+from test_patterns import _legacy_hit
+
+WINDOWS = [("2022-03-01", "2022-05-31"), ("2022-06-01", "2022-09-30"), ("2022-02-07", "2022-02-11")]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch, panel):
+    """
+    EVENT_DIR · CACHE_DIR 를 임시 경로로 돌리고 패널의 종목별 가격 parquet 저장
+    갭 · 거래량 급증 임계치는 고정 패널에서도 이벤트가 나오도록 낮춘다.
+    """
+    monkeypatch.setattr(event_store, "EVENT_DIR", tmp_path / "events")
+    monkeypatch.setattr(event_store, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(event_store, "EVENT_GAP_PCT", 0.5)
+    monkeypatch.setattr(event_store, "EVENT_SPIKE_PCT", 50.0)
+    event_store._read.cache_clear()
+    for t in TICKERS:
+        panel[t].to_parquet(tmp_path / f"{t}.parquet")
+    yield tmp_path
+    event_store._read.cache_clear()
+
+
+def _legacy_three(df: pd.DataFrame, pattern: str, date_from: str, date_to: str) -> list[str]:
+    op = df["Open"].dropna().loc[date_from:date_to]
+    cl = df["Adj Close"].dropna().loc[date_from:date_to]
+    return [str(op.index[i].date()) for i in range(2, len(op)) if _legacy_hit(op, cl, i, pattern)]
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_cross_counts_round_trip(store, panel, window):
+    for t in TICKERS:
+        event_store.refresh(t, panel[t])
+        assert (event_store.count(t, "golden_cross", *window), event_store.count(t, "dead_cross", *window)) == \
+            _legacy_count(panel[t, "Adj Close"].dropna(), *window), t
+
+
+@pytest.mark.parametrize("pattern", ["white", "black"])
+@pytest.mark.parametrize("window", WINDOWS)
+def test_three_pattern_dates_round_trip(store, panel, pattern, window):
+    for t in TICKERS:
+        assert event_store.query(t, f"three_{pattern}", *window) == _legacy_three(panel[t], pattern, *window), t
+
+
+def test_tickers_with_keeps_input_order(store, panel):
+    window = WINDOWS[0]
+    expected = [t for t in reversed(TICKERS) if _legacy_three(panel[t], "white", *window)]
+    assert expected
+    assert event_store.tickers_with("three_white", *window, list(reversed(TICKERS))) == expected
+
+
+def test_refresh_is_atomic_and_stale_events_rebuilt(store, panel):
+    t = TICKERS[0]
+    event_store.refresh(t, panel[t])
+    assert not list((store / "events").glob("*.tmp"))
+
+    # 가격 파일이 이벤트 파일보다 새로우면 조회 시 다시 계산
+    cut = panel[t].loc[:"2022-04-29"]
+    cut.to_parquet(store / f"{t}.parquet")
+    ev = store / "events" / f"{t}.parquet"
+    st = ev.stat()
+    os.utime(ev, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+    assert event_store.query(t, "golden_cross", "2022-05-02", "2022-09-30") == []
+    assert event_store.count(t, "golden_cross", *WINDOWS[0]) == \
+        _legacy_count(cut["Adj Close"].dropna(), *WINDOWS[0])[0]
+
+
+def test_unknown_event_rejected(store):
+    with pytest.raises(ValueError):
+        event_store.count(TICKERS[0], "no_such_event", *WINDOWS[0])
+
+
+# 직전 평일이 KRX 거래일인 날만 (갭 판정의 '전 거래일' 이 패널의 앞 행과 같도록)
+DAYS = [d for d in pd.bdate_range("2022-02-14", "2022-09-30", freq="7B").strftime("%Y-%m-%d")
+        if pd.Timestamp(_prev_bday(d)) == pd.Timestamp(d) - pd.offsets.BDay(1)]
+
+
+@pytest.mark.parametrize("date", DAYS)
+def test_single_day_events_match_legacy(store, panel, date):
+    gap = event_store.EVENT_GAP_PCT
+    spike = {"window": event_store.EVENT_SPIKE_WINDOW, "volume_ratio": {"min": event_store.EVENT_SPIKE_PCT}}
+    cases = [
+        ("high_52w", {}, detect_52w_high_break(panel, date, event_store.EVENT_PEAK_DAYS, TICKERS)),
+        ("low_52w", {}, detect_52w_low(panel, date, event_store.EVENT_PEAK_DAYS, TICKERS)),
+        ("gap_up", {}, search_by_gap_pct(panel, date, {"min": gap}, TICKERS)),
+        ("gap_down", {}, search_by_gap_pct(panel, date, {"max": -gap}, TICKERS)),
+        ("gap_up", {"min_value": 1.0, "max_value": 1.5}, search_by_gap_pct(panel, date, {"min": 1.0, "max": 1.5}, TICKERS)),
+        ("volume_spike", {}, detect_volume_spike(panel, date, spike, TICKERS)),
+        ("volume_spike", {"min_value": 80}, detect_volume_spike(panel, date, {**spike, "volume_ratio": {"min": 80}}, TICKERS)),
+    ]
+    for event, kw, expected in cases:
+        assert event_store.tickers_with(event, date, date, TICKERS, **kw) == expected, (event, kw)
+
+
+def test_single_day_events_occur(store):
+    window = ("2022-01-03", "2022-09-30")
+    for event in ("high_52w", "low_52w", "gap_up", "gap_down", "volume_spike"):
+        assert event_store.occurrences(event, *window, TICKERS), event
+
+
+def test_universe_default(store, monkeypatch):
+    from app import universe
+    monkeypatch.setattr(universe, "all_tickers", lambda: list(TICKERS))
+    window = WINDOWS[1]
+    assert event_store.tickers_with("gap_up", *window) == event_store.tickers_with("gap_up", *window, TICKERS)
+    occ = event_store.occurrences("three_white", *window)
+    assert occ == {t: event_store.query(t, "three_white", *window) for t in TICKERS
+                   if event_store.count(t, "three_white", *window)}
+
+
+def test_screen_by_events_matches_legacy_filters(store, panel, monkeypatch):
+    """프리패치 구간으로 간주 → 스토어가 답할 조건만 가져가고 나머지는 돌려준다"""
+    monkeypatch.setattr(search_utils, "_within_prefetch_window", lambda s, e: True)
+    monkeypatch.setattr(search_utils, "EVENT_GAP_PCT", event_store.EVENT_GAP_PCT)
+    monkeypatch.setattr(search_utils, "EVENT_SPIKE_PCT", event_store.EVENT_SPIKE_PCT)
+    date = "2022-06-10"
+    cond = {"gap_pct": {"min": 0.6}, "peak_break": {}, "RSI": {"max": 70},
+            "peak_low": {"period_days": 60}, "volume_spike": {"window": 10, "volume_ratio": {"min": 60}}}
+    got, rest = search_utils.screen_by_events(date, cond, TICKERS)
+    assert got
+    assert got == search_by_gap_pct(panel, date, {"min": 0.6}, detect_52w_high_break(panel, date, 260, TICKERS))
+    assert rest == {"RSI": {"max": 70}, "peak_low": {"period_days": 60},
+                    "volume_spike": {"window": 10, "volume_ratio": {"min": 60}}}
+
+
+@pytest.mark.parametrize("cross", ["golden", "dead", "both"])
+def test_cross_screen_reads_store_in_prefetch_window(store, panel, monkeypatch, cross):
+    """프리패치 구간 → 기간 종목검색의 크로스 조건도 날짜검색과 같은 저장 이벤트를 쓴다"""
+    monkeypatch.setattr(search_utils, "_within_prefetch_window", lambda s, e: True)
+    window = WINDOWS[1]
+    sides = ["golden", "dead"] if cross == "both" else [cross]
+    expected = [t for t in TICKERS[1:] if any(event_store.count(t, f"{s}_cross", *window) for s in sides)]
+    assert expected
+    df = panel.drop(columns=TICKERS[0], level=0)          # 패널에 없는 종목은 제외
+    assert search_utils.search_cross_dates_by_condition(df, *window, cross, TICKERS) == expected
+
+
+def test_concurrent_refresh_same_ticker(store, panel):
+    """같은 티커를 동시에 재계산해도 예외 없이 한 파일만 남는다 (임시 파일은 쓰기마다 고유)"""
+    t = TICKERS[0]
+    errors = []
+
+    def work():
+        try:
+            for _ in range(5):
+                event_store.refresh(t, panel[t])
+        except Exception as e:             # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    assert [p.name for p in (store / "events").iterdir()] == [f"{t}.parquet"]
+    assert event_store.count(t, "golden_cross", *WINDOWS[0]) == _legacy_count(panel[t, "Adj Close"].dropna(), *WINDOWS[0])[0]
@@ -0,0 +1,88 @@
+# tests/unit_test/test_fast_parser.py
+"""
+규칙 기반 고속 파서(app.fast_parser) – 대표 질문별 params 전체 비교 · 처리하지 말아야 할 질문은 None
+(처리 비율 · 지연 측정은 tests/replay_fast_parser.py)
+"""
+from __future__ import annotations
+
+import pytest
+
+from app import fast_parser
+
+
+def _p(task: str, date: str, **kw) -> dict:
+    """HCX 스키마 9개 키 (나머지 기본값)"""
+    out = {"task": task, "date": date, "date_from": None, "date_to": None, "market": None,
+           "tickers": [], "metrics": None, "rank_n": None, "conditions": {}}
+    out.update(kw)
+    return out
+
+
+CASES = [
+    # ── 단순조회 ──
+    ("셀트리온의 2024-10-25 종가는?",
+     _p("단순조회", "2024-10-25", tickers=["셀트리온"], metrics=["종가"])),
+    ("2024년 10월 25일 셀트리온의 종가는?",
+     _p("단순조회", "2024-10-25", tickers=["셀트리온"], metrics=["종가"])),
+    ("삼성전자의 2024.7.2 종가는",
+     _p("단순조회", "2024-07-02", tickers=["삼성전자"], metrics=["종가"])),
+    ("하이트진로2우B의 2024-09-24 저가은?",
+     _p("단순조회", "2024-09-24", tickers=["하이트진로2우B"], metrics=["저가"])),
+    ("퓨릿의 2024-10-04 등락률은?",
+     _p("단순조회", "2024-10-04", tickers=["퓨릿"], metrics=["pct_change"])),
+    ("2024-10-11 KOSPI 지수는?",
+     _p("단순조회", "2024-10-11", market="KOSPI", metrics=["지수"])),
+    # ── 시장순위 ──
+    ("2024-08-30에서 KOSDAQ에서 상승률 높은 종목 5개는?",
+     _p("시장순위", "2024-08-30", market="KOSDAQ", metrics=["상승률"], rank_n=5)),
+    ("2025-01-12에서 KOSDAQ에서 가장 비싼 종목 3개는?",
+     _p("시장순위", "2025-01-12", market="KOSDAQ", metrics=["가격"], rank_n=3)),
+    ("2024-09-30 KOSPI 시장에서 거래량이 가장 많은 종목은?",
+     _p("시장순위", "2024-09-30", market="KOSPI", metrics=["거래량"], rank_n=1)),
+    ("2024-10-25에 코스피 시장에서 가장 비싼 종목은?",
+     _p("시장순위", "2024-10-25", market="KOSPI", metrics=["가격"], rank_n=1)),
+    ("2024-10-25 급락률 상위 3개 종목 알려줘",
+     _p("시장순위", "2024-10-25", metrics=["하락률"], rank_n=3)),
+    # ── 종목검색 ──
+    ("2024-12-19에 등락률이 -10% 이하인 종목을 모두 보여줘",
+     _p("종목검색", "2024-12-19", conditions={"pct_change": {"max": -10}})),
+    ("2024-09-11에 등락률이 +2% 이상이면서 거래량이 전날대비 100% 이상 증가한 종목을 모두 보여줘",
+     _p("종목검색", "2024-09-11", conditions={"pct_change": {"min": 2}, "volume_pct": {"min": 100}})),
+    ("2025-02-18에 종가가 20만원 이상 50만원 이하인 종목을 모두 보여줘",
+     _p("종목검색", "2025-02-18", conditions={"price_close": {"min": 200_000, "max": 500_000}})),
+    ("2025-05-21에 거래량이 1000만주 이상인 종목을 모두 보여줘",
+     _p("종목검색", "2025-05-21", conditions={"volume": {"min": 10_000_000}})),
+    ("2024-10-25에 KOSDAQ 시장에서 등락률이 +5% 이상이면서 거래량이 100만주 이상인 종목을 모두 보여줘",
+     _p("종목검색", "2024-10-25", market="KOSDAQ",
+        conditions={"pct_change": {"min": 5}, "volume": {"min": 1_000_000}})),
+    # ── 비교질문 ──
+    ("2024-10-25에 셀트리온과 SK하이닉스 중 등락률이 더 높은 종목은?",
+     _p("비교질문", "2024-10-25", tickers=["셀트리온", "SK하이닉스"], metrics=["pct_change"])),
+    ("2025-05-15에 현대차과 NAVER 중 시가총액이 더 큰 종목은?",
+     _p("비교질문", "2025-05-15", tickers=["현대차", "NAVER"], metrics=["시가총액"])),
+    ("2024-07-01에 KOSPI와 KOSDAQ 중 더 높은 지수는?",
+     _p("비교질문", "2024-07-01", market=["KOSPI", "KOSDAQ"], metrics=["지수"])),
+    ("2024-10-25에 삼성바이오로직스의 등락률이 시장 평균보다 높은가?",
+     _p("비교질문", "2024-10-25", market=[], tickers=["삼성바이오로직스"], metrics=["pct_change"],
+        conditions={"market": ["KOSPI", "KOSDAQ"]})),
+    ("2024-10-25에 삼성전자의 등락률이 KOSPI 시장 평균보다 높은가?",
+     _p("비교질문", "2024-10-25", market=[], tickers=["삼성전자"], metrics=["pct_change"],
+        conditions={"market": ["KOSPI"]})),
+]
+
+
+@pytest.mark.parametrize("question, expected", CASES, ids=[q for q, _ in CASES])
+def test_parse(question, expected):
+    assert fast_parser.parse(question) == expected
+
+
+@pytest.mark.parametrize("question", [
+    "어제 삼성전자 종가는?",                                          # 상대 날짜 → HCX
+    "없는회사의 2024-10-25 종가는?",                                   # 유니버스에 없는 종목명
+    "2024-02-30 삼성전자의 종가는?",                                   # 존재하지 않는 날짜
+    "2024-10-25에 삼성전자 종가 알려줘",                               # 템플릿 밖 어순
+    "삼성전자의 2024-10-25 종가는? 그리고 시가는?",                    # 질문 일부만 맞음
+    "2025-01-27에 종가가 20일 이동평균보다 5% 이상 높은 종목을 알려줘",  # 지원하지 않는 조건
+])
+def test_unhandled_questions_fall_through(question):
+    assert fast_parser.parse(question) is None
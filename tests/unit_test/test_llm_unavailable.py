@@ -0,0 +1,47 @@
+# tests/unit_test/test_llm_unavailable.py
+"""
+HCX 장애(회로 차단) 시 파싱 결과는 UNAVAILABLE → router 는 '이해 못 함'이 아닌 LLM 불가 안내
+로컬 파서 · 파싱 캐시는 미적중으로 바꿔 실제 HCX · 캐시(data/) 를 건드리지 않는다.
+"""
+from __future__ import annotations
+
+import pytest
+
+from app import llm_bridge, llm_policy, parse_cache, router
+
+
+@pytest.fixture
+def hcx(monkeypatch):
+    """로컬 경로 미적중 + _hcx_call 을 바꿔 끼울 수 있게"""
+    monkeypatch.setattr(llm_bridge, "_from_fast_parser", lambda key: None)
+    monkeypatch.setattr(parse_cache, "get", lambda *a: None)
+    monkeypatch.setattr(parse_cache, "put", lambda *a: None)
+    monkeypatch.setattr(router, "_begin", lambda *a: None)
+    llm_bridge._PARAMS_CACHE.clear()
+    yield lambda fn: monkeypatch.setattr(llm_bridge, "_hcx_call", fn)
+    llm_bridge._PARAMS_CACHE.clear()
+
+
+def _circuit_open(*a, **k):
+    raise llm_policy.CircuitOpen("open")
+
+
+def test_circuit_open_is_distinguishable(hcx):
+    hcx(_circuit_open)
+    assert llm_bridge.extract_params("아무 질문", "k") == {"task": llm_bridge.UNAVAILABLE}
+    assert router.route("아무 질문", "c1", "k") == router._LLM_DOWN
+    assert llm_bridge._PARAMS_CACHE == {}               # 장애 결과는 캐시하지 않음
+
+
+def test_unparsable_answer_is_still_unknown(hcx):
+    hcx(lambda *a, **k: "JSON 아님")
+    assert llm_bridge.extract_params("아무 질문", "k") == {"task": "unknown"}
+    assert router.route("아무 질문", "c2", "k") == router._FAIL
+
+
+def test_hedge_pool_shutdown_and_recreate():
+    llm_policy._hedge_pool().submit(int).result()
+    llm_policy.shutdown()
+    assert llm_policy._hedge_pool.cache_info().currsize == 0
+    assert llm_policy._hedge_pool().submit(int, "7").result() == 7      # 다음 호출 때 새 풀
+    llm_policy.shutdown()
@@ -0,0 +1,91 @@
+# tests/unit_test/test_parallel_screen.py
+"""
+티커 샤드 × 프로세스 풀 스크리닝 결과 == 현재 프로세스에서 한 번에 돌린 결과 (고정 패널)
+필터는 실제 종목검색 필터(task_search._range_filters · _date_filters)를 그대로 쓴다.
+"""
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from app import parallel_screen
+from app.task_handlers.task_search import _date_filters, _range_filters
+from conftest import make_panel
+
+
+@pytest.fixture(scope="module")
+def wide_panel() -> pd.DataFrame:
+    """고정 패널 5장을 이어 붙인 40종목 패널"""
+    parts = []
+    for seed in range(5):
+        p = make_panel(seed)
+        parts.append(p.rename(columns=lambda t: f"{seed}{t[1:]}", level=0))
+    return pd.concat(parts, axis=1)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """샤드 병렬 경로를 강제 (워커 2개, 공유 메모리는 7컬럼씩 채워 경계도 확인)"""
+    monkeypatch.setattr(parallel_screen, "SCREEN_WORKERS", 2)
+    monkeypatch.setattr(parallel_screen, "SCREEN_PARALLEL_MIN", 1)
+    monkeypatch.setattr(parallel_screen, "_FILL_CHUNK", 7)
+    parallel_screen.shutdown()
+    yield
+    parallel_screen.shutdown()
+
+
+RANGE_CONDS = [
+    {"pct_change_range": {"min": 0}},
+    {"consecutive_change": {"direction": "up", "count": 4}},
+    {"cross": "golden", "pct_change_range": {"max": 10}},
+    {"three_pattern": "black"},
+]
+DATE_CONDS = [
+    {"pct_change": {"min": 1}},
+    {"volume": {"min": 30000}, "RSI": {"max": 60}},
+    {"moving_avg": {"window": 20, "diff_pct": {"min": 0}}},
+]
+
+
+def test_range_screen_matches_serial(wide_panel, parallel):
+    tickers = list(wide_panel.columns.get_level_values(0).unique())[::-1]
+    for cond in RANGE_CONDS:
+        expected = _range_filters(wide_panel, tickers, "2022-02-01", "2022-06-30", cond)
+        assert expected, cond
+        got = parallel_screen.screen_shards(wide_panel, tickers, _range_filters, "2022-02-01", "2022-06-30", cond)
+        assert got == expected, cond
+
+
+def test_date_screen_matches_serial(wide_panel, parallel):
+    tickers = list(wide_panel.columns.get_level_values(0).unique())
+    date = "2022-06-15"
+    for cond in DATE_CONDS:
+        expected = _date_filters(wide_panel, tickers, date, cond)
+        assert expected, cond
+        assert parallel_screen.screen_shards(wide_panel, tickers, _date_filters, date, cond) == expected, cond
+
+
+def test_small_universe_runs_in_process(wide_panel, monkeypatch):
+    monkeypatch.setattr(parallel_screen, "SCREEN_PARALLEL_MIN", 10_000)
+    parallel_screen.shutdown()
+    tickers = list(wide_panel.columns.get_level_values(0).unique())
+    cond = RANGE_CONDS[0]
+    assert parallel_screen.screen_shards(wide_panel, tickers, _range_filters, "2022-02-01", "2022-06-30", cond) == \
+        _range_filters(wide_panel, tickers, "2022-02-01", "2022-06-30", cond)
+    assert parallel_screen._pool.cache_info().currsize == 0          # 풀을 띄우지 않음
+
+
+def test_shutdown_releases_shared_memory(wide_panel, parallel):
+    tickers = list(wide_panel.columns.get_level_values(0).unique())
+    parallel_screen.screen_shards(wide_panel, tickers, _range_filters, "2022-02-01", "2022-06-30", RANGE_CONDS[0])
+    assert parallel_screen._live == {}                 # 호출이 끝나면 블록 해제
+
+    # 스크리닝 도중 종료 → 남은 블록도 unlink
+    shm = shared_memory.SharedMemory(create=True, size=64)
+    parallel_screen._live[shm.name] = shm
+    parallel_screen.shutdown()
+    assert parallel_screen._live == {}
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shm.name)
@@ -0,0 +1,59 @@
+# tests/unit_test/test_parse_cache.py
+"""
+HCX 파싱 결과 캐시 – 자리표시자 왕복 · 적중 기록 일괄 쓰기 · 추정 날짜 미저장 (임시 DB)
+"""
+from __future__ import annotations
+
+import pytest
+
+from app import parse_cache
+
+V = "v1"
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "PARSE_DB", tmp_path / "parse.db")
+    monkeypatch.setattr(parse_cache, "PARSE_HIT_FLUSH_S", 10**9)       # 자동 flush 없음
+    parse_cache._conn.cache_clear()
+    parse_cache._pending_hits.clear()
+    yield
+    parse_cache._pending_hits.clear()
+    parse_cache._conn().close()
+    parse_cache._conn.cache_clear()
+
+
+def _rows():
+    return parse_cache._conn().execute("SELECT template, hits FROM parse").fetchall()
+
+
+def test_round_trip_with_new_values():
+    parse_cache.put("2024-10-11 KOSPI 거래량 상위 10개", V,
+                    {"task": "시장순위", "date": "2024-10-11", "market": "KOSPI", "rank_n": 10})
+    assert parse_cache.get("2024-10-07 KOSPI 거래량 상위 3개", V) == \
+        {"task": "시장순위", "date": "2024-10-07", "market": "KOSPI", "rank_n": 3}
+
+
+def test_hits_are_batched_until_flush():
+    parse_cache.put("2024-10-11 KOSPI 지수는?", V, {"task": "단순조회", "date": "2024-10-11"})
+    for _ in range(3):
+        assert parse_cache.get("2024-10-14 KOSPI 지수는?", V)
+    assert [h for _, h in _rows()] == [0]                  # 조회마다 쓰지 않음
+    parse_cache.flush()
+    assert [h for _, h in _rows()] == [3]
+    assert parse_cache._pending_hits == {}
+
+
+def test_inferred_date_not_cached():
+    """날짜 없는 질문에 HCX 가 오늘 날짜를 채운 결과는 저장하지 않는다"""
+    parse_cache.put("삼성전자 종가는?", V, {"task": "단순조회", "date": "2025-07-30", "tickers": ["삼성전자"]})
+    parse_cache.put("거래량 100만주 이상 종목", V, {"task": "종목검색", "date": "2025-07-30",
+                                                 "conditions": {"volume": {"min": 1_000_000}}})
+    assert _rows() == []
+
+
+def test_date_explained_by_pinned_year_cached():
+    params = {"task": "종목검색", "date_from": "2024-07-01", "date_to": "2024-09-30"}
+    parse_cache.put("2024년 3분기 적삼병 종목", V, params)
+    assert parse_cache.get("2024년 3분기 적삼병 종목", V) == params
+    assert parse_cache.get("2023년 3분기 적삼병 종목", V) is None
@@ -0,0 +1,81 @@
+# tests/unit_test/test_patterns.py
+"""
+app.patterns 적삼병/흑삼병 벡터 판정 == 기존 종목·날짜 루프 판정 (고정 패널)
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.patterns import detect_pattern, occurrences
+from app.search_utils import three_pattern_tickers
+from conftest import TICKERS
+
+
+# ── 기존 구현 (리팩토링 전 search_utils) ─────────────────────
+def _legacy_hit(op: pd.Series, cl: pd.Series, idx: int, pattern: str) -> bool:
+    o, c = op.iloc[idx - 2: idx + 1], cl.iloc[idx - 2: idx + 1]
+    if pattern == "white":
+        return bool((c > o).all() and np.diff(c).min() > 0)
+    return bool((c < o).all() and np.diff(c).max() < 0)
+
+
+def _legacy_scan(df: pd.DataFrame, pattern: str) -> list[tuple[str, str]]:
+    out = []
+    for t in df.columns.levels[0]:
+        op, cl = df[t, "Open"].dropna(), df[t, "Adj Close"].dropna()
+        out += [(t, str(op.index[i].date())) for i in range(2, len(op)) if _legacy_hit(op, cl, i, pattern)]
+    return out
+
+
+def _legacy_tickers(df: pd.DataFrame, pattern: str, date_from: str, date_to: str, tickers: list[str]) -> list[str]:
+    out = []
+    for t in tickers:
+        op = df[t, "Open"].dropna().loc[date_from:date_to]
+        cl = df[t, "Adj Close"].dropna().loc[date_from:date_to]
+        if any(_legacy_hit(op, cl, i, pattern) for i in range(2, len(op))):
+            out.append(t)
+    return out
+
+
+# ── 비교 ─────────────────────────────────────────────────
+@pytest.mark.parametrize("pattern", ["white", "black"])
+def test_occurrences_match_legacy_scan(panel, pattern):
+    expected = _legacy_scan(panel, pattern)
+    assert expected                                   # 패널에 실제 발생이 있어야 의미 있는 비교
+    assert occurrences(detect_pattern(panel, pattern)) == expected
+
+
+@pytest.mark.parametrize("pattern", ["white", "black"])
+@pytest.mark.parametrize("window", [
+    ("2022-01-03", "2022-09-30"),
+    ("2022-02-01", "2022-02-28"),
+    ("2022-03-07", "2022-03-11"),
+    ("2022-06-15", "2022-07-15"),
+])
+def test_pattern_tickers_match_legacy(panel, pattern, window):
+    date_from, date_to = window
+    assert three_pattern_tickers(panel, pattern, date_from, date_to, TICKERS) == \
+        _legacy_tickers(panel, pattern, date_from, date_to, TICKERS)
+
+
+def test_korean_alias(panel):
+    assert detect_pattern(panel, "적삼병").equals(detect_pattern(panel, "white"))
+    with pytest.raises(ValueError):
+        detect_pattern(panel, "없는패턴")
+
+
+@pytest.mark.parametrize("pattern", ["white", "black"])
+def test_patterns_skip_trading_halts(panel, pattern):
+    """중간 미거래(NaN) 행 – 기존 구현은 티커별 dropna 로 건너뛰고 직전 유효 봉과 비교"""
+    df = panel.copy()
+    rng = np.random.default_rng(5)
+    for t in TICKERS[::2]:
+        rows = rng.choice(np.arange(45, len(df)), 25, replace=False)
+        for f in ("Open", "High", "Low", "Close", "Adj Close", "Volume"):
+            df.iloc[rows, df.columns.get_loc((t, f))] = np.nan
+    expected = _legacy_scan(df, pattern)
+    assert occurrences(detect_pattern(df, pattern)) == expected
+    for window in [("2022-01-03", "2022-09-30"), ("2022-06-15", "2022-07-15")]:
+        assert three_pattern_tickers(df, pattern, *window, TICKERS) == _legacy_tickers(df, pattern, *window, TICKERS)
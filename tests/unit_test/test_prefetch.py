@@ -0,0 +1,51 @@
+# tests/unit_test/test_prefetch.py
+"""
+질문 선행 프리패치 – 스캐너 → to_tickers 해석 → 가격 캐시 LRU 적재,
+필드 한정 조회(_download(fields=…))도 프리패치한 전체 필드 프레임에서 적중
+가격 캐시 디렉터리는 tmp_path 로 바꿔 실제 캐시(data/) 를 건드리지 않는다.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from app import router, yf_cache
+from conftest import TICKERS, make_panel
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """삼성전자 · SK하이닉스 parquet 두 개만 있는 가격 캐시"""
+    monkeypatch.setattr(yf_cache, "CACHE_DIR", tmp_path)
+    panel = make_panel(0)
+    for t, src in (("005930.KS", TICKERS[0]), ("000660.KS", TICKERS[1])):
+        panel[src].to_parquet(tmp_path / f"{t}.parquet")
+    yf_cache._read.cache_clear()
+    yf_cache._full.clear()
+    yield tmp_path
+    yf_cache._read.cache_clear()
+    yf_cache._full.clear()
+
+
+def test_prefetch_resolves_scanned_names(cache_dir):
+    assert router._prefetch_mentioned("삼성전자와 SK하이닉스 중 삼성전자의 종가가 높은 종목은?", "") == \
+        ["005930.KS", "000660.KS"]
+    assert yf_cache._read.cache_info().currsize == 2
+
+
+def test_field_limited_load_hits_prefetched_frame(cache_dir):
+    yf_cache.prefetch(["005930.KS"])
+    misses = yf_cache._read.cache_info().misses
+    df = yf_cache.load("005930.KS", "2022-01-01", "2022-12-31", columns=["Volume", "Close"])
+    assert list(df.columns) == ["Volume", "Close"]
+    assert yf_cache._read.cache_info().misses == misses          # 새로 읽지 않음
+    full = pd.read_parquet(cache_dir / "005930.KS.parquet")
+    pd.testing.assert_frame_equal(df, full.loc["2022-01-01":"2022-12-31", ["Volume", "Close"]])
+
+
+def test_field_sets_share_one_key(cache_dir):
+    """프리패치 전이면 필드 집합 하나당 키 하나 (순서만 다른 요청은 같은 키)"""
+    a = yf_cache.load("000660.KS", "2022-01-01", "2022-12-31", columns=["Close", "Volume"])
+    b = yf_cache.load("000660.KS", "2022-01-01", "2022-12-31", columns=["Volume", "Close"])
+    assert yf_cache._read.cache_info().currsize == 1
+    assert list(a.columns) == ["Close", "Volume"] and list(b.columns) == ["Volume", "Close"]
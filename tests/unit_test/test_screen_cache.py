@@ -0,0 +1,70 @@
+# tests/unit_test/test_screen_cache.py
+"""
+종목검색 결과 캐시 – 조건 정규화 키 · 데이터 버전별 재계산 · 실패 미보관
+"""
+from __future__ import annotations
+
+import pytest
+
+from app.task_handlers import task_search
+from app.task_handlers.task_search import _NoData, _screen, _screen_key
+
+
+def test_key_ignores_spelling_of_same_conditions():
+    a = {"date": "2024-10-25", "market": "KOSPI",
+         "conditions": {"pct_change": {"min": 5.0}, "volume": {"min": 100000, "max": 2e6}}}
+    b = {"market": "KOSPI", "date": "2024-10-25", "date_from": "2024-01-02",
+         "conditions": {"volume": {"max": 2000000, "min": 100000.0}, "pct_change": {"min": 5}}}
+    assert _screen_key(a) == _screen_key(b)
+
+
+def test_key_separates_different_requests():
+    base = {"date": "2024-10-25", "market": "KOSPI", "conditions": {"pct_change": {"min": 5}}}
+    assert _screen_key(base) != _screen_key({**base, "conditions": {"pct_change": {"min": 5.5}}})
+    assert _screen_key(base) != _screen_key({**base, "market": "KOSDAQ"})
+    # 알 수 없는 시장 · 시장 없음 → 전체 유니버스로 같은 키
+    assert _screen_key({**base, "market": "ALL"}) == _screen_key({**base, "market": None})
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    log = []
+
+    def fake_date(date, market, cond):
+        log.append(("date", date))
+        if cond.get("fail"):
+            raise _NoData
+        return ["000002.KS", "000001.KS"]
+
+    def fake_range(date_from, date_to, market, cond):
+        log.append(("range", date_from, date_to))
+        return ["000003.KS"]
+
+    monkeypatch.setattr(task_search, "_screen_date", fake_date)
+    monkeypatch.setattr(task_search, "_screen_range", fake_range)
+    _screen.cache_clear()
+    yield log
+    _screen.cache_clear()
+
+
+def test_cached_per_data_version(calls):
+    key = _screen_key({"date": "2024-10-25", "conditions": {"volume": {"min": 1}}})
+    assert _screen(key, 1) == ("000002.KS", "000001.KS")
+    assert _screen(key, 1) == ("000002.KS", "000001.KS")
+    assert len(calls) == 1
+    _screen(key, 2)                                   # ingest → 데이터 버전 변경
+    assert len(calls) == 2
+
+
+def test_range_key_dispatches_to_range_screen(calls):
+    key = _screen_key({"date_from": "2024-01-02", "date_to": "2024-03-29", "conditions": {"cross": "golden"}})
+    assert _screen(key, 1) == ("000003.KS",)
+    assert calls == [("range", "2024-01-02", "2024-03-29")]
+
+
+def test_load_failure_not_cached(calls):
+    key = _screen_key({"date": "2024-10-25", "conditions": {"fail": True}})
+    for _ in range(2):
+        with pytest.raises(_NoData):
+            _screen(key, 1)
+    assert len(calls) == 2
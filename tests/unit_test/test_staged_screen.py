@@ -0,0 +1,69 @@
+# tests/unit_test/test_staged_screen.py
+"""
+단일일 종목검색 단계별 로드(필요 필드 · 이력만) == 전체 필드 · 전체 이력 패널에 모든 조건 적용 (고정 패널)
+"""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from app.task_handlers import task_search
+from app.task_handlers.task_search import _date_filters, _date_stages, _NoData
+from conftest import TICKERS
+
+DATE = "2022-08-17"
+CONDS = [
+    {"price_close": {"min": 12_000}},
+    {"pct_change": {"min": 0}, "volume": {"min": 20_000}},
+    {"RSI": {"max": 70}, "price_close": {"max": 50_000}},
+    {"volume_spike": {"window": 20, "volume_ratio": {"min": 0}}, "pct_change": {"max": 3}},
+    {"moving_avg": {"window": 20, "diff_pct": {"min": 0}}, "volume": {"min": 1}},
+    {"bollinger_touch": "lower", "RSI": {"window": 10, "max": 50}},
+    {"peak_break": {"period_days": 60}, "volume_pct": {"min": -50}},
+    {"off_peak": {"period_days": 120, "min": 5}, "gap_pct": {"min": -2}},
+]
+
+
+@pytest.fixture
+def loads(panel, monkeypatch):
+    """_download → 고정 패널 (요청한 티커 · 필드 · 구간만), 호출 기록"""
+    log = []
+
+    def _download(tickers, start, end, interval="1d", fields=None):
+        log.append((tuple(tickers), start, tuple(fields or ())))
+        df = panel.loc[start:pd.Timestamp(end) - pd.Timedelta(days=1), list(tickers)]
+        if fields:
+            df = df.loc[:, df.columns.get_level_values(1).isin(fields)]
+        return df
+
+    monkeypatch.setattr(task_search, "_download", _download)
+    monkeypatch.setattr(task_search, "_universe", lambda market: TICKERS)
+    return log
+
+
+@pytest.mark.parametrize("cond", CONDS)
+def test_staged_matches_full_panel(panel, loads, cond):
+    expected = _date_filters(panel, TICKERS, DATE, cond)
+    assert task_search._screen_date(DATE, None, cond) == expected
+
+    # 단계마다 그 단계 필드만, 앞 단계 생존 종목만 읽는다
+    stages = _date_stages(cond)
+    assert [f for _, _, f in loads] == [f for _, f, _ in stages][:len(loads)]
+    assert all(set(b[0]) <= set(a[0]) for a, b in zip(loads, loads[1:]))
+
+
+def test_stages_ordered_by_depth_and_merged():
+    cond = {"peak_break": {}, "RSI": {"window": 14}, "volume": {"min": 1}, "price_close": {"min": 1},
+            "moving_avg": {"window": 14}}
+    assert _date_stages(cond) == [
+        (0, ("Close", "Volume"), ["price_close", "volume"]),
+        (14, ("Adj Close", "Volume"), ["RSI", "moving_avg"]),
+        (260, ("Close", "Volume"), ["peak_break"]),
+    ]
+    assert _date_stages({}) == [(0, ("Close", "Volume"), [])]
+
+
+def test_no_data_on_first_stage(loads, monkeypatch):
+    monkeypatch.setattr(task_search, "_download", lambda *a, **k: pd.DataFrame())
+    with pytest.raises(_NoData):
+        task_search._screen_date(DATE, None, {"volume": {"min": 1}})
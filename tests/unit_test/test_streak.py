@@ -0,0 +1,72 @@
+# tests/unit_test/test_streak.py
+"""
+연속 상승/하락 run-length 판정(streak_runs) == 기존 rolling(count).apply(all) 판정 (고정 패널)
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.patterns import streak_runs, streak_summary
+from app.search_utils import search_by_consecutive_change
+from conftest import TICKERS
+
+
+# ── 기존 구현 (리팩토링 전 search_utils) ─────────────────────
+def _legacy(df: pd.DataFrame, from_date: str, to_date: str, cond: dict, tickers: list[str]) -> list[str]:
+    direction, count = cond.get("direction", "up"), cond.get("count", 3)
+    sliced = df.loc[pd.to_datetime(from_date):pd.to_datetime(to_date)]
+    out = []
+    for t in tickers:
+        close = sliced[(t, "Close")].dropna()
+        vol = df.loc[pd.to_datetime(to_date), (t, "Volume")]
+        if len(close) < count or pd.isna(vol) or vol == 0:
+            continue
+        diff = close.diff().iloc[1:]
+        cmp = diff > 0 if direction == "up" else diff < 0
+        if cmp.rolling(count).apply(all).any():
+            out.append(t)
+    return out
+
+
+# ── 비교 ─────────────────────────────────────────────────
+@pytest.mark.parametrize("direction", ["up", "down"])
+@pytest.mark.parametrize("count", [2, 3, 5, 7])
+@pytest.mark.parametrize("window", [
+    ("2022-01-03", "2022-09-30"),
+    ("2022-02-01", "2022-03-31"),
+    ("2022-05-02", "2022-05-20"),
+])
+def test_consecutive_change_matches_legacy(panel, direction, count, window):
+    cond = {"direction": direction, "count": count}
+    assert search_by_consecutive_change(panel, *window, cond, TICKERS) == _legacy(panel, *window, cond, TICKERS)
+
+
+def test_consecutive_change_with_trading_halts(panel):
+    """중간 미거래(NaN) 행 – 기존 구현은 dropna 로 건너뛰었다"""
+    df = panel.copy()
+    rows = np.random.default_rng(1).choice(len(df), 25, replace=False)
+    for t in TICKERS[:4]:
+        df.iloc[rows, df.columns.get_loc((t, "Close"))] = np.nan
+    for direction in ("up", "down"):
+        for count in (3, 4):
+            cond = {"direction": direction, "count": count}
+            assert search_by_consecutive_change(df, "2022-01-03", "2022-09-30", cond, TICKERS) == \
+                _legacy(df, "2022-01-03", "2022-09-30", cond, TICKERS)
+
+
+def test_streak_runs_skip_missing_rows():
+    close = pd.DataFrame({"A": [1.0, 2.0, np.nan, 3.0, 3.0, 2.0, 1.0]})
+    assert streak_runs(close, "up")["A"].tolist() == [0, 1, 1, 2, 0, 0, 0]
+    assert streak_runs(close, "down")["A"].tolist() == [0, 0, 0, 0, 0, 1, 2]
+
+
+def test_streak_summary():
+    close = pd.DataFrame({"A": [1.0, 2.0, np.nan, 3.0, 3.0, 2.0, 1.0], "B": [5.0, 4.0, 3.0, 4.0, 5.0, 6.0, 7.0]})
+    assert streak_summary(close, "up").to_dict("index") == {"A": {"longest": 2, "current": 0},
+                                                           "B": {"longest": 4, "current": 4}}
+    assert streak_summary(close, "down").to_dict("index") == {"A": {"longest": 2, "current": 2},
+                                                             "B": {"longest": 2, "current": 0}}
+    empty = streak_summary(close.iloc[:0], "up")
+    assert empty.index.tolist() == ["A", "B"] and (empty == 0).all().all()
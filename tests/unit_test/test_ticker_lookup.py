@@ -0,0 +1,80 @@
+# tests/unit_test/test_ticker_lookup.py
+"""
+종목명 로컬 해석(_resolve_local) – 정적 사전 · 약어 · fuzzy 단계
+별칭 캐시는 메모리 가짜로 바꿔 실제 DB(data/) 를 건드리지 않는다.
+"""
+from __future__ import annotations
+
+import pytest
+
+from app import alias_cache, ticker_lookup
+from app.ticker_lookup import _Pending, _resolve_local
+
+
+@pytest.fixture(autouse=True)
+def puts(monkeypatch):
+    """alias_cache.get → 항상 미적중, put → 기록만"""
+    log = []
+    monkeypatch.setattr(alias_cache, "get", lambda alias: None)
+    monkeypatch.setattr(alias_cache, "put", lambda *a, **k: log.append(a))
+    return log
+
+
+def test_static_name():
+    assert _resolve_local("삼성전자") == ("005930.KS", "삼성전자")
+    assert _resolve_local("삼성전자의") == ("005930.KS", "삼성전자")
+
+
+@pytest.mark.parametrize("alias, candidates", [
+    ("카카오뱅", ["카카오뱅크"]),            # 접두어 후보 하나
+    ("ㅋㅋㅇㅂㅋ", ["카카오뱅크"]),          # 초성 후보 하나
+    ("ㅅㅅㅈㅈ", ["삼성전자", "상신전자"]),   # 초성 후보 여럿
+])
+def test_abbreviation_goes_to_hcx_without_caching(puts, alias, candidates):
+    r = _resolve_local(alias)
+    assert isinstance(r, _Pending) and r.direct == candidates and r.fuzzy == []
+    assert puts == []
+
+
+@pytest.mark.parametrize("alias, official", [
+    ("삼성전쟈", "삼성전자"),            # 자모 1개 오타 (2위 삼성전자우와 7.6점 차)
+    ("삼송전자", "삼성전자"),
+    ("셀트리혼", "셀트리온"),
+    ("카카오뱅그", "카카오뱅크"),
+    ("SK하이닉쓰", "SK하이닉스"),
+    ("LG에너지솔루숀", "LG에너지솔루션"),
+])
+def test_fuzzy_typo_auto_accepted_without_caching(puts, alias, official):
+    assert _resolve_local(alias) == (ticker_lookup._STATIC_MAP[official], official)
+    assert puts == []
+
+
+@pytest.mark.parametrize("alias", [
+    "삼성전가",        # 삼성전자 · 삼성전기 동점 → 차이 부족
+    "하이닉스",        # SK하이닉스 90.0 vs 이닉스 87.5 → 차이 부족
+    "네이바",          # 1위 83.3 → 점수 부족
+])
+def test_fuzzy_ambiguous_goes_to_hcx(alias):
+    r = _resolve_local(alias)
+    assert isinstance(r, _Pending) and r.direct is None and r.fuzzy
+
+
+def test_unverified_rows_dropped(tmp_path, monkeypatch):
+    """예전에 약어 · fuzzy 단계가 바로 기록한 행은 DB 를 열 때 삭제, HCX 확정 행은 유지"""
+    monkeypatch.setattr(alias_cache, "ALIAS_DB", tmp_path / "alias.db")
+    alias_cache._conn.cache_clear()
+    try:
+        con = alias_cache._conn()
+        con.executemany(
+            "INSERT INTO alias (alias, ticker, name, source, created, expires) VALUES (?, ?, ?, ?, 0, 9e18)",
+            [("ㅋㅋ", "060480.KQ", "코콤", "chosung"), ("카카", "035720.KS", "카카오", "prefix"),
+             ("삼성전쟈", "005930.KS", "삼성전자", "fuzzy"), ("삼전", "005930.KS", "삼성전자", "hcx")],
+        )
+        con.commit()
+        con.close()
+        alias_cache._conn.cache_clear()
+        rows = alias_cache._conn().execute("SELECT alias, source FROM alias").fetchall()
+        assert rows == [("삼전", "hcx")]
+    finally:
+        alias_cache._conn().close()
+        alias_cache._conn.cache_clear()
@@ -1,7 +1,7 @@
 # scripts/test_to_ticker.py
 
 from app.ticker_lookup import to_ticker
-from app.universe import NAME_BY_TICKER
+from app import universe
 
 def main():
     print("종목명을 입력하면 to_ticker 결과를 출력합니다. (종료: 빈 줄 입력)")
@@ -12,7 +12,7 @@ def main():
             break
         try:
             ticker = to_ticker(name)
-            kor_name = NAME_BY_TICKER.get(ticker, None)
+            kor_name = universe.current().name_by_ticker.get(ticker, None)
             if kor_name:
                 print(f"→ {name!r}  mapped to  {ticker} ({kor_name})\n")
             else:
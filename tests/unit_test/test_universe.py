@@ -0,0 +1,60 @@
+# tests/unit_test/test_universe.py
+"""
+유니버스 핫 리로드 – 새 스냅샷으로 참조 교체 (이전 스냅샷 · 접근자 결과는 그대로)
+"""
+from __future__ import annotations
+
+import threading
+
+from app import universe
+
+
+def _force_reload(monkeypatch, rows: universe._Rows) -> None:
+    monkeypatch.setitem(universe._state, "hash", None)
+    monkeypatch.setattr(universe, "_from_artifact", lambda digest: rows)
+    assert universe.reload()
+
+
+def test_reload_swaps_snapshot(monkeypatch):
+    before = universe.current()
+    names = universe.all_tickers()
+    rows = universe._Rows(["가나다", "라마바"], ["000001.KS", "000002.KQ"], [0, 1], {"가나": "000001.KS"})
+    try:
+        _force_reload(monkeypatch, rows)
+        after = universe.current()
+        assert after is not before
+        assert after.name_map == {"가나다": "000001.KS", "라마바": "000002.KQ", "가나": "000001.KS"}
+        assert universe.tickers("KOSPI") == ["000001.KS"] and universe.tickers(None) == ["000001.KS", "000002.KQ"]
+        assert universe.name_of("000002.KQ") == "라마바" and universe.name_of("X") == "X"
+        # 이전 스냅샷 · 먼저 받아 둔 목록은 바뀌지 않음
+        assert len(before.name_map) > 2 and universe.all_tickers() != names and len(names) > 2
+    finally:
+        monkeypatch.undo()
+        universe._state["hash"] = None
+        universe.reload()
+    assert universe.current().name_map == before.name_map
+
+
+def test_readers_never_see_partial_state(monkeypatch):
+    """reload 중에 읽어도 스냅샷은 항상 완성된 상태 (name_by_ticker 와 global_tickers 크기가 맞음)"""
+    big = universe._Rows([f"n{i}" for i in range(5000)], [f"{i:06d}.KS" for i in range(5000)], [0] * 5000, {})
+    small = universe._Rows(["a"], ["000001.KS"], [0], {})
+    seen, stop = [], threading.Event()
+
+    def read():
+        while not stop.is_set():
+            u = universe.current()
+            seen.append(len(u.name_by_ticker) == len(u.global_tickers))
+
+    th = threading.Thread(target=read)
+    th.start()
+    try:
+        for rows in (big, small) * 5:
+            _force_reload(monkeypatch, rows)
+    finally:
+        stop.set()
+        th.join()
+        monkeypatch.undo()
+        universe._state["hash"] = None
+        universe.reload()
+    assert seen and all(seen)
@@ -0,0 +1,44 @@
+# tests/unit_test/test_warmup.py
+"""
+워밍업 준비 상태 – 핵심 단계가 실패하면 ready 가 아니라 failed, 부가 단계 실패는 ready
+(실제 단계 대신 가짜 단계로 바꿔 모델 · 캐시를 건드리지 않는다)
+"""
+from __future__ import annotations
+
+import pytest
+
+from app import warmup
+
+
+def _boom() -> None:
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """단계 목록을 바꿔 끼우고 상태 초기화"""
+    def use(**fns):
+        monkeypatch.setattr(warmup, "STEPS", list(fns.items()))
+        monkeypatch.setattr(warmup, "_status", {name: {"state": "pending"} for name in fns})
+    return use
+
+
+def test_starting_until_all_steps_done(steps):
+    steps(universe=lambda: None, purge=lambda: None)
+    st = warmup.status()
+    assert (st["ready"], st["state"], st["failed"]) == (False, "starting", [])
+
+
+def test_critical_failure_is_not_ready(steps):
+    steps(universe=_boom, embed_index=lambda: None, purge=lambda: None)
+    warmup.run()
+    st = warmup.status()
+    assert (st["ready"], st["state"], st["failed"]) == (False, "failed", ["universe"])
+    assert st["steps"]["universe"]["state"] == "error" and not warmup.is_ready()
+
+
+def test_optional_failure_still_ready(steps):
+    steps(universe=lambda: None, embed_model=_boom, purge=_boom)
+    warmup.run()
+    st = warmup.status()
+    assert (st["ready"], st["state"], st["failed"]) == (True, "ready", []) and warmup.is_ready()